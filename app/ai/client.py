@@ -14,6 +14,7 @@ from app.ai.schemas import (
     TextToSignResult,
     TokenTiming,
 )
+from app.utils.file_links import link_or_copy
 
 
 class AIClientError(Exception):
@@ -27,6 +28,9 @@ class AIClientError(Exception):
 class AIClient:
     """Contract for communicating with the external AI service."""
 
+    # Part of every result cache key, bump it whenever the model output changes
+    model_version: str = "unversioned"
+
     async def translate_text_to_sign(
         self, payload: TextToSignRequestPayload
     ) -> TextToSignResult:
@@ -44,6 +48,8 @@ class MockAIClient(AIClient):
     Replace this class with the real wire-up once the AI engineer exposes the models.
     """
 
+    model_version = "mock-1"
+
     def __init__(
         self,
         sample_video: Path | str = Path("static/videos/test_video.mp4"),
@@ -108,14 +114,9 @@ class MockAIClient(AIClient):
 
     async def _copy_sample_video(self, request_id: str) -> Path:
         destination = self.temp_dir / f"{request_id}.mp4"
-        if destination.exists():
-            destination.unlink(missing_ok=True)
-
-        def _copy() -> Path:
-            destination.write_bytes(self.sample_video.read_bytes())
-            return destination
-
-        return await asyncio.to_thread(_copy)
+        # Link rather than copy: the sample is never modified and the copy is only read
+        await asyncio.to_thread(link_or_copy, self.sample_video, destination)
+        return destination
 
     def _build_token_timings(
         self, text: str, start_ms: int = 0, token_duration_ms: int = 320
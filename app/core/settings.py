@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -32,6 +32,18 @@ class Settings(BaseSettings):
     DB_POOL_TIMEOUT: int = 30
     DB_POOL_RECYCLE: int = 1800  # 30 minutes
 
+    # Object Storage Settings
+    STORAGE_BACKEND: str = "supabase"  # supabase | local | s3
+    STORAGE_BUCKET: str = "signs-generated-by-ai"
+    LOCAL_STORAGE_ROOT: str = "static/storage"
+    LOCAL_STORAGE_BASE_URL: str = "/media"
+    LOCAL_STORAGE_FSYNC: bool = True
+    S3_ENDPOINT_URL: Optional[str] = None
+    S3_REGION: str = "us-east-1"
+    S3_ACCESS_KEY_ID: Optional[str] = None
+    S3_SECRET_ACCESS_KEY: Optional[str] = None
+    S3_PUBLIC_BASE_URL: Optional[str] = None
+
     # Security Settings
     JWT_SECRET_KEY: str
     JWT_ALGORITHM: str
@@ -1,7 +1,9 @@
 from datetime import datetime
+from enum import Enum
 from typing import List, Optional
 
-from sqlmodel import Field, Relationship, SQLModel
+from sqlalchemy import BigInteger, Index, SmallInteger, text
+from sqlmodel import JSON, Column, Field, Relationship, SQLModel, UniqueConstraint
 
 
 class SignGesture(SQLModel, table=True):
@@ -12,9 +14,16 @@ class SignGesture(SQLModel, table=True):
     description: Optional[str] = None
     video_path: str  # Path to the reference video for this sign
     created_at: datetime = Field(default_factory=datetime.now)
+    # Drives incremental refreshes of the in-memory sign lexicon
+    updated_at: datetime = Field(
+        default_factory=datetime.now,
+        index=True,
+        sa_column_kwargs={"onupdate": datetime.now},
+    )
 
     # Relationships
     translations: List["SignTranslation"] = Relationship(back_populates="gesture")
+    renditions: List["SignClipRendition"] = Relationship(back_populates="gesture")
 
 
 class SignTranslation(SQLModel, table=True):
@@ -24,11 +33,42 @@ class SignTranslation(SQLModel, table=True):
     gesture_id: int = Field(foreign_key="signgesture.id")
     language_code: str  # e.g., "ar" for Arabic
     text: str
+    updated_at: datetime = Field(
+        default_factory=datetime.now,
+        index=True,
+        sa_column_kwargs={"onupdate": datetime.now},
+    )
 
     # Relationships
     gesture: SignGesture = Relationship(back_populates="translations")
 
 
+class SignClipRendition(SQLModel, table=True):
+    """Normalized copy of a gesture clip in one canonical quality profile"""
+
+    __table_args__ = (UniqueConstraint("gesture_id", "quality"),)
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    gesture_id: int = Field(foreign_key="signgesture.id", index=True)
+    quality: str  # VideoQuality value, e.g. "720p"
+    video_path: str  # Normalized clip produced by the ingest pipeline
+    source_hash: str  # sha256 of the source clip, unchanged sources are skipped
+    duration_ms: int
+    frame_count: int
+    keyframe_offsets_ms: List[int] = Field(
+        default_factory=list, sa_column=Column(JSON, nullable=False)
+    )
+    # Public URL of the uploaded MPEG-TS copy referenced by HLS playlists
+    segment_url: Optional[str] = None
+    updated_at: datetime = Field(
+        default_factory=datetime.now,
+        sa_column_kwargs={"onupdate": datetime.now},
+    )
+
+    # Relationships
+    gesture: SignGesture = Relationship(back_populates="renditions")
+
+
 class User(SQLModel, table=True):
     """User model for authentication and history tracking"""
 
@@ -45,15 +85,76 @@ class User(SQLModel, table=True):
     )
 
 
+class HistoryInputType(int, Enum):
+    """Translation direction of a history row, stored as a smallint"""
+
+    SIGN_TO_TEXT = 1
+    TEXT_TO_SIGN = 2
+
+
 class TranslationHistory(SQLModel, table=True):
     """Model to store user translation history"""
 
+    # History pages are keyset scans of these indexes, newest first
+    __table_args__ = (
+        Index(
+            "ix_translationhistory_user_input_timestamp_id",
+            "user_id",
+            "input_type",
+            text("timestamp DESC"),
+            text("id DESC"),
+        ),
+        # Only text-to-sign rows have a language, so it implies the input type
+        Index(
+            "ix_translationhistory_user_language_timestamp_id",
+            "user_id",
+            "language_code",
+            text("timestamp DESC"),
+            text("id DESC"),
+        ),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     user_id: Optional[int] = Field(default=None, foreign_key="user.id")
-    input_type: str  # "sign_to_text" or "text_to_sign"
+    input_type: HistoryInputType = Field(sa_type=SmallInteger)
+    language_code: Optional[str] = None  # Language of text input, e.g. "ar"
     input_content: str  # Text input or reference to video file
     output_content: str  # Result text or reference to output video
     timestamp: datetime = Field(default_factory=datetime.now)
 
     # Relationships
     user: Optional[User] = Relationship(back_populates="translation_history")
+
+
+class StorageObject(SQLModel, table=True):
+    """Manifest entry for an object uploaded to storage"""
+
+    # Per-user stats and age-based cleanup are range scans on this index
+    __table_args__ = (
+        Index("ix_storageobject_user_id_created_at", "user_id", "created_at"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    path: str = Field(unique=True)  # Object path inside the bucket
+    user_id: Optional[int] = None  # Owner, None for shared objects
+    size_bytes: int = Field(sa_type=BigInteger)
+    content_hash: Optional[str] = None  # sha256 of the object bytes
+    created_at: datetime = Field(default_factory=datetime.now)
+    last_accessed_at: datetime = Field(default_factory=datetime.now)
+
+
+class StorageObjectRef(SQLModel, table=True):
+    """A user's claim on a shared (content-addressed) storage object"""
+
+    __table_args__ = (
+        UniqueConstraint("object_id", "user_id"),
+        Index("ix_storageobjectref_user_id_created_at", "user_id", "created_at"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    object_id: int = Field(
+        foreign_key="storageobject.id", index=True, ondelete="CASCADE"
+    )
+    user_id: int
+    # Refreshed whenever the user is served the object again
+    created_at: datetime = Field(default_factory=datetime.now)
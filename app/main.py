@@ -1,19 +1,47 @@
+from contextlib import asynccontextmanager
+
+from pathlib import Path
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.staticfiles import StaticFiles
 
 from app.auth.routes import auth_router
 from app.core.settings import settings
 from app.db.config import init_db
 from app.sign_to_text.routes import sign_to_text_router
-from app.text_to_sign.routes import text_to_sign_router
+from app.text_to_sign.routes import generation_jobs, text_to_sign_router
+from app.utils.history_writer import history_writer
+from app.utils.http_pool import shared_http_client
+from app.utils.sign_lexicon import sign_lexicon
+from app.utils.storage_service import get_storage_service
 
 # Import these once you implement them
 # from app.core.errors import register_all_errors
 # from app.core.middleware import register_middleware
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    async with init_db(app):
+        await sign_lexicon.start()
+        await history_writer.start()
+        await generation_jobs.start()
+        # Resume purges interrupted by the last shutdown
+        await get_storage_service().deletion_jobs.start()
+        try:
+            yield  # App runs here
+        finally:
+            await get_storage_service().deletion_jobs.stop()
+            await generation_jobs.stop()
+            # After the jobs, which still log history, and before the engine closes
+            await history_writer.stop()
+            await sign_lexicon.stop()
+            await shared_http_client.aclose()
+
+
 app = FastAPI(
-    lifespan=init_db,
+    lifespan=lifespan,
     title=settings.PROJECT_NAME,
     description=settings.PROJECT_DESCRIPTION,
     version=settings.API_VERSION,
@@ -35,6 +63,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Keyset pagination cursor of the history endpoint
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Register error handlers
@@ -59,6 +89,16 @@ app.include_router(
     tags=["Text to Sign"],
 )
 
+# Serve objects of the local storage backend (sendfile when the server supports it)
+if settings.STORAGE_BACKEND.lower() == "local":
+    local_storage_root = Path(settings.LOCAL_STORAGE_ROOT) / settings.STORAGE_BUCKET
+    local_storage_root.mkdir(parents=True, exist_ok=True)
+    app.mount(
+        settings.LOCAL_STORAGE_BASE_URL,
+        StaticFiles(directory=local_storage_root),
+        name="media",
+    )
+
 
 # Health check endpoint
 # @app.get("/health", include_in_schema=False)
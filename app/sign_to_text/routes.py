@@ -1,16 +1,14 @@
 import asyncio
 import logging
 
-from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect, status
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
 from fastapi.responses import HTMLResponse
-from sqlmodel import Session
-from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.ai.schemas import SignToTextStreamChunk
-from app.db.config import async_engine, get_session
-from app.db.models import TranslationHistory, User
+from app.db.models import HistoryInputType
 from app.sign_to_text.services import stream_sign_to_text, to_error_payload
 from app.sign_to_text.websocket_auth import websocket_token_auth
+from app.utils.history_writer import history_writer
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -22,10 +20,7 @@ active_connections: dict[int, WebSocket] = {}
 
 
 @sign_to_text_router.websocket("/ws/translate/")
-async def sign_to_text_websocket(
-    websocket: WebSocket,
-    session: Session = Depends(get_session),
-):
+async def sign_to_text_websocket(websocket: WebSocket):
     token_data = await websocket_token_auth(websocket)
     if not token_data:
         return
@@ -44,11 +39,7 @@ async def sign_to_text_websocket(
             try:
                 async for chunk in stream_sign_to_text(frame_data, user_id=user_id):
                     await websocket.send_json(chunk.model_dump())
-                    await _persist_history_if_final(
-                        chunk=chunk,
-                        session=session,
-                        user_id=user_id,
-                    )
+                    _persist_history_if_final(chunk=chunk, user_id=user_id)
                 await asyncio.sleep(0.05)
             except Exception as exc:
                 error_payload = to_error_payload(
@@ -92,26 +83,19 @@ async def websocket_docs():
     """
 
 
-async def _persist_history_if_final(
-    chunk: SignToTextStreamChunk, session: Session, user_id: int
-):
+def _persist_history_if_final(chunk: SignToTextStreamChunk, user_id: int):
     """
     Persist only final chunks to keep history concise while still supporting streaming updates.
+
+    Rows are queued to the history writer, which inserts them in bulk, so the
+    stream never waits on the database.
     """
     if not chunk.is_final or not chunk.transcript:
         return
 
-    async with AsyncSession(async_engine) as fresh_session:
-        user = session.get(User, user_id)
-        if not user:
-            return
-
-        history_entry = TranslationHistory(
-            user_id=user_id,
-            input_type="sign_to_text",
-            input_content="live_video",
-            output_content=chunk.transcript,
-        )
-        fresh_session.add(history_entry)
-        await fresh_session.commit()
-        await fresh_session.refresh(history_entry)
+    history_writer.add(
+        user_id=user_id,
+        input_type=HistoryInputType.SIGN_TO_TEXT,
+        input_content="live_video",
+        output_content=chunk.transcript,
+    )
@@ -1,27 +1,77 @@
 import asyncio
+import json
 import logging
+import math
+import shutil
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
-
-import aiofiles
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
-from fastapi.responses import JSONResponse
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple
+
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import field_validator
 from sqlmodel import Field, SQLModel, select
 from sqlmodel.ext.asyncio.session import AsyncSession
-from tenacity import retry, stop_after_attempt, wait_exponential
 
 from app.ai.client import AIClientError, ai_client, build_text_to_sign_request
 from app.ai.schemas import TokenTiming
 from app.auth.dependencies import AccessTokenBearer
-from app.db.config import async_engine, get_session
-from app.db.models import TranslationHistory
-from app.utils.exceptions import StorageError, VideoGenerationError
+from app.db.config import AsyncSessionLocal, get_session
+from app.db.models import HistoryInputType, SignClipRendition
+from app.utils.batch_delete import MAX_FAILURE_SAMPLES, DeletionJob, DeletionStatus
+from app.utils.concurrency_limiter import (
+    AdaptiveConcurrencyLimiter,
+    ConcurrencyLimitExceededError,
+)
+from app.utils.exceptions import (
+    StorageDeadlineExceededError,
+    StorageError,
+    VideoGenerationError,
+)
+from app.utils.fair_queue import Priority
+from app.utils.file_links import link_or_copy
+from app.utils.generation_jobs import (
+    GenerationJob,
+    GenerationJobManager,
+    JobQueueFullError,
+    JobStage,
+)
+from app.utils.history_pagination import encode_cursor, history_page_statement
+from app.utils.history_writer import history_writer
+from app.utils.hls import (
+    HLS_CONTENT_TYPE,
+    HlsSegment,
+    build_media_playlist,
+    playlist_object_path,
+)
+from app.utils.http_pool import shared_http_client
+from app.utils.phrase_segmenter import phrase_segmenter
+from app.utils.retry_policy import deadline, upload_retry_policy
 
 # from app.utils.video_service import VideoService
-from app.utils.storage_service import StorageService
+from app.utils.sign_lexicon import sign_lexicon
+from app.utils.single_flight import SingleFlight
+from app.utils.storage_backends import IMMUTABLE_CACHE_CONTROL
+from app.utils.storage_service import get_storage_service, shared_video_path
+from app.utils.text_chunker import split_text_chunks
+from app.utils.text_normalizer import get_normalization_statistics
+from app.utils.video_cache import (
+    CachedGeneration,
+    ChunkVideo,
+    ChunkVideoCache,
+    GenerationResultCache,
+)
+from app.utils.video_processor import VideoQuality, video_assembler
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -33,20 +83,68 @@ class Config:
     VIDEO_BUCKET = "signs-generated-by-ai"
     TEMP_VIDEO_DIR = Path("static/temp_videos")
     SUPPORTED_LANGUAGES = {"ar", "en"}
-    MAX_CONCURRENT_GENERATIONS = 10
+    # Generation concurrency adapts to AI and storage latency within these bounds
+    INITIAL_CONCURRENT_GENERATIONS = 10
+    MIN_CONCURRENT_GENERATIONS = 2
+    MAX_CONCURRENT_GENERATIONS = 40
+    # Requests that would wait longer than this for a slot get a 429
+    GENERATION_QUEUE_TIMEOUT_SECONDS = 30
     VIDEO_GENERATION_TIMEOUT = 300  # 5 minutes
     CLEANUP_BATCH_SIZE = 100
     DEFAULT_HISTORY_LIMIT = 20
     MAX_HISTORY_LIMIT = 100
+    HISTORY_CURSOR_HEADER = "X-Next-Cursor"
+    RESULT_CACHE_MAX_ENTRIES = 1024
+    # Keep below the minimum cleanup age (1 day) so cached URLs never point at deleted videos
+    RESULT_CACHE_TTL_SECONDS = 6 * 3600
+    JOB_WORKERS = INITIAL_CONCURRENT_GENERATIONS
+    JOB_QUEUE_SIZE = 200
+    JOB_RESULT_TTL_SECONDS = 3600
+    # Bounds the upload stage, retries included, so a dead storage backend
+    # cannot hold a generation slot for minutes
+    UPLOAD_DEADLINE_SECONDS = 60
+    HLS_QUALITY = VideoQuality.MEDIUM
+    # Playlists are content-addressed, so they never change under a given name
+    HLS_PLAYLIST_CACHE_CONTROL = IMMUTABLE_CACHE_CONTROL
+    # Texts longer than this are split into sentences generated in parallel
+    CHUNKING_MIN_TEXT_LENGTH = 120
+    CHUNK_MAX_CHARS = 200
+    MAX_CONCURRENT_CHUNKS_PER_REQUEST = 4
+    CHUNK_CACHE_DIR = Path("static/chunk_videos")
+    CHUNK_CACHE_MAX_ENTRIES = 512
     # Add path to your test video
     TEST_VIDEO_PATH = Path("static/videos/test_video.mp4")  # Update this path
 
 
 # Initialize services
-storage_service = StorageService()
+storage_service = get_storage_service()
+result_cache = GenerationResultCache(
+    max_entries=Config.RESULT_CACHE_MAX_ENTRIES,
+    ttl_seconds=Config.RESULT_CACHE_TTL_SECONDS,
+)
 
-# Semaphore for concurrent video generation
-generation_semaphore = asyncio.Semaphore(Config.MAX_CONCURRENT_GENERATIONS)
+# Local per-sentence videos reused when stitching long texts
+chunk_video_cache = ChunkVideoCache(
+    Config.CHUNK_CACHE_DIR, max_entries=Config.CHUNK_CACHE_MAX_ENTRIES
+)
+
+# Adaptive limit on concurrent video generations, shedding what would queue too long
+generation_limiter = AdaptiveConcurrencyLimiter(
+    initial_limit=Config.INITIAL_CONCURRENT_GENERATIONS,
+    min_limit=Config.MIN_CONCURRENT_GENERATIONS,
+    max_limit=Config.MAX_CONCURRENT_GENERATIONS,
+    max_queue_time=Config.GENERATION_QUEUE_TIMEOUT_SECONDS,
+)
+
+# Coalesces identical in-flight generations so duplicates share one slot
+single_flight = SingleFlight()
+
+# Bounded worker pool for the asynchronous (202 + polling) generation mode
+generation_jobs = GenerationJobManager(
+    workers=Config.JOB_WORKERS,
+    queue_size=Config.JOB_QUEUE_SIZE,
+    result_ttl_seconds=Config.JOB_RESULT_TTL_SECONDS,
+)
 
 text_to_sign_router = APIRouter(
     prefix="/text-to-sign",
@@ -68,6 +166,10 @@ class TextToSignRequest(SQLModel):
         description="Text to convert to sign language",
     )
     language_code: str = Field(default="ar", description="Language code for the text")
+    output_format: Literal["mp4", "hls"] = Field(
+        default="mp4",
+        description="'hls' returns a playlist of lexicon sign segments when the lexicon covers the text",
+    )
 
     @field_validator("language_code")
     def validate_language_code(cls, v):
@@ -107,6 +209,59 @@ class TextToSignResponse(SQLModel):
     ai_latency_ms: Optional[int] = Field(
         default=None, description="Processing time reported by the AI service"
     )
+    cache_hit: bool = Field(
+        default=False, description="Whether the video was served from the result cache"
+    )
+    output_format: str = Field(
+        default="mp4", description="'mp4' video or 'hls' playlist behind video_url"
+    )
+
+
+class GenerationJobResponse(SQLModel):
+    """Response model for an asynchronous generation job"""
+
+    job_id: str
+    stage: JobStage = Field(..., description="queued, ai, upload, done or failed")
+    created_at: datetime
+    updated_at: datetime
+    result: Optional[TextToSignResponse] = Field(
+        default=None, description="Generation result once the job is done"
+    )
+    error: Optional[Dict[str, Any]] = Field(
+        default=None, description="Error details if the job failed"
+    )
+    status_url: Optional[str] = Field(default=None, description="Polling URL")
+    events_url: Optional[str] = Field(
+        default=None, description="Server-Sent Events stream of stage changes"
+    )
+
+
+class CleanupJobResponse(SQLModel):
+    """Response model for a background cleanup of old videos"""
+
+    job_id: str
+    status: DeletionStatus = Field(..., description="listing, running, done or failed")
+    total: int = Field(..., description="Old videos found so far")
+    processed: int
+    deleted: int
+    missing: int = Field(..., description="Videos that were already gone")
+    kept: int = Field(
+        default=0, description="Shared videos kept because they are in use again"
+    )
+    failed: int
+    failures: Dict[str, str] = Field(
+        default_factory=dict,
+        description=(
+            f"Errors of up to {MAX_FAILURE_SAMPLES} of the videos that could not "
+            "be deleted, `failed` counts them all"
+        ),
+    )
+    bytes_freed: int
+    listing_complete: bool
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    status_url: Optional[str] = Field(default=None, description="Polling URL")
 
 
 class TranslationHistoryResponse(SQLModel):
@@ -126,20 +281,16 @@ class VideoGenerationService:
         self.temp_dir = Config.TEMP_VIDEO_DIR
         self.temp_dir.mkdir(parents=True, exist_ok=True)
 
-    async def generate_video_filename(self, user_id: str) -> str:
-        """Generate a unique video filename with user context"""
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        return f"user_{user_id}/{timestamp}_{uuid.uuid4().hex[:8]}.mp4"
-
-    @retry(
-        stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10)
-    )
-    async def upload_to_storage(self, file_path: Path, destination_path: str) -> str:
-        """Upload file to Supabase Storage with retry logic"""
+    async def upload_to_storage(self, file_path: Path, user_id: str) -> str:
+        """Upload file to Supabase Storage once per distinct video, within a deadline"""
         try:
-            return await storage_service.upload_video(file_path, destination_path)
+            with deadline(Config.UPLOAD_DEADLINE_SECONDS):
+                return await storage_service.upload_video_deduplicated(file_path, user_id)
+        except StorageDeadlineExceededError:
+            logger.error(f"Upload of {file_path} ran out of time")
+            raise
         except Exception as e:
-            logger.error(f"Failed to upload video {destination_path}: {str(e)}")
+            logger.error(f"Failed to upload video {file_path}: {str(e)}")
             raise StorageError(f"Failed to upload video: {str(e)}")
 
     async def prepare_test_video(
@@ -162,11 +313,7 @@ class VideoGenerationService:
 
             # Copy the test video to temp location
             logger.info(f"Copying test video for text: '{text}' (user: {user_id})")
-            async with aiofiles.open(Config.TEST_VIDEO_PATH, "rb") as src:
-                content = await src.read()
-
-            async with aiofiles.open(output_path, "wb") as dst:
-                await dst.write(content)
+            await asyncio.to_thread(link_or_copy, Config.TEST_VIDEO_PATH, output_path)
 
             logger.info(f"Test video prepared at: {output_path}")
             return output_path
@@ -179,10 +326,7 @@ class VideoGenerationService:
         """Use fallback video when test video is not available"""
         fallback_path = Path("static/videos/fallback.mp4")
         if fallback_path.exists():
-            async with aiofiles.open(fallback_path, "rb") as src:
-                content = await src.read()
-            async with aiofiles.open(output_path, "wb") as dst:
-                await dst.write(content)
+            await asyncio.to_thread(link_or_copy, fallback_path, output_path)
             logger.info("Using fallback video")
         else:
             raise VideoGenerationError("No test video or fallback video available")
@@ -192,6 +336,327 @@ class VideoGenerationService:
 video_gen_service = VideoGenerationService()
 
 
+async def generate_and_upload(
+    text: str,
+    language_code: str,
+    user_id: str,
+    cache_key: str,
+    on_stage: Optional[Callable[[JobStage], None]] = None,
+    priority: Priority = Priority.INTERACTIVE,
+) -> CachedGeneration:
+    """Run the AI call and upload for one text, caching the outcome"""
+    # Stitching chunks needs ffmpeg and ffprobe, without them the text is one call
+    if video_assembler.available and len(text) > Config.CHUNKING_MIN_TEXT_LENGTH:
+        chunks = split_text_chunks(text, Config.CHUNK_MAX_CHARS)
+        if len(chunks) > 1:
+            generation = await generate_chunked_and_upload(
+                chunks, language_code, user_id, cache_key, on_stage, priority
+            )
+            if generation is not None:
+                return generation
+
+    # Adaptive concurrency limit shared fairly between users, raises
+    # ConcurrencyLimitExceededError when overloaded. Only this AI call plus
+    # upload is sampled, so the limit follows one kind of work
+    async with generation_limiter.slot(user_id, priority):
+        if on_stage:
+            on_stage(JobStage.AI)
+        ai_request = build_text_to_sign_request(
+            text=text,
+            language_code=language_code,
+            metadata={"user_id": user_id},
+        )
+        ai_result = await ai_client.translate_text_to_sign(ai_request)
+
+        if not ai_result.video_path or not ai_result.video_path.exists():
+            raise VideoGenerationError("AI did not return a usable video path.")
+
+        if on_stage:
+            on_stage(JobStage.UPLOAD)
+        video_url = await video_gen_service.upload_to_storage(
+            ai_result.video_path, user_id
+        )
+
+        ai_result.video_path.unlink(missing_ok=True)
+        logger.info(f"Cleaned up temp file: {ai_result.video_path}")
+
+    generation = CachedGeneration(
+        video_url=video_url,
+        tokens=ai_result.tokens,
+        ai_request_id=ai_result.request_id,
+        ai_latency_ms=ai_result.latency_ms,
+        uploaded_by=str(user_id),
+    )
+    result_cache.set(cache_key, generation)
+    return generation
+
+
+def hls_cache_key(text: str, language_code: str) -> str:
+    """Result cache key of an HLS playlist, tied to the lexicon snapshot it was built from"""
+    snapshot = sign_lexicon.snapshot
+    version = snapshot.version.isoformat() if snapshot.version else "empty"
+    return GenerationResultCache.build_key(
+        text, language_code, f"hls-{Config.HLS_QUALITY.value}-{version}"
+    )
+
+
+async def generate_hls_playlist(
+    text: str, language_code: str, cache_key: str
+) -> Optional[CachedGeneration]:
+    """
+    Build and upload an HLS playlist of lexicon sign segments for one text
+
+    Args:
+        text: Text to sign
+        language_code: Language of the text
+        cache_key: Result cache key the playlist is stored under
+
+    Returns:
+        The uploaded playlist, or None if the lexicon cannot sign every word
+        or a sign has no uploaded segment yet
+
+    Raises:
+        StorageError: If the playlist upload fails
+    """
+    segments = phrase_segmenter.segment(text, language_code)
+    if not segments or any(segment.kind == "unknown" for segment in segments):
+        return None
+
+    gesture_ids = {entry.gesture_id for segment in segments for entry in segment.entries}
+    async with AsyncSessionLocal() as session:
+        result = await session.exec(
+            select(SignClipRendition).where(
+                SignClipRendition.gesture_id.in_(gesture_ids),
+                SignClipRendition.quality == Config.HLS_QUALITY.value,
+            )
+        )
+        renditions = {rendition.gesture_id: rendition for rendition in result.all()}
+
+    hls_segments: List[HlsSegment] = []
+    tokens: List[TokenTiming] = []
+    position_ms = 0
+    for segment in segments:
+        start_ms = position_ms
+        for entry in segment.entries:
+            rendition = renditions.get(entry.gesture_id)
+            if rendition is None or not rendition.segment_url:
+                logger.info(
+                    f"No {Config.HLS_QUALITY.value} segment for gesture {entry.gesture_id}"
+                )
+                return None
+            hls_segments.append(
+                HlsSegment(
+                    uri=rendition.segment_url,
+                    duration_ms=rendition.duration_ms,
+                    title=entry.text,
+                )
+            )
+            position_ms += rendition.duration_ms
+        tokens.append(
+            TokenTiming(
+                token=segment.text, confidence=1.0, start_ms=start_ms, end_ms=position_ms
+            )
+        )
+
+    playlist = build_media_playlist(hls_segments)
+    playlist_url = await storage_service.upload_bytes(
+        playlist.encode("utf-8"),
+        playlist_object_path(playlist),
+        content_type=HLS_CONTENT_TYPE,
+        cache_control=Config.HLS_PLAYLIST_CACHE_CONTROL,
+    )
+
+    generation = CachedGeneration(video_url=playlist_url, tokens=tokens)
+    result_cache.set(cache_key, generation)
+    return generation
+
+
+async def resolve_hls_generation(
+    text: str, language_code: str
+) -> Tuple[Optional[CachedGeneration], bool]:
+    """Cached or freshly built HLS playlist for a text, with whether it was cached"""
+    cache_key = hls_cache_key(text, language_code)
+    cached = result_cache.get(cache_key)
+    if cached:
+        return cached, True
+
+    generation = await single_flight.do(
+        cache_key, lambda: generate_hls_playlist(text, language_code, cache_key)
+    )
+    return generation, False
+
+
+async def generate_chunked_and_upload(
+    chunks: List[str],
+    language_code: str,
+    user_id: str,
+    cache_key: str,
+    on_stage: Optional[Callable[[JobStage], None]] = None,
+    priority: Priority = Priority.INTERACTIVE,
+) -> Optional[CachedGeneration]:
+    """
+    Generate the chunks of a long text concurrently and stitch one video
+
+    Each chunk is an independent AI call (cached and coalesced per chunk), so
+    latency follows the slowest chunk rather than the sum of all of them. Token
+    timings of every chunk are shifted by the duration of the chunks before it.
+    Returns None when the chunk videos could not be stitched, so the caller
+    can fall back to a single AI call.
+    """
+    if on_stage:
+        on_stage(JobStage.AI)
+
+    request_dir = Config.TEMP_VIDEO_DIR / f"chunks_{uuid.uuid4().hex[:8]}"
+    request_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        chunk_limit = asyncio.Semaphore(Config.MAX_CONCURRENT_CHUNKS_PER_REQUEST)
+
+        async def run_chunk(index: int, chunk: str) -> ChunkVideo:
+            async with chunk_limit:
+                return await generate_chunk_video(
+                    chunk,
+                    language_code,
+                    user_id,
+                    request_dir / f"{index:03d}.mp4",
+                    priority,
+                )
+
+        results = await asyncio.gather(
+            *(run_chunk(index, chunk) for index, chunk in enumerate(chunks)),
+            return_exceptions=True,
+        )
+        # Wait for every chunk before raising so none writes into a removed directory
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        chunk_videos: List[ChunkVideo] = list(results)
+
+        tokens: List[TokenTiming] = []
+        offset_ms = 0
+        for chunk_video in chunk_videos:
+            tokens.extend(
+                token.model_copy(
+                    update={
+                        "start_ms": token.start_ms + offset_ms,
+                        "end_ms": token.end_ms + offset_ms,
+                    }
+                )
+                for token in chunk_video.tokens
+            )
+            offset_ms += chunk_video.duration_ms
+
+        stitched_path = request_dir / "stitched.mp4"
+        try:
+            await video_assembler.concatenate(
+                [chunk_video.video_path for chunk_video in chunk_videos],
+                stitched_path,
+            )
+        except (OSError, VideoGenerationError) as e:
+            logger.warning(
+                f"Could not stitch {len(chunks)} chunks, generating in one call: {str(e)}"
+            )
+            return None
+
+        if on_stage:
+            on_stage(JobStage.UPLOAD)
+        # Upload-only work, its latency would skew the generation baseline
+        async with generation_limiter.slot(user_id, priority, sample=False):
+            video_url = await video_gen_service.upload_to_storage(
+                stitched_path, user_id
+            )
+    finally:
+        shutil.rmtree(request_dir, ignore_errors=True)
+
+    logger.info(f"Stitched {len(chunks)} chunks for user {user_id}")
+    generation = CachedGeneration(
+        video_url=video_url,
+        tokens=tokens,
+        # Repeated sentences share one AI request, list each id once
+        ai_request_id=",".join(
+            dict.fromkeys(
+                chunk_video.ai_request_id
+                for chunk_video in chunk_videos
+                if chunk_video.ai_request_id
+            )
+        ),
+        ai_latency_ms=max(
+            (chunk_video.ai_latency_ms or 0 for chunk_video in chunk_videos), default=0
+        ),
+        uploaded_by=str(user_id),
+    )
+    result_cache.set(cache_key, generation)
+    return generation
+
+
+async def generate_chunk_video(
+    chunk: str,
+    language_code: str,
+    user_id: str,
+    destination: Path,
+    priority: Priority = Priority.INTERACTIVE,
+) -> ChunkVideo:
+    """Video for one chunk at ``destination``, from the chunk cache when possible"""
+    chunk_key = GenerationResultCache.build_key(
+        chunk, language_code, ai_client.model_version
+    )
+    cached = await chunk_video_cache.checkout(chunk_key, destination)
+    if cached:
+        return cached
+
+    # Identical chunks of concurrent requests share one AI call
+    await single_flight.do(
+        f"chunk:{chunk_key}",
+        lambda: _generate_chunk_into_cache(
+            chunk, language_code, user_id, chunk_key, priority
+        ),
+    )
+    chunk_video = await chunk_video_cache.checkout(chunk_key, destination)
+    if chunk_video is None:
+        raise VideoGenerationError("Chunk video was evicted before it could be used")
+    return chunk_video
+
+
+async def _generate_chunk_into_cache(
+    chunk: str,
+    language_code: str,
+    user_id: str,
+    chunk_key: str,
+    priority: Priority = Priority.INTERACTIVE,
+) -> None:
+    # AI-only work, its latency would skew the generation baseline
+    async with generation_limiter.slot(user_id, priority, sample=False):
+        ai_request = build_text_to_sign_request(
+            text=chunk,
+            language_code=language_code,
+            metadata={"user_id": user_id},
+        )
+        ai_result = await ai_client.translate_text_to_sign(ai_request)
+
+    if not ai_result.video_path or not ai_result.video_path.exists():
+        raise VideoGenerationError("AI did not return a usable video path.")
+
+    try:
+        info = await video_assembler.probe.probe(ai_result.video_path)
+        duration_ms = int((info.duration_s or 0) * 1000)
+    except (OSError, VideoGenerationError):
+        duration_ms = 0
+    if not duration_ms:
+        # Fall back to the AI timeline when the container has no duration
+        duration_ms = max((token.end_ms for token in ai_result.tokens), default=0)
+
+    await chunk_video_cache.put(
+        chunk_key,
+        ChunkVideo(
+            video_path=ai_result.video_path,
+            tokens=ai_result.tokens,
+            duration_ms=duration_ms,
+            ai_request_id=ai_result.request_id,
+            ai_latency_ms=ai_result.latency_ms,
+        ),
+    )
+    ai_result.video_path.unlink(missing_ok=True)
+
+
 @text_to_sign_router.post(
     "/generate",
     response_model=TextToSignResponse,
@@ -215,78 +680,295 @@ async def generate_video_from_text(
         f"Processing test upload for user {user_id}, text: '{request.text[:50]}...'"
     )
 
-    # Rate limiting with semaphore
-    async with generation_semaphore:
+    if request.output_format == "hls":
         try:
-            ai_request = build_text_to_sign_request(
-                text=request.text,
-                language_code=request.language_code,
-                metadata={"user_id": user_id},
+            playlist, playlist_cached = await resolve_hls_generation(
+                request.text, request.language_code
             )
-            ai_result = await ai_client.translate_text_to_sign(ai_request)
-
-            if not ai_result.video_path or not ai_result.video_path.exists():
-                raise VideoGenerationError("AI did not return a usable video path.")
-
-            destination_path = await video_gen_service.generate_video_filename(user_id)
-            video_url = await video_gen_service.upload_to_storage(
-                ai_result.video_path, destination_path
+        except StorageError as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
             )
 
-            ai_result.video_path.unlink(missing_ok=True)
-            logger.info(f"Cleaned up temp file: {ai_result.video_path}")
-
-            upload_time = int((datetime.now() - start_time).total_seconds() * 1000)
-
+        if playlist:
             background_tasks.add_task(
                 log_translation_history,
                 user_id=user_id,
                 input_text=request.text,
-                video_url=video_url,
+                video_url=playlist.video_url,
                 language_code=request.language_code,
-                # session_factory=lambda: AsyncSession(session.bind)
-                # session_factory=lambda: AsyncSession(async_engine)
             )
-
-            logger.info(
-                f"Test video uploaded successfully for user {user_id}, URL: {video_url}"
-            )
-
             return TextToSignResponse(
-                video_url=video_url,
-                message="Test video uploaded successfully",
-                generation_time_ms=upload_time,
-                ai_request_id=ai_result.request_id,
-                tokens=ai_result.tokens,
-                ai_latency_ms=ai_result.latency_ms,
+                video_url=playlist.video_url,
+                message="Playlist served from cache"
+                if playlist_cached
+                else "Playlist generated successfully",
+                generation_time_ms=int(
+                    (datetime.now() - start_time).total_seconds() * 1000
+                ),
+                tokens=playlist.tokens,
+                cache_hit=playlist_cached,
+                output_format="hls",
             )
+        logger.info("Lexicon does not cover the text, falling back to MP4 generation")
 
-        except asyncio.TimeoutError:
-            raise HTTPException(
-                status_code=status.HTTP_408_REQUEST_TIMEOUT,
-                detail="Video upload timed out. Please try again.",
+    cache_key = GenerationResultCache.build_key(
+        request.text, request.language_code, ai_client.model_version
+    )
+    cached = result_cache.get(cache_key)
+    if cached:
+        background_tasks.add_task(
+            log_translation_history,
+            user_id=user_id,
+            input_text=request.text,
+            video_url=cached.video_url,
+            language_code=request.language_code,
+            uploaded_by=cached.uploaded_by,
+        )
+        logger.info(f"Result cache hit for user {user_id}, URL: {cached.video_url}")
+
+        return TextToSignResponse(
+            video_url=cached.video_url,
+            message="Video served from cache",
+            generation_time_ms=int(
+                (datetime.now() - start_time).total_seconds() * 1000
+            ),
+            ai_request_id=cached.ai_request_id,
+            tokens=cached.tokens,
+            ai_latency_ms=cached.ai_latency_ms,
+            cache_hit=True,
+        )
+
+    try:
+        # Identical concurrent requests share one AI call and upload
+        generation = await single_flight.do(
+            cache_key,
+            lambda: generate_and_upload(
+                text=request.text,
+                language_code=request.language_code,
+                user_id=user_id,
+                cache_key=cache_key,
+                # Lets queued jobs that join this flight follow its stages
+                on_stage=lambda stage: single_flight.report(cache_key, stage),
+            ),
+        )
+
+        upload_time = int((datetime.now() - start_time).total_seconds() * 1000)
+
+        background_tasks.add_task(
+            log_translation_history,
+            user_id=user_id,
+            input_text=request.text,
+            video_url=generation.video_url,
+            language_code=request.language_code,
+            uploaded_by=generation.uploaded_by,
+        )
+
+        logger.info(
+            f"Test video uploaded successfully for user {user_id}, URL: {generation.video_url}"
+        )
+
+        return TextToSignResponse(
+            video_url=generation.video_url,
+            message="Test video uploaded successfully",
+            generation_time_ms=upload_time,
+            ai_request_id=generation.ai_request_id,
+            tokens=generation.tokens,
+            ai_latency_ms=generation.ai_latency_ms,
+        )
+
+    except ConcurrencyLimitExceededError as e:
+        logger.warning(f"Shedding generation for user {user_id}: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many generations in progress. Please try again later.",
+            headers={
+                "Retry-After": str(
+                    max(1, math.ceil(generation_limiter.expected_wait(user_id)))
+                )
+            },
+        )
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=status.HTTP_408_REQUEST_TIMEOUT,
+            detail="Video upload timed out. Please try again.",
+        )
+    except AIClientError as e:
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail={
+                "code": e.error.code,
+                "message": e.error.message,
+                "details": e.error.details,
+            },
+        )
+    except StorageDeadlineExceededError as e:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=str(e))
+    except (VideoGenerationError, StorageError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
+        )
+    except Exception as e:
+        logger.error(
+            f"Unexpected error in video upload for user {user_id}: {str(e)}"
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected error occurred during video upload",
+        )
+
+
+@text_to_sign_router.post(
+    "/jobs",
+    response_model=GenerationJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Queue text-to-sign generation",
+    description="Queue a generation and return immediately; poll the job or follow its SSE stream",
+)
+async def create_generation_job(
+    request: TextToSignRequest,
+    http_request: Request,
+    token_data: dict = Depends(AccessTokenBearer()),
+):
+    """Asynchronous variant of /generate backed by a bounded worker pool"""
+    user_id = token_data["user"]["user_id"]
+
+    try:
+        job = await generation_jobs.submit(
+            user_id,
+            lambda job: run_generation_job(job, request=request, user_id=user_id),
+        )
+    except JobQueueFullError:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many queued generations. Please try again later.",
+        )
+
+    logger.info(f"Queued generation job {job.job_id} for user {user_id}")
+    return _job_response(job, http_request)
+
+
+@text_to_sign_router.get(
+    "/jobs/{job_id}",
+    response_model=GenerationJobResponse,
+    summary="Get generation job status",
+    description="Poll the stage and, once done, the result of a queued generation",
+)
+async def get_generation_job(
+    job_id: str,
+    http_request: Request,
+    token_data: dict = Depends(AccessTokenBearer()),
+):
+    """Return the current state of a generation job"""
+    job = _get_user_job(job_id, token_data["user"]["user_id"])
+    return _job_response(job, http_request)
+
+
+@text_to_sign_router.get(
+    "/jobs/{job_id}/events",
+    summary="Stream generation job progress",
+    description="Server-Sent Events stream reporting queued, ai, upload and done/failed",
+)
+async def stream_generation_job(
+    job_id: str,
+    token_data: dict = Depends(AccessTokenBearer()),
+):
+    """Stream stage changes of a generation job as Server-Sent Events"""
+    job = _get_user_job(job_id, token_data["user"]["user_id"])
+
+    async def event_stream():
+        async for event in generation_jobs.subscribe(job):
+            yield f"event: {event['stage']}\ndata: {json.dumps(event)}\n\n"
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def run_generation_job(
+    job: GenerationJob, request: TextToSignRequest, user_id: str
+) -> Dict[str, Any]:
+    """Worker body for a queued generation, returns the serialized response"""
+    start_time = datetime.now()
+    output_format = "mp4"
+    generation, cache_hit = None, False
+    if request.output_format == "hls":
+        generation, cache_hit = await resolve_hls_generation(
+            request.text, request.language_code
+        )
+        if generation:
+            output_format = "hls"
+
+    cache_key = GenerationResultCache.build_key(
+        request.text, request.language_code, ai_client.model_version
+    )
+    if generation is None:
+        generation = result_cache.get(cache_key)
+        cache_hit = generation is not None
+    if generation is None:
+        try:
+            generation = await single_flight.do(
+                cache_key,
+                lambda: generate_and_upload(
+                    text=request.text,
+                    language_code=request.language_code,
+                    user_id=user_id,
+                    cache_key=cache_key,
+                    on_stage=lambda stage: single_flight.report(cache_key, stage),
+                    # Queued jobs are bulk work, they yield to interactive requests
+                    priority=Priority.BATCH,
+                ),
+                # Stages come from the flight, whichever caller started it
+                on_progress=job.set_stage,
             )
         except AIClientError as e:
-            raise HTTPException(
-                status_code=status.HTTP_502_BAD_GATEWAY,
-                detail={
-                    "code": e.error.code,
-                    "message": e.error.message,
-                    "details": e.error.details,
-                },
-            )
-        except (VideoGenerationError, StorageError) as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e)
-            )
-        except Exception as e:
-            logger.error(
-                f"Unexpected error in video upload for user {user_id}: {str(e)}"
-            )
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="An unexpected error occurred during video upload",
-            )
+            job.error = {
+                "code": e.error.code,
+                "message": e.error.message,
+                "details": e.error.details,
+            }
+            raise
+
+    await log_translation_history(
+        user_id=user_id,
+        input_text=request.text,
+        video_url=generation.video_url,
+        language_code=request.language_code,
+        uploaded_by=generation.uploaded_by,
+    )
+
+    return TextToSignResponse(
+        video_url=generation.video_url,
+        message="Video served from cache" if cache_hit else "Video generated successfully",
+        generation_time_ms=int((datetime.now() - start_time).total_seconds() * 1000),
+        ai_request_id=generation.ai_request_id,
+        tokens=generation.tokens,
+        ai_latency_ms=generation.ai_latency_ms,
+        cache_hit=cache_hit,
+        output_format=output_format,
+    ).model_dump(mode="json")
+
+
+def _get_user_job(job_id: str, user_id: str) -> GenerationJob:
+    job = generation_jobs.get(job_id, user_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Generation job not found"
+        )
+    return job
+
+
+def _job_response(job: GenerationJob, http_request: Request) -> GenerationJobResponse:
+    status_url = str(
+        http_request.app.url_path_for("get_generation_job", job_id=job.job_id)
+    )
+    return GenerationJobResponse(
+        **job.to_dict(),
+        status_url=status_url,
+        events_url=f"{status_url}/events",
+    )
 
 
 async def log_translation_history(
@@ -294,22 +976,24 @@ async def log_translation_history(
     input_text: str,
     video_url: str,
     language_code: str,
-    # session_factory
+    uploaded_by: Optional[str] = None,
 ):
     """Log translation to database history with improved error handling"""
     try:
-        async with AsyncSession(async_engine) as session:
-            history_entry = TranslationHistory(
-                user_id=user_id,
-                input_type="text_to_sign",
-                input_content=f"{language_code}:{input_text}",
-                output_content=video_url,
-                timestamp=datetime.now(),
-            )
+        # Written in bulk by the history writer
+        history_writer.add(
+            user_id=user_id,
+            input_type=HistoryInputType.TEXT_TO_SIGN,
+            input_content=input_text,
+            output_content=video_url,
+            language_code=language_code,
+        )
 
-            session.add(history_entry)
-            await session.commit()
-            logger.info(f"Translation history logged for user {user_id}")
+        # Cache and single-flight hits serve a video uploaded for another user,
+        # who alone holds a claim on it so far
+        shared_path = shared_video_path(video_url)
+        if shared_path and uploaded_by != str(user_id):
+            history_writer.add_reference(shared_path, user_id)
 
     except Exception as e:
         logger.error(f"Failed to log translation history for user {user_id}: {str(e)}")
@@ -319,9 +1003,14 @@ async def log_translation_history(
     "/history",
     response_model=List[TranslationHistoryResponse],
     summary="Get user translation history",
-    description="Retrieve user's text-to-sign translation history with pagination",
+    description=(
+        "Retrieve user's text-to-sign translation history, newest first. Pass "
+        f"the {Config.HISTORY_CURSOR_HEADER} response header back as `cursor` "
+        "to get the next page. The header is not sent when paging by `offset`"
+    ),
 )
 async def get_user_translation_history(
+    response: Response,
     token_data: dict = Depends(AccessTokenBearer()),
     limit: int = Query(
         default=Config.DEFAULT_HISTORY_LIMIT,
@@ -330,45 +1019,55 @@ async def get_user_translation_history(
         description="Number of records to return",
     ),
     offset: int = Query(default=0, ge=0, description="Number of records to skip"),
+    cursor: Optional[str] = Query(
+        default=None,
+        description="Position returned by the previous page (keyset pagination)",
+    ),
+    language_code: Optional[str] = Query(
+        default=None, description="Only return translations from this language"
+    ),
     session: AsyncSession = Depends(get_session),
 ):
     """Get user's text-to-sign translation history with enhanced querying"""
     user_id = token_data["user"]["user_id"]
 
+    if cursor is not None and offset:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use either cursor or offset, not both",
+        )
     try:
-        # Optimized query with proper indexing assumptions
-        statement = (
-            select(TranslationHistory)
-            .where(
-                TranslationHistory.user_id == user_id,
-                TranslationHistory.input_type == "text_to_sign",
-            )
-            .order_by(TranslationHistory.timestamp.desc())
-            .offset(offset)
-            .limit(limit)
+        statement = history_page_statement(
+            user_id,
+            HistoryInputType.TEXT_TO_SIGN,
+            limit,
+            cursor=cursor,
+            offset=offset,
+            language_code=language_code,
         )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
+    try:
         result = await session.exec(statement)
         history = result.all()
-
-        # Transform to response model
-        response_history = []
-        for record in history:
-            # Extract language code from input_content
-            parts = record.input_content.split(":", 1)
-            language_code = parts[0] if len(parts) > 1 else "unknown"
-
-            response_history.append(
-                TranslationHistoryResponse(
-                    id=record.id,
-                    input_content=parts[1] if len(parts) > 1 else record.input_content,
-                    output_content=record.output_content,
-                    timestamp=record.timestamp,
-                    language_code=language_code,
-                )
+        # Offset paging keeps its own position, a cursor would mix the two
+        if len(history) == limit and not offset:
+            last = history[-1]
+            response.headers[Config.HISTORY_CURSOR_HEADER] = encode_cursor(
+                last.timestamp, last.id
             )
 
-        return response_history
+        return [
+            TranslationHistoryResponse(
+                id=record.id,
+                input_content=record.input_content,
+                output_content=record.output_content,
+                timestamp=record.timestamp,
+                language_code=record.language_code or "unknown",
+            )
+            for record in history
+        ]
 
     except Exception as e:
         logger.error(f"Failed to get history for user {user_id}: {str(e)}")
@@ -380,26 +1079,33 @@ async def get_user_translation_history(
 
 @text_to_sign_router.delete(
     "/cleanup",
-    status_code=status.HTTP_204_NO_CONTENT,
+    response_model=CleanupJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
     summary="Clean up old videos",
-    description="Remove user's old videos from storage to free up space",
+    description="Remove user's old videos from storage to free up space; poll the returned job for progress",
 )
 async def cleanup_user_videos(
-    background_tasks: BackgroundTasks,
+    http_request: Request,
     token_data: dict = Depends(AccessTokenBearer()),
     days_old: int = Query(
         default=30, ge=1, le=365, description="Delete videos older than this many days"
     ),
 ):
-    """Clean up user's old videos from storage with improved batch processing"""
+    """Start a resumable background cleanup of the user's old videos"""
     user_id = token_data["user"]["user_id"]
 
     try:
-        background_tasks.add_task(
-            cleanup_storage_videos, user_id=user_id, days_old=days_old
+        job = await storage_service.submit_cleanup(
+            owner=user_id,
+            user_prefix=f"user_{user_id}",
+            days_old=days_old,
+            batch_size=Config.CLEANUP_BATCH_SIZE,
         )
 
-        logger.info(f"Cleanup task scheduled for user {user_id}, days_old={days_old}")
+        logger.info(
+            f"Cleanup job {job.job_id} scheduled for user {user_id}, days_old={days_old}"
+        )
+        return _cleanup_job_response(job, http_request)
 
     except Exception as e:
         logger.error(f"Failed to schedule cleanup for user {user_id}: {str(e)}")
@@ -409,18 +1115,31 @@ async def cleanup_user_videos(
         )
 
 
-async def cleanup_storage_videos(user_id: str, days_old: int):
-    """Background task to clean up old videos with batch processing"""
-    try:
-        await storage_service.cleanup_old_videos(
-            user_prefix=f"user_{user_id}",
-            days_old=days_old,
-            batch_size=Config.CLEANUP_BATCH_SIZE,
+@text_to_sign_router.get(
+    "/cleanup/{job_id}",
+    response_model=CleanupJobResponse,
+    summary="Get cleanup job status",
+    description="Progress and per-video failures of a cleanup started with DELETE /cleanup",
+)
+async def get_cleanup_job(
+    job_id: str,
+    http_request: Request,
+    token_data: dict = Depends(AccessTokenBearer()),
+):
+    """Return the current state of a cleanup job"""
+    job = storage_service.deletion_jobs.get(job_id, token_data["user"]["user_id"])
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Cleanup job not found"
         )
-        logger.info(f"Cleanup completed for user {user_id}")
+    return _cleanup_job_response(job, http_request)
 
-    except Exception as e:
-        logger.error(f"Failed to cleanup videos for user {user_id}: {str(e)}")
+
+def _cleanup_job_response(
+    job: DeletionJob, http_request: Request
+) -> CleanupJobResponse:
+    status_url = str(http_request.app.url_path_for("get_cleanup_job", job_id=job.job_id))
+    return CleanupJobResponse(**job.to_dict(), status_url=status_url)
 
 
 @text_to_sign_router.get(
@@ -465,6 +1184,31 @@ async def health_check():
         )
 
 
+@text_to_sign_router.get(
+    "/metrics",
+    summary="Generation pipeline metrics",
+    description="Counters for the generation pipeline, sign lexicon and storage uploads",
+)
+async def get_generation_metrics():
+    """Expose in-process counters for monitoring"""
+    return {
+        "result_cache": result_cache.get_statistics(),
+        "single_flight": single_flight.get_statistics(),
+        "jobs": generation_jobs.get_statistics(),
+        "concurrency": generation_limiter.get_statistics(),
+        "lexicon": sign_lexicon.get_statistics(),
+        "chunk_cache": chunk_video_cache.get_statistics(),
+        "normalization": get_normalization_statistics(),
+        "assembly": video_assembler.get_assembly_statistics(),
+        "uploads": storage_service.get_upload_statistics(),
+        "retries": upload_retry_policy.get_statistics(),
+        "deletions": storage_service.deletion_jobs.get_statistics(),
+        "manifest": storage_service.manifest.get_statistics(),
+        "history_writer": history_writer.get_statistics(),
+        "http_pool": shared_http_client.get_statistics(),
+    }
+
+
 # Additional endpoint for testing purposes
 @text_to_sign_router.get(
     "/test-config",
@@ -0,0 +1,769 @@
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from enum import Enum
+from itertools import islice
+from pathlib import Path
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import httpx
+
+from app.utils.exceptions import StorageThrottledError
+from app.utils.storage_backends import StorageBackend
+
+logger = logging.getLogger(__name__)
+
+# Per-path errors kept by a deletion job, beyond that only the count grows
+MAX_FAILURE_SAMPLES = 100
+
+
+class AimdLimiter:
+    """
+    Concurrency limit that adapts to how the storage API responds.
+
+    Additive increase, multiplicative decrease: every successful call grows
+    the limit by ``1 / limit`` (one slot per window of successes) up to
+    ``max_limit``; a throttled call (429/5xx) halves it and pauses new calls
+    for a backoff that doubles while throttling continues.
+    """
+
+    def __init__(
+        self,
+        max_limit: int,
+        min_limit: int = 1,
+        initial_limit: Optional[int] = None,
+        decrease_factor: float = 0.5,
+        base_backoff: float = 0.5,
+        max_backoff: float = 30.0,
+    ):
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.limit = float(initial_limit or max_limit)
+        self.decrease_factor = decrease_factor
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.in_flight = 0
+        self._resume_at = 0.0
+        self._consecutive_throttles = 0
+        self._condition = asyncio.Condition()
+
+        # Monitoring
+        self._limiter_stats = {
+            "successes": 0,
+            "throttled": 0,
+            "min_limit_seen": self.limit,
+        }
+
+    async def acquire(self) -> None:
+        async with self._condition:
+            while True:
+                delay = self._resume_at - time.monotonic()
+                if delay > 0:
+                    # Wake early if another release changes the picture
+                    try:
+                        await asyncio.wait_for(self._condition.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                if self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return
+                await self._condition.wait()
+
+    async def release(self, throttled: bool = False) -> None:
+        async with self._condition:
+            self.in_flight -= 1
+            if throttled:
+                self._limiter_stats["throttled"] += 1
+                self._consecutive_throttles += 1
+                self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+                backoff = min(
+                    self.max_backoff,
+                    self.base_backoff * (2 ** (self._consecutive_throttles - 1)),
+                )
+                self._resume_at = max(self._resume_at, time.monotonic() + backoff)
+                self._limiter_stats["min_limit_seen"] = min(
+                    self._limiter_stats["min_limit_seen"], self.limit
+                )
+            else:
+                self._limiter_stats["successes"] += 1
+                self._consecutive_throttles = 0
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            **self._limiter_stats,
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+        }
+
+
+@dataclass
+class DeletionReport:
+    """Outcome of a deletion run, with the reason for every failed path"""
+
+    total: int = 0
+    processed: int = 0
+    deleted: int = 0
+    missing: int = 0
+    kept: int = 0
+    failed: Dict[str, str] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "processed": self.processed,
+            "deleted": self.deleted,
+            "missing": self.missing,
+            "kept": self.kept,
+            "failed": len(self.failed),
+            "failures": dict(self.failed),
+        }
+
+
+BatchCallback = Callable[[int, List[Dict[str, Any]]], Awaitable[None]]
+# Given a batch about to be deleted, returns the paths that may still go
+BatchFilter = Callable[[List[str]], Awaitable[List[str]]]
+
+
+class BatchDeleter:
+    """
+    Deletes many objects with batches in flight concurrently.
+
+    Batches are sent in parallel up to ``max_parallel``, with the effective
+    parallelism governed by an ``AimdLimiter`` so the engine speeds up while
+    the API keeps up and backs off when it answers 429/5xx. Throttled batches
+    are retried up to ``max_attempts`` times; every path ends up deleted,
+    missing, kept (by the run's ``before_delete`` filter) or failed with a
+    reason.
+    """
+
+    def __init__(
+        self,
+        backend: StorageBackend,
+        batch_size: int = 100,
+        max_parallel: int = 8,
+        max_attempts: int = 5,
+        base_backoff: float = 0.5,
+        on_removed: Optional[Callable[[List[str]], Awaitable[None]]] = None,
+    ):
+        self.backend = backend
+        # Told about every path that is gone (deleted or already missing)
+        self.on_removed = on_removed
+        self.batch_size = batch_size
+        self.max_parallel = max_parallel
+        self.max_attempts = max_attempts
+        self.limiter = AimdLimiter(max_parallel, base_backoff=base_backoff)
+
+        # Monitoring
+        self._delete_stats = {
+            "runs": 0,
+            "batches": 0,
+            "batch_retries": 0,
+            "deleted": 0,
+            "failed": 0,
+        }
+
+    def batches(self, paths: Iterable[str], batch_size: Optional[int] = None):
+        """Number and group paths into batches, without materializing them all"""
+        batch_size = batch_size or self.batch_size
+        batch: List[str] = []
+        index = 0
+        for path in paths:
+            batch.append(path)
+            if len(batch) >= batch_size:
+                yield index, batch
+                index += 1
+                batch = []
+        if batch:
+            yield index, batch
+
+    async def run(
+        self,
+        batches: Union[
+            Iterable[Tuple[int, List[str]]], AsyncIterable[Tuple[int, List[str]]]
+        ],
+        total: int = 0,
+        on_batch: Optional[BatchCallback] = None,
+        report: Optional[DeletionReport] = None,
+        before_delete: Optional[BatchFilter] = None,
+    ) -> DeletionReport:
+        """
+        Delete every batch, several at a time
+
+        Args:
+            batches: ``(index, paths)`` pairs, consumed lazily (sync or async)
+            total: Number of paths, if known, for progress reporting
+            on_batch: Called with the batch index and per-path results as
+                each batch finishes (in completion order)
+            report: Report to update in place, so callers can read progress
+            before_delete: Re-checks each batch right before it is deleted,
+                the paths it leaves out are kept; if it fails the whole
+                batch fails
+
+        Returns:
+            The report with per-path failures
+        """
+        report = report or DeletionReport(total=total)
+        self._delete_stats["runs"] += 1
+        # Bounds how many batches are read ahead of the ones being deleted
+        slots = asyncio.Semaphore(self.max_parallel * 2)
+        pending = set()
+
+        try:
+            async for index, paths in _iterate(batches):
+                await slots.acquire()
+                task = asyncio.create_task(
+                    self._delete_batch(index, paths, report, on_batch, before_delete)
+                )
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+                task.add_done_callback(lambda _: slots.release())
+            await asyncio.gather(*pending)
+        except BaseException:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            raise
+
+        return report
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            **self._delete_stats,
+            "limiter": self.limiter.get_statistics(),
+            "timestamp": datetime.now().isoformat(),
+        }
+
+    # Private helper methods
+
+    async def _delete_batch(
+        self,
+        index: int,
+        paths: List[str],
+        report: DeletionReport,
+        on_batch: Optional[BatchCallback],
+        before_delete: Optional[BatchFilter] = None,
+    ) -> None:
+        results = await self._attempt_batch(index, paths, before_delete)
+
+        report.processed += len(paths)
+        for result in results:
+            if result.get("error"):
+                report.failed[result["name"]] = str(result["error"])
+            elif result.get("kept"):
+                report.kept += 1
+            elif result.get("removed", True):
+                report.deleted += 1
+            else:
+                report.missing += 1
+        gone = [r["name"] for r in results if not r.get("error") and not r.get("kept")]
+        self._delete_stats["batches"] += 1
+        self._delete_stats["deleted"] += len(gone)
+        self._delete_stats["failed"] += sum(1 for r in results if r.get("error"))
+
+        if self.on_removed is not None:
+            await self.on_removed(gone)
+
+        if on_batch is not None:
+            await on_batch(index, results)
+
+    async def _attempt_batch(
+        self, index: int, paths: List[str], before_delete: Optional[BatchFilter]
+    ) -> List[Dict[str, Any]]:
+        """Per-path results of deleting one batch, retried while throttled"""
+        kept: List[Dict[str, Any]] = []
+        if before_delete is not None:
+            try:
+                allowed = set(await before_delete(paths))
+            except Exception as e:
+                logger.error(f"Deletion batch {index} could not be checked: {str(e)}")
+                return [{"name": path, "error": str(e)} for path in paths]
+            kept = [{"name": path, "kept": True} for path in paths if path not in allowed]
+            paths = [path for path in paths if path in allowed]
+            if not paths:
+                return kept
+
+        results = None
+        for attempt in range(1, self.max_attempts + 1):
+            await self.limiter.acquire()
+            throttled = False
+            try:
+                results = await self.backend.delete(paths)
+            except (StorageThrottledError, httpx.TransportError) as e:
+                throttled = True
+                if attempt == self.max_attempts:
+                    results = [{"name": path, "error": str(e)} for path in paths]
+                else:
+                    self._delete_stats["batch_retries"] += 1
+                    logger.warning(
+                        f"Deletion batch {index} throttled (attempt {attempt}): {str(e)}"
+                    )
+            except Exception as e:
+                results = [{"name": path, "error": str(e)} for path in paths]
+            finally:
+                await self.limiter.release(throttled=throttled)
+            if results is not None:
+                break
+        return list(results) + kept
+
+
+class DeletionStatus(str, Enum):
+    """Lifecycle of a deletion job"""
+
+    LISTING = "listing"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+@dataclass
+class DeletionJob:
+    """A persisted purge, resumable batch by batch"""
+
+    job_id: str
+    user_id: str
+    batch_size: int
+    status: DeletionStatus = DeletionStatus.LISTING
+    total: int = 0
+    deleted: int = 0
+    missing: int = 0
+    kept: int = 0
+    bytes_freed: int = 0
+    failed: int = 0
+    # A sample of at most MAX_FAILURE_SAMPLES errors, ``failed`` has the count
+    failures: Dict[str, str] = field(default_factory=dict)
+    done_batches: List[int] = field(default_factory=list)
+    listing_complete: bool = False
+    # Passed to the manager's ``before_delete`` check, e.g. whose claims to release
+    params: Dict[str, Any] = field(default_factory=dict)
+    error: Optional[str] = None
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+    updated_at: Optional[str] = None
+
+    @property
+    def processed(self) -> int:
+        return self.deleted + self.missing + self.kept + self.failed
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "status": DeletionStatus(self.status).value,
+            "total": self.total,
+            "processed": self.processed,
+            "deleted": self.deleted,
+            "missing": self.missing,
+            "kept": self.kept,
+            "failed": self.failed,
+            "failures": dict(self.failures),
+            "bytes_freed": self.bytes_freed,
+            "listing_complete": self.listing_complete,
+            "error": self.error,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+
+
+class DeletionJobManager:
+    """
+    Background purges that survive restarts.
+
+    A job first spools the paths to delete (with their sizes) to a file, then
+    deletes them with the ``BatchDeleter``. Its state is written atomically
+    when its status changes, and each finished batch appends one line with
+    its index and counts to a progress log, so saving progress costs the
+    same however far the job is. After a restart ``start()`` replays the log
+    of unfinished jobs and only sends the batches that were not yet
+    acknowledged. A job interrupted while still listing deletes what it had
+    spooled and reports ``listing_complete: false``. File writes run in a
+    worker thread.
+
+    ``before_delete`` is called with the job and each batch right before it
+    is deleted and returns the paths that may still be deleted, so a job can
+    drop paths that became live again since they were spooled.
+    """
+
+    def __init__(
+        self,
+        deleter: BatchDeleter,
+        directory: Path,
+        result_ttl_seconds: int = 24 * 3600,
+        before_delete: Optional[
+            Callable[[DeletionJob, List[str]], Awaitable[List[str]]]
+        ] = None,
+    ):
+        self.deleter = deleter
+        self.before_delete = before_delete
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.result_ttl_seconds = result_ttl_seconds
+        self._jobs: Dict[str, DeletionJob] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._started = False
+
+        # Monitoring
+        self._job_stats = {
+            "submitted": 0,
+            "resumed": 0,
+            "completed": 0,
+            "failed": 0,
+        }
+
+    async def start(self) -> None:
+        """Load persisted jobs and resume the unfinished ones (idempotent)"""
+        if self._started:
+            return
+        self._started = True
+        for state_path in sorted(self.directory.glob("*.json")):
+            try:
+                state = json.loads(state_path.read_text(encoding="utf-8"))
+                state["status"] = DeletionStatus(state["status"])
+                job = DeletionJob(**state)
+            except (KeyError, ValueError, TypeError) as e:
+                logger.warning(f"Discarding unreadable deletion job {state_path}: {str(e)}")
+                state_path.unlink(missing_ok=True)
+                continue
+            if self._expired(job):
+                self._remove_files(job.job_id)
+                continue
+            self._jobs[job.job_id] = job
+            if job.status in (DeletionStatus.LISTING, DeletionStatus.RUNNING):
+                for record in self._read_progress(job):
+                    _apply_progress(job, record)
+                self._job_stats["resumed"] += 1
+                logger.info(
+                    f"Resuming deletion job {job.job_id} at {job.processed}/{job.total}"
+                )
+                self._spawn(job, entries=None)
+
+    async def stop(self) -> None:
+        """Cancel running jobs, their persisted progress is kept for the next start"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._started = False
+
+    async def submit(
+        self,
+        user_id: Any,
+        entries: AsyncIterable[Tuple[str, int]],
+        batch_size: Optional[int] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> DeletionJob:
+        """
+        Start a purge in the background
+
+        Args:
+            user_id: Owner of the job, checked on every lookup
+            entries: ``(path, size_bytes)`` pairs to delete, consumed once
+            batch_size: Paths per delete call
+            params: Persisted with the job for the ``before_delete`` check
+
+        Returns:
+            The job, already persisted
+        """
+        job = await self._create(user_id, batch_size, params)
+        self._spawn(job, entries)
+        return job
+
+    async def run(
+        self,
+        user_id: Any,
+        entries: AsyncIterable[Tuple[str, int]],
+        batch_size: Optional[int] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> DeletionJob:
+        """Like ``submit`` but waits for the purge to finish"""
+        job = await self._create(user_id, batch_size, params)
+        await self._execute(job, entries)
+        return job
+
+    def get(self, job_id: str, user_id: Any) -> Optional[DeletionJob]:
+        """Return the job if it exists and belongs to the user"""
+        job = self._jobs.get(job_id)
+        if job is None or job.user_id != str(user_id):
+            return None
+        return job
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get deletion job statistics for monitoring"""
+        return {
+            **self._job_stats,
+            "running": len(self._tasks),
+            "tracked_jobs": len(self._jobs),
+            "deleter": self.deleter.get_statistics(),
+            "timestamp": datetime.now().isoformat(),
+        }
+
+    # Private helper methods
+
+    async def _create(
+        self,
+        user_id: Any,
+        batch_size: Optional[int],
+        params: Optional[Dict[str, Any]] = None,
+    ) -> DeletionJob:
+        self._prune_finished()
+        job = DeletionJob(
+            job_id=uuid.uuid4().hex,
+            user_id=str(user_id),
+            batch_size=batch_size or self.deleter.batch_size,
+            params=dict(params or {}),
+        )
+        self._jobs[job.job_id] = job
+        await self._save(job)
+        self._job_stats["submitted"] += 1
+        return job
+
+    def _spawn(
+        self, job: DeletionJob, entries: Optional[AsyncIterable[Tuple[str, int]]]
+    ) -> None:
+        task = asyncio.create_task(self._execute(job, entries))
+        self._tasks[job.job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job.job_id, None))
+
+    async def _execute(
+        self, job: DeletionJob, entries: Optional[AsyncIterable[Tuple[str, int]]]
+    ) -> None:
+        try:
+            if job.status == DeletionStatus.LISTING:
+                if entries is not None:
+                    await self._spool(job, entries)
+                    job.listing_complete = True
+                job.total = await asyncio.to_thread(self._count_entries, job)
+                job.status = DeletionStatus.RUNNING
+                await self._save(job)
+
+            # Sizes are only held for the batches currently being deleted
+            sizes: Dict[str, int] = {}
+            progress_lock = asyncio.Lock()
+
+            async def on_batch(index: int, results: List[Dict[str, Any]]) -> None:
+                record = {
+                    "index": index,
+                    "deleted": 0,
+                    "missing": 0,
+                    "kept": 0,
+                    "bytes_freed": 0,
+                    "failed": 0,
+                    "failures": {},
+                }
+                for result in results:
+                    size = sizes.pop(result["name"], 0)
+                    if result.get("error"):
+                        record["failed"] += 1
+                        if len(record["failures"]) < MAX_FAILURE_SAMPLES:
+                            record["failures"][result["name"]] = str(result["error"])
+                    elif result.get("kept"):
+                        record["kept"] += 1
+                    elif result.get("removed", True):
+                        record["deleted"] += 1
+                        record["bytes_freed"] += size
+                    else:
+                        record["missing"] += 1
+                _apply_progress(job, record)
+                # One writer at a time keeps the log lines whole
+                async with progress_lock:
+                    await asyncio.to_thread(
+                        self._append_progress, job.job_id, json.dumps(record)
+                    )
+
+            before_delete = None
+            if self.before_delete is not None:
+
+                async def before_delete(paths: List[str]) -> List[str]:
+                    return await self.before_delete(job, paths)
+
+            await self.deleter.run(
+                self._pending_batches(job, sizes),
+                total=job.total,
+                on_batch=on_batch,
+                before_delete=before_delete,
+            )
+
+            job.status = DeletionStatus.DONE
+            self._job_stats["completed"] += 1
+            logger.info(f"Deletion job {job.job_id} finished: {job.to_dict()}")
+
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Deletion job {job.job_id} failed: {str(e)}")
+            job.status = DeletionStatus.FAILED
+            job.error = str(e)
+            self._job_stats["failed"] += 1
+        finally:
+            # A cancelled job keeps its files, the progress log has its state
+            if job.status in (DeletionStatus.DONE, DeletionStatus.FAILED):
+                await self._save(job)
+                await asyncio.to_thread(self._remove_work_files, job.job_id)
+
+    async def _pending_batches(
+        self, job: DeletionJob, sizes: Dict[str, int]
+    ) -> AsyncIterator[Tuple[int, List[str]]]:
+        """Batches of the spooled paths, skipping those already acknowledged"""
+        done = set(job.done_batches)
+        entries = self._read_entries(job)
+        try:
+            index = 0
+            while True:
+                # Each batch is read from the spool in a worker thread
+                batch = await asyncio.to_thread(
+                    lambda: list(islice(entries, job.batch_size))
+                )
+                if not batch:
+                    return
+                if index not in done:
+                    sizes.update(batch)
+                    yield index, [path for path, _ in batch]
+                index += 1
+        finally:
+            entries.close()
+
+    async def _spool(
+        self, job: DeletionJob, entries: AsyncIterable[Tuple[str, int]]
+    ) -> None:
+        f = await asyncio.to_thread(
+            open, self._entries_path(job.job_id), "w", encoding="utf-8"
+        )
+        try:
+            lines: List[str] = []
+            async for path, size in entries:
+                lines.append(f"{path}\t{int(size or 0)}\n")
+                job.total += 1
+                if len(lines) >= job.batch_size:
+                    await asyncio.to_thread(f.writelines, lines)
+                    lines = []
+            await asyncio.to_thread(_write_and_sync, f, lines)
+        finally:
+            await asyncio.to_thread(f.close)
+
+    def _read_entries(self, job: DeletionJob) -> Iterator[Tuple[str, int]]:
+        try:
+            with open(self._entries_path(job.job_id), encoding="utf-8") as f:
+                for line in f:
+                    path, _, size = line.rstrip("\n").rpartition("\t")
+                    if path:
+                        yield path, int(size or 0)
+        except FileNotFoundError:
+            return
+
+    def _count_entries(self, job: DeletionJob) -> int:
+        return sum(1 for _ in self._read_entries(job))
+
+    async def _save(self, job: DeletionJob) -> None:
+        """Write the job's state, finished batches are left to the progress log"""
+        job.updated_at = datetime.now().isoformat()
+        state = {**asdict(job), "status": DeletionStatus(job.status).value}
+        del state["done_batches"]
+        await asyncio.to_thread(
+            _replace_file, self._state_path(job.job_id), json.dumps(state)
+        )
+
+    def _append_progress(self, job_id: str, line: str) -> None:
+        with open(self._progress_path(job_id), "a", encoding="utf-8") as f:
+            f.write(f"{line}\n")
+
+    def _read_progress(self, job: DeletionJob) -> Iterator[Dict[str, Any]]:
+        try:
+            with open(self._progress_path(job.job_id), encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        # Torn last line, that batch is simply sent again
+                        logger.warning(
+                            f"Skipping unreadable progress line of job {job.job_id}"
+                        )
+        except FileNotFoundError:
+            return
+
+    def _expired(self, job: DeletionJob) -> bool:
+        if job.status not in (DeletionStatus.DONE, DeletionStatus.FAILED) or not job.updated_at:
+            return False
+        age = datetime.now() - datetime.fromisoformat(job.updated_at)
+        return age.total_seconds() > self.result_ttl_seconds
+
+    def _prune_finished(self) -> None:
+        for job_id, job in list(self._jobs.items()):
+            if self._expired(job):
+                del self._jobs[job_id]
+                self._remove_files(job_id)
+
+    def _remove_files(self, job_id: str) -> None:
+        self._state_path(job_id).unlink(missing_ok=True)
+        self._remove_work_files(job_id)
+
+    def _remove_work_files(self, job_id: str) -> None:
+        self._entries_path(job_id).unlink(missing_ok=True)
+        self._progress_path(job_id).unlink(missing_ok=True)
+
+    def _state_path(self, job_id: str) -> Path:
+        return self.directory / f"{job_id}.json"
+
+    def _entries_path(self, job_id: str) -> Path:
+        return self.directory / f"{job_id}.paths"
+
+    def _progress_path(self, job_id: str) -> Path:
+        return self.directory / f"{job_id}.progress"
+
+
+# Private helpers
+
+
+async def _iterate(
+    items: Union[Iterable[Any], AsyncIterable[Any]]
+) -> AsyncIterator[Any]:
+    if hasattr(items, "__aiter__"):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+def _apply_progress(job: DeletionJob, record: Dict[str, Any]) -> None:
+    """Add one finished batch's counts to the job"""
+    job.deleted += record["deleted"]
+    job.missing += record["missing"]
+    job.kept += record["kept"]
+    job.bytes_freed += record["bytes_freed"]
+    job.failed += record.get("failed", len(record["failures"]))
+    for path, error in record["failures"].items():
+        if len(job.failures) >= MAX_FAILURE_SAMPLES:
+            break
+        job.failures[path] = error
+    job.done_batches.append(record["index"])
+
+
+def _write_and_sync(f, lines: List[str]) -> None:
+    f.writelines(lines)
+    f.flush()
+    os.fsync(f.fileno())
+
+
+def _replace_file(path: Path, content: str) -> None:
+    partial = path.with_suffix(f".{uuid.uuid4().hex[:8]}.tmp")
+    partial.write_text(content, encoding="utf-8")
+    os.replace(partial, path)
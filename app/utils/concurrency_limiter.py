@@ -0,0 +1,251 @@
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Any, AsyncIterator, Deque, Dict, Hashable, Optional, Tuple
+
+from app.utils.fair_queue import FairQueue, Priority
+
+logger = logging.getLogger(__name__)
+
+
+class ConcurrencyLimitExceededError(Exception):
+    """Raised when a request cannot get a slot within the queue-time budget"""
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Concurrency limit that follows the latency of the work it guards.
+
+    Gradient algorithm (after Netflix concurrency-limits): a short-term
+    average of latency is compared with a baseline, the lowest that average
+    has been over the last ``baseline_window`` seconds (the no-load latency,
+    as in TCP Vegas). While recent latency stays within ``tolerance`` times
+    the baseline the limit grows by about ``sqrt(limit)`` per sample; when it
+    climbs above, the limit shrinks in proportion, down to half per sample.
+    Changes are smoothed and kept within ``[min_limit, max_limit]``. Samples
+    taken while less than half the limit is in use do not grow it, and
+    timed-out work shrinks it. Latency is only comparable between samples of
+    the same kind of work, so other work sharing the limiter holds its slot
+    with ``sample=False``.
+
+    Waiters are queued per key (user) and priority class in a ``FairQueue``,
+    so one key flooding the limiter cannot starve the others. A request
+    whose expected wait exceeds ``max_queue_time`` is rejected immediately,
+    and one that is still queued when the budget runs out is rejected then,
+    both with ``ConcurrencyLimitExceededError``.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 10,
+        min_limit: int = 1,
+        max_limit: int = 100,
+        max_queue_time: float = 30.0,
+        tolerance: float = 2.0,
+        smoothing: float = 0.2,
+        short_window: int = 10,
+        baseline_window: float = 60.0,
+        queue: Optional[FairQueue] = None,
+    ):
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue_time = max_queue_time
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.baseline_window = baseline_window
+        self._short_alpha = 2 / (short_window + 1)
+        self.short_latency: Optional[float] = None
+        # Sliding-window minimum: (time, average) pairs with increasing averages
+        self._minima: Deque[Tuple[float, float]] = deque()
+        self.in_flight = 0
+        self._waiters = queue or FairQueue()
+
+        # Monitoring
+        self._limiter_stats = {
+            "admitted": 0,
+            "queued": 0,
+            "shed_on_arrival": 0,
+            "shed_after_wait": 0,
+            "timeouts": 0,
+            "max_queue_depth": 0,
+        }
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    @property
+    def baseline_latency(self) -> Optional[float]:
+        return self._minima[0][1] if self._minima else None
+
+    def expected_wait(
+        self, key: Hashable = None, priority: Priority = Priority.INTERACTIVE
+    ) -> float:
+        """
+        Rough seconds a new arrival for ``key`` would queue before getting a slot
+
+        Each slot frees up about once per recent average latency, and the
+        fair queue decides how many waiters go first.
+        """
+        if self.in_flight < int(self.limit) and not self._waiters:
+            return 0.0
+        if self.short_latency is None:
+            return 0.0
+        ahead = self._waiters.ahead_of(key, priority)
+        return (ahead + 1) / int(self.limit) * self.short_latency
+
+    @asynccontextmanager
+    async def slot(
+        self,
+        key: Hashable = None,
+        priority: Priority = Priority.INTERACTIVE,
+        sample: bool = True,
+    ) -> AsyncIterator[None]:
+        """
+        Hold one slot for the duration of the block, timing it
+
+        Args:
+            key: Fairness key, usually the user id
+            priority: Scheduling class of the work
+            sample: Feed the block's latency to the limit, False for work of
+                another kind than the sampled one
+
+        Raises:
+            ConcurrencyLimitExceededError: If no slot frees up within the budget
+        """
+        await self.acquire(key, priority)
+        start = time.monotonic()
+        try:
+            yield
+        except (asyncio.TimeoutError, TimeoutError):
+            self.release(dropped=True)
+            raise
+        except BaseException:
+            # Failures say nothing about the latency under load
+            self.release()
+            raise
+        else:
+            self.release(latency=time.monotonic() - start if sample else None)
+
+    async def acquire(
+        self, key: Hashable = None, priority: Priority = Priority.INTERACTIVE
+    ) -> None:
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self._admit()
+            return
+
+        expected_wait = self.expected_wait(key, priority)
+        if expected_wait > self.max_queue_time:
+            self._limiter_stats["shed_on_arrival"] += 1
+            raise ConcurrencyLimitExceededError(
+                f"Expected wait {expected_wait:.1f}s exceeds the "
+                f"{self.max_queue_time:.0f}s queue budget"
+            )
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.push(waiter, key, priority)
+        self._limiter_stats["queued"] += 1
+        self._limiter_stats["max_queue_depth"] = max(
+            self._limiter_stats["max_queue_depth"], self.queue_depth
+        )
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.max_queue_time)
+        except asyncio.TimeoutError:
+            if not waiter.done():
+                self._waiters.remove(waiter, key, priority)
+                waiter.cancel()
+                self._limiter_stats["shed_after_wait"] += 1
+                raise ConcurrencyLimitExceededError(
+                    f"No slot within the {self.max_queue_time:.0f}s queue budget"
+                )
+            # Granted just as the budget ran out, keep the slot
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was already handed over, pass it on
+                self.release()
+            else:
+                self._waiters.remove(waiter, key, priority)
+            raise
+
+    def release(self, latency: Optional[float] = None, dropped: bool = False) -> None:
+        """
+        Give back a slot
+
+        Args:
+            latency: Seconds the work held the slot, None to leave the limit alone
+            dropped: The work timed out, a sign of overload that shrinks the limit
+        """
+        in_use = self.in_flight
+        self.in_flight -= 1
+        if dropped:
+            self._limiter_stats["timeouts"] += 1
+            self._set_limit(self.limit * 0.9)
+        elif latency is not None:
+            self._on_sample(latency, in_use)
+        self._wake_waiters()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get the current limit, load and shedding counters for monitoring"""
+        return {
+            **self._limiter_stats,
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "queue": self._waiters.get_statistics(),
+            "short_latency_ms": _to_ms(self.short_latency),
+            "baseline_latency_ms": _to_ms(self.baseline_latency),
+            "timestamp": datetime.now().isoformat(),
+        }
+
+    # Private helper methods
+
+    def _admit(self) -> None:
+        self.in_flight += 1
+        self._limiter_stats["admitted"] += 1
+
+    def _wake_waiters(self) -> None:
+        while self._waiters and self.in_flight < int(self.limit):
+            waiter = self._waiters.pop()
+            self._admit()
+            waiter.set_result(None)
+
+    def _on_sample(self, latency: float, in_use: int) -> None:
+        if self.short_latency is None:
+            self.short_latency = latency
+        self.short_latency += self._short_alpha * (latency - self.short_latency)
+
+        now = time.monotonic()
+        while self._minima and self._minima[-1][1] >= self.short_latency:
+            self._minima.pop()
+        self._minima.append((now, self.short_latency))
+        # Old minima expire, so the baseline follows a lasting change in the work
+        while self._minima[0][0] < now - self.baseline_window:
+            self._minima.popleft()
+
+        # An idle limit proves nothing about how much load the backend takes
+        if in_use < self.limit / 2:
+            return
+
+        gradient = max(
+            0.5, min(1.0, self.tolerance * self.baseline_latency / self.short_latency)
+        )
+        target = self.limit * gradient + math.sqrt(self.limit)
+        self._set_limit(self.limit * (1 - self.smoothing) + target * self.smoothing)
+
+    def _set_limit(self, limit: float) -> None:
+        previous = int(self.limit)
+        self.limit = max(self.min_limit, min(self.max_limit, limit))
+        if int(self.limit) != previous:
+            logger.debug(f"Concurrency limit {previous} -> {int(self.limit)}")
+
+
+# Private helpers
+
+
+def _to_ms(seconds: Optional[float]) -> Optional[float]:
+    return round(seconds * 1000, 1) if seconds is not None else None
@@ -24,6 +24,21 @@ class StorageConnectionError(StorageError):
         super().__init__(message=message)
 
 
+class StorageThrottledError(StorageError):
+    """مزود التخزين يطلب إبطاء الطلبات (429 أو خطأ مؤقت 5xx)"""
+
+    def __init__(self, message="مزود التخزين مشغول، أعد المحاولة لاحقاً"):
+        super().__init__(message=message)
+
+
+class StorageDeadlineExceededError(StorageError):
+    """انتهت مهلة الطلب قبل اكتمال عملية التخزين"""
+
+    def __init__(self, message="انتهت مهلة عملية التخزين"):
+        super().__init__(message=message)
+        self.status_code = 504
+
+
 # -------------------- الفيديو والذكاء الاصطناعي --------------------
 
 
@@ -0,0 +1,157 @@
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Deque, Dict, Hashable, Optional, Tuple
+
+
+class Priority(str, Enum):
+    """Scheduling classes, weighted by ``FairQueue.weights``"""
+
+    INTERACTIVE = "interactive"
+    BATCH = "batch"
+
+
+DEFAULT_WEIGHTS = {Priority.INTERACTIVE: 4.0, Priority.BATCH: 1.0}
+
+FlowKey = Tuple[Priority, Hashable]
+
+
+@dataclass
+class _Flow:
+    quantum: float
+    deficit: float = 0.0
+    waiters: Deque[Tuple[asyncio.Future, float]] = field(default_factory=deque)
+
+
+class FairQueue:
+    """
+    Waiters queued per (priority, key) flow and served by deficit round robin.
+
+    Each flow keeps its own FIFO queue. On its turn a flow is credited its
+    quantum (the weight of its priority class) and serves waiters while the
+    credit covers their cost, so every backlogged flow gets a share of the
+    slots proportional to its weight however many waiters it queued. One key
+    flooding the queue only lengthens its own flow: a light user waits for at
+    most about one round, and batch work gets a smaller share than
+    interactive work without ever being starved.
+    """
+
+    def __init__(self, weights: Optional[Dict[Priority, float]] = None):
+        self.weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        self._flows: Dict[FlowKey, _Flow] = {}
+        # Round-robin order of the flows with waiters
+        self._active: Deque[FlowKey] = deque()
+        # Whether the flow at the head of the round was credited for its turn
+        self._head_credited = False
+        self._size = 0
+
+        # Monitoring
+        self._queue_stats = {
+            "served_interactive": 0,
+            "served_batch": 0,
+            "max_active_flows": 0,
+        }
+
+    def __len__(self) -> int:
+        return self._size
+
+    def push(
+        self,
+        waiter: asyncio.Future,
+        key: Hashable = None,
+        priority: Priority = Priority.INTERACTIVE,
+        cost: float = 1.0,
+    ) -> None:
+        flow_key = (priority, key)
+        flow = self._flows.get(flow_key)
+        if flow is None:
+            flow = self._flows[flow_key] = _Flow(quantum=self.weights[priority])
+            self._active.append(flow_key)
+            self._queue_stats["max_active_flows"] = max(
+                self._queue_stats["max_active_flows"], len(self._active)
+            )
+        flow.waiters.append((waiter, cost))
+        self._size += 1
+
+    def pop(self) -> Optional[asyncio.Future]:
+        """Next waiter to serve, None when the queue is empty"""
+        while self._active:
+            flow_key = self._active[0]
+            flow = self._flows[flow_key]
+            if not self._head_credited:
+                flow.deficit += flow.quantum
+                self._head_credited = True
+            waiter, cost = flow.waiters[0]
+            if flow.deficit < cost:
+                # Turn used up, the rest of the credit carries over to the next round
+                self._active.rotate(-1)
+                self._head_credited = False
+                continue
+
+            flow.deficit -= cost
+            flow.waiters.popleft()
+            self._size -= 1
+            if not flow.waiters:
+                self._forget(flow_key)
+            self._queue_stats[f"served_{flow_key[0].value}"] += 1
+            return waiter
+        return None
+
+    def remove(
+        self,
+        waiter: asyncio.Future,
+        key: Hashable = None,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> bool:
+        """Take out a waiter that gave up, returns False if it was not queued"""
+        flow_key = (priority, key)
+        flow = self._flows.get(flow_key)
+        if flow is None:
+            return False
+        for index, (queued, _) in enumerate(flow.waiters):
+            if queued is waiter:
+                del flow.waiters[index]
+                self._size -= 1
+                if not flow.waiters:
+                    self._forget(flow_key)
+                return True
+        return False
+
+    def ahead_of(
+        self, key: Hashable = None, priority: Priority = Priority.INTERACTIVE
+    ) -> float:
+        """
+        Roughly how many waiters would be served before a new one for ``key``
+
+        The new waiter is served after the rounds its own flow needs; in
+        those rounds every other flow is served up to its quantum per round.
+        """
+        flow_key = (priority, key)
+        own = self._flows.get(flow_key)
+        own_depth = len(own.waiters) if own else 0
+        rounds = (own_depth + 1) / self.weights[priority]
+        return own_depth + sum(
+            min(len(flow.waiters), rounds * flow.quantum)
+            for other_key, flow in self._flows.items()
+            if other_key != flow_key
+        )
+
+    def get_statistics(self) -> Dict[str, Any]:
+        depth = {priority.value: 0 for priority in Priority}
+        for (priority, _), flow in self._flows.items():
+            depth[priority.value] += len(flow.waiters)
+        return {
+            **self._queue_stats,
+            "active_flows": len(self._active),
+            "depth_by_priority": depth,
+        }
+
+    # Private helper methods
+
+    def _forget(self, flow_key: FlowKey) -> None:
+        # An idle flow keeps no credit, as in DRR
+        del self._flows[flow_key]
+        if self._active[0] == flow_key:
+            self._head_credited = False
+        self._active.remove(flow_key)
@@ -0,0 +1,76 @@
+import errno
+import logging
+import os
+import shutil
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+# ioctl request number of FICLONE (linux/fs.h), a copy-on-write clone of a file
+FICLONE = 0x40049409
+
+# Errors meaning "this filesystem or pair of paths can't do that", not real failures
+_UNSUPPORTED = {
+    errno.EXDEV,
+    errno.EPERM,
+    errno.EOPNOTSUPP,
+    errno.ENOTTY,
+    errno.EINVAL,
+    errno.EMLINK,
+}
+
+
+def link_or_copy(source: Path, destination: Path, allow_hardlink: bool = True) -> str:
+    """
+    Duplicate a file without pushing its bytes through Python
+
+    Tries, in order: a reflink (copy-on-write clone, Btrfs/XFS/overlayfs on
+    those), a hard link when ``allow_hardlink`` is set, then
+    ``shutil.copyfile``, which copies in the kernel (sendfile) on Linux.
+    Only use hard links when neither file is ever modified in place, since
+    both names share one inode.
+
+    Args:
+        source: Existing file
+        destination: Path to create, replaced if it exists
+        allow_hardlink: Whether sharing the inode with ``source`` is acceptable
+
+    Returns:
+        The method used: "reflink", "hardlink" or "copy"
+    """
+    source, destination = Path(source), Path(destination)
+    destination.unlink(missing_ok=True)
+
+    if _reflink(source, destination):
+        return "reflink"
+
+    if allow_hardlink:
+        try:
+            os.link(source, destination)
+            return "hardlink"
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED:
+                raise
+
+    shutil.copyfile(source, destination)
+    return "copy"
+
+
+# Private helpers
+
+
+def _reflink(source: Path, destination: Path) -> bool:
+    try:
+        import fcntl
+    except ImportError:  # Not available on Windows
+        return False
+
+    with open(source, "rb") as src, open(destination, "wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            return True
+        except OSError as e:
+            if e.errno not in _UNSUPPORTED:
+                logger.debug(f"Reflink of {source} failed: {str(e)}")
+    destination.unlink(missing_ok=True)
+    return False
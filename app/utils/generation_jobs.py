@@ -0,0 +1,202 @@
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import Enum
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class JobStage(str, Enum):
+    """Progress stages reported for a generation job"""
+
+    QUEUED = "queued"
+    AI = "ai"
+    UPLOAD = "upload"
+    DONE = "done"
+    FAILED = "failed"
+
+
+TERMINAL_STAGES = {JobStage.DONE, JobStage.FAILED}
+
+
+class JobQueueFullError(Exception):
+    """Raised when the job queue cannot accept more work"""
+
+
+@dataclass
+class GenerationJob:
+    """State of a single queued generation"""
+
+    job_id: str
+    user_id: Any
+    work: Callable[["GenerationJob"], Awaitable[Dict[str, Any]]]
+    stage: JobStage = JobStage.QUEUED
+    created_at: datetime = field(default_factory=datetime.now)
+    updated_at: datetime = field(default_factory=datetime.now)
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[Dict[str, Any]] = None
+    finished_at: Optional[float] = None
+    _listeners: List[asyncio.Queue] = field(default_factory=list, repr=False)
+
+    def set_stage(self, stage: JobStage) -> None:
+        """Move the job to a new stage and notify every subscriber"""
+        self.stage = stage
+        self.updated_at = datetime.now()
+        if stage in TERMINAL_STAGES:
+            self.finished_at = time.monotonic()
+
+        event = self.to_dict()
+        for listener in self._listeners:
+            listener.put_nowait(event)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "stage": self.stage.value,
+            "created_at": self.created_at.isoformat(),
+            "updated_at": self.updated_at.isoformat(),
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class GenerationJobManager:
+    """
+    Bounded worker pool for long-running generations.
+
+    Jobs are accepted into a bounded queue and executed by a fixed number of
+    worker tasks, so callers can return immediately and follow progress by
+    polling or by subscribing to stage events. Finished jobs are kept for
+    ``result_ttl_seconds`` before they are forgotten.
+    """
+
+    def __init__(
+        self, workers: int = 4, queue_size: int = 100, result_ttl_seconds: int = 3600
+    ):
+        self.worker_count = workers
+        self.result_ttl_seconds = result_ttl_seconds
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._jobs: Dict[str, GenerationJob] = {}
+        self._workers: List[asyncio.Task] = []
+
+        # Monitoring
+        self._job_stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+        }
+
+    async def start(self) -> None:
+        """Start the worker tasks (idempotent)"""
+        if self._workers:
+            return
+        self._workers = [
+            asyncio.create_task(self._worker(index))
+            for index in range(self.worker_count)
+        ]
+        logger.info(f"Started {self.worker_count} generation job workers")
+
+    async def stop(self) -> None:
+        """Cancel the worker tasks, jobs still queued are dropped"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def submit(
+        self,
+        user_id: Any,
+        work: Callable[[GenerationJob], Awaitable[Dict[str, Any]]],
+    ) -> GenerationJob:
+        """
+        Queue a job for background execution
+
+        Args:
+            user_id: Owner of the job, checked on every lookup
+            work: Coroutine factory receiving the job, returns the job result
+
+        Returns:
+            The queued job
+
+        Raises:
+            JobQueueFullError: If the queue is at capacity
+        """
+        await self.start()
+        self._prune_finished()
+
+        job = GenerationJob(job_id=uuid.uuid4().hex, user_id=user_id, work=work)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            self._job_stats["rejected"] += 1
+            raise JobQueueFullError("Generation queue is full")
+
+        self._jobs[job.job_id] = job
+        self._job_stats["submitted"] += 1
+        return job
+
+    def get(self, job_id: str, user_id: Any) -> Optional[GenerationJob]:
+        """Return the job if it exists and belongs to the user"""
+        job = self._jobs.get(job_id)
+        if job is None or job.user_id != user_id:
+            return None
+        return job
+
+    async def subscribe(self, job: GenerationJob) -> AsyncIterator[Dict[str, Any]]:
+        """Yield the current state and then every stage change until the job ends"""
+        listener: asyncio.Queue = asyncio.Queue()
+        job._listeners.append(listener)
+        try:
+            event = job.to_dict()
+            yield event
+            while event["stage"] not in {stage.value for stage in TERMINAL_STAGES}:
+                event = await listener.get()
+                yield event
+        finally:
+            job._listeners.remove(listener)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get job statistics for monitoring"""
+        return {
+            **self._job_stats,
+            "queued": self._queue.qsize(),
+            "tracked_jobs": len(self._jobs),
+            "workers": len(self._workers),
+            "timestamp": datetime.now().isoformat(),
+        }
+
+    # Private helper methods
+
+    async def _worker(self, index: int) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                job.result = await job.work(job)
+                self._job_stats["completed"] += 1
+                job.set_stage(JobStage.DONE)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Generation job {job.job_id} failed: {str(e)}")
+                if job.error is None:
+                    job.error = {"message": str(e)}
+                self._job_stats["failed"] += 1
+                job.set_stage(JobStage.FAILED)
+            finally:
+                self._queue.task_done()
+
+    def _prune_finished(self) -> None:
+        now = time.monotonic()
+        expired = [
+            job_id
+            for job_id, job in self._jobs.items()
+            if job.finished_at is not None
+            and now - job.finished_at > self.result_ttl_seconds
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
@@ -0,0 +1,75 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Tuple
+
+from sqlalchemy import tuple_
+from sqlmodel import select
+
+from app.db.models import HistoryInputType, TranslationHistory
+
+# Newest first; id breaks ties between rows written in the same instant.
+# Matches ix_translationhistory_user_input_timestamp_id, so pages are read
+# straight off the index without sorting.
+HISTORY_ORDER = (TranslationHistory.timestamp.desc(), TranslationHistory.id.desc())
+
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    """Opaque cursor pointing just after the given row"""
+    raw = json.dumps([timestamp.isoformat(), row_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Position encoded by ``encode_cursor``
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        timestamp, row_id = json.loads(raw)
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def history_page_statement(
+    user_id: Any,
+    input_type: HistoryInputType,
+    limit: int,
+    cursor: Optional[str] = None,
+    offset: int = 0,
+    language_code: Optional[str] = None,
+):
+    """
+    One page of a user's history, newest first, optionally in one language
+
+    With a ``cursor`` the page starts after the row it encodes (keyset
+    pagination): the index is entered at that row, so every page costs the
+    same however deep it is. ``offset`` still works but reads and discards
+    every skipped row.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    statement = (
+        select(TranslationHistory)
+        .where(
+            TranslationHistory.user_id == user_id,
+            TranslationHistory.input_type == input_type,
+        )
+        .order_by(*HISTORY_ORDER)
+        .limit(limit)
+    )
+    if language_code is not None:
+        statement = statement.where(TranslationHistory.language_code == language_code)
+    if cursor is not None:
+        statement = statement.where(
+            tuple_(TranslationHistory.timestamp, TranslationHistory.id)
+            < tuple_(*decode_cursor(cursor))
+        )
+    if offset:
+        statement = statement.offset(offset)
+    return statement
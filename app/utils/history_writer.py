@@ -0,0 +1,268 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.exc import DataError, IntegrityError
+
+from app.db.config import AsyncSessionLocal
+from app.db.models import HistoryInputType, TranslationHistory
+from app.utils.object_manifest import ObjectManifest, object_manifest
+
+logger = logging.getLogger(__name__)
+
+
+class HistoryWriter:
+    """
+    Write-behind buffer for ``TranslationHistory`` rows.
+
+    Callers only append to an in-memory buffer. A background task writes
+    the buffer in one multi-row INSERT and one commit when it reaches
+    ``max_batch`` rows or when the oldest row has waited ``flush_interval``
+    seconds, so a burst of translations costs one connection and round
+    trip instead of one per row. History reads lag writes by at most about
+    ``flush_interval``.
+
+    A batch rejected for its data (e.g. a user deleted meanwhile) is written
+    row by row so only the offending rows are dropped. Any other failed
+    flush keeps its rows for the next one. If the database stays
+    unavailable the buffer is capped at ``max_backlog`` rows and the oldest
+    are dropped. ``stop`` flushes whatever is left.
+
+    Claims of users on the shared videos served to them are buffered the
+    same way (``add_reference``) and written in bulk to the storage
+    manifest on the same schedule.
+    """
+
+    def __init__(
+        self,
+        session_factory=AsyncSessionLocal,
+        max_batch: int = 500,
+        flush_interval: float = 1.0,
+        max_backlog: int = 20000,
+        manifest: Optional[ObjectManifest] = None,
+    ):
+        self.session_factory = session_factory
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_backlog = max_backlog
+        self.manifest = manifest or object_manifest
+        self._buffer: Deque[Dict[str, Any]] = deque()
+        # Pending (path, user_id) claims, repeats of a pair are written once
+        self._claims: Dict[Tuple[str, int], None] = {}
+        self._oldest_at: Optional[float] = None
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+        # Monitoring
+        self._writer_stats = {
+            "rows_written": 0,
+            "rows_dropped": 0,
+            "claims_written": 0,
+            "claims_dropped": 0,
+            "flushes": 0,
+            "failed_flushes": 0,
+            "last_flush_ms": 0.0,
+            "max_flush_ms": 0.0,
+            "average_flush_ms": 0.0,
+            "average_batch_size": 0.0,
+        }
+
+    async def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+            logger.info("History writer started")
+
+    async def stop(self) -> None:
+        """Stop the background task and flush the remaining rows"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        while self._pending():
+            if not await self.flush():
+                logger.error(
+                    f"Lost {len(self._buffer)} history rows and "
+                    f"{len(self._claims)} video claims on shutdown"
+                )
+                break
+        logger.info("History writer stopped")
+
+    def add(
+        self,
+        user_id: Any,
+        input_type: HistoryInputType,
+        input_content: str,
+        output_content: str,
+        language_code: Optional[str] = None,
+        timestamp: Optional[datetime] = None,
+    ) -> None:
+        """Queue one history row, never blocks on the database"""
+        if len(self._buffer) >= self.max_backlog:
+            self._buffer.popleft()
+            self._writer_stats["rows_dropped"] += 1
+        self._mark_pending()
+        self._buffer.append(
+            {
+                "user_id": int(user_id) if user_id is not None else None,
+                "input_type": HistoryInputType(input_type).value,
+                "language_code": language_code,
+                "input_content": input_content,
+                "output_content": output_content,
+                "timestamp": timestamp or datetime.now(),
+            }
+        )
+        if len(self._buffer) >= self.max_batch:
+            self._wakeup.set()
+
+    def add_reference(self, path: str, user_id: Any) -> None:
+        """Queue a user's claim on a shared video, never blocks on the database"""
+        if len(self._claims) >= self.max_backlog:
+            del self._claims[next(iter(self._claims))]
+            self._writer_stats["claims_dropped"] += 1
+        self._mark_pending()
+        self._claims[(path, int(user_id))] = None
+        if len(self._claims) >= self.max_batch:
+            self._wakeup.set()
+
+    async def flush(self) -> bool:
+        """
+        Write up to ``max_batch`` buffered rows and claims now
+
+        Returns:
+            False if a write failed (what was not written stays buffered)
+        """
+        async with self._flush_lock:
+            claims_written = await self._flush_claims()
+            rows_written = await self._flush_rows()
+            self._oldest_at = time.monotonic() if self._pending() else None
+            return claims_written and rows_written
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get backlog and flush statistics for monitoring"""
+        return {
+            **self._writer_stats,
+            "backlog": len(self._buffer),
+            "claims_backlog": len(self._claims),
+            "oldest_pending_s": round(time.monotonic() - self._oldest_at, 3)
+            if self._pending() and self._oldest_at is not None
+            else 0.0,
+            "timestamp": datetime.now().isoformat(),
+        }
+
+    # Private helper methods
+
+    def _pending(self) -> bool:
+        return bool(self._buffer or self._claims)
+
+    def _mark_pending(self) -> None:
+        if not self._pending():
+            self._oldest_at = time.monotonic()
+
+    async def _flush_claims(self) -> bool:
+        if not self._claims:
+            return True
+        claims = list(self._claims)[: self.max_batch]
+        for claim in claims:
+            del self._claims[claim]
+        try:
+            written = await self.manifest.add_references(claims)
+        except Exception as e:
+            # Back in front of those added meanwhile, a pair added again stays once
+            self._claims = {**dict.fromkeys(claims), **self._claims}
+            self._writer_stats["failed_flushes"] += 1
+            logger.error(f"Failed to write {len(claims)} video claims: {str(e)}")
+            return False
+        # Claims on objects missing from the manifest are skipped
+        self._writer_stats["claims_written"] += written
+        return True
+
+    async def _flush_rows(self) -> bool:
+        if not self._buffer:
+            return True
+        rows: List[Dict[str, Any]] = [
+            self._buffer.popleft()
+            for _ in range(min(self.max_batch, len(self._buffer)))
+        ]
+
+        start = time.perf_counter()
+        try:
+            await self._insert(rows)
+        except (IntegrityError, DataError) as e:
+            logger.warning(f"History batch rejected, writing rows one by one: {str(e)}")
+            rows = await self._insert_each(rows)
+        except Exception as e:
+            # Put the rows back in order, in front of those added meanwhile
+            self._buffer.extendleft(reversed(rows))
+            self._writer_stats["failed_flushes"] += 1
+            logger.error(f"Failed to write {len(rows)} history rows: {str(e)}")
+            return False
+
+        self._update_flush_stats(len(rows), (time.perf_counter() - start) * 1000)
+        return True
+
+    async def _run(self) -> None:
+        while True:
+            timeout = self.flush_interval
+            if self._oldest_at is not None:
+                timeout = max(
+                    0.0, self._oldest_at + self.flush_interval - time.monotonic()
+                )
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            if not self._pending():
+                continue
+            if not await self.flush():
+                # Database unavailable, give it a full interval before trying again
+                await asyncio.sleep(self.flush_interval)
+            elif max(len(self._buffer), len(self._claims)) >= self.max_batch:
+                self._wakeup.set()
+
+    async def _insert(self, rows: List[Dict[str, Any]]) -> None:
+        async with self.session_factory() as session:
+            await session.exec(insert(TranslationHistory).values(rows))
+            await session.commit()
+
+    async def _insert_each(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Write rows separately, returns those written"""
+        written = []
+        for index, row in enumerate(rows):
+            try:
+                await self._insert([row])
+                written.append(row)
+            except (IntegrityError, DataError) as e:
+                self._writer_stats["rows_dropped"] += 1
+                logger.error(f"Dropping history row of user {row['user_id']}: {str(e)}")
+            except Exception as e:
+                # Lost the database midway, keep the rest for the next flush
+                self._buffer.extendleft(reversed(rows[index:]))
+                logger.error(f"Failed to write history rows: {str(e)}")
+                break
+        return written
+
+    def _update_flush_stats(self, batch_size: int, flush_ms: float) -> None:
+        stats = self._writer_stats
+        stats["flushes"] += 1
+        stats["rows_written"] += batch_size
+        stats["last_flush_ms"] = round(flush_ms, 2)
+        stats["max_flush_ms"] = round(max(stats["max_flush_ms"], flush_ms), 2)
+        stats["average_flush_ms"] = round(
+            (stats["average_flush_ms"] * (stats["flushes"] - 1) + flush_ms)
+            / stats["flushes"],
+            2,
+        )
+        stats["average_batch_size"] = round(
+            stats["rows_written"] / stats["flushes"], 2
+        )
+
+
+# Shared writer, started and stopped by the application lifespan
+history_writer = HistoryWriter()
@@ -0,0 +1,50 @@
+import hashlib
+import math
+from dataclasses import dataclass
+from typing import List
+
+HLS_CONTENT_TYPE = "application/vnd.apple.mpegurl"
+
+
+@dataclass
+class HlsSegment:
+    """A media segment referenced by a playlist"""
+
+    uri: str
+    duration_ms: int
+    title: str = ""
+
+
+def build_media_playlist(segments: List[HlsSegment]) -> str:
+    """
+    Build a VOD media playlist that plays ``segments`` back to back.
+
+    Each per-sign segment is an independently encoded file whose timestamps
+    start at zero, so every boundary between segments is marked with
+    ``EXT-X-DISCONTINUITY`` to make players reset their timeline.
+    """
+    target_duration = max(
+        (math.ceil(segment.duration_ms / 1000) for segment in segments), default=1
+    )
+    lines = [
+        "#EXTM3U",
+        "#EXT-X-VERSION:3",
+        f"#EXT-X-TARGETDURATION:{max(target_duration, 1)}",
+        "#EXT-X-MEDIA-SEQUENCE:0",
+        "#EXT-X-PLAYLIST-TYPE:VOD",
+        "#EXT-X-INDEPENDENT-SEGMENTS",
+    ]
+    for index, segment in enumerate(segments):
+        if index > 0:
+            lines.append("#EXT-X-DISCONTINUITY")
+        title = segment.title.replace(",", " ").replace("\n", " ")
+        lines.append(f"#EXTINF:{segment.duration_ms / 1000:.3f},{title}")
+        lines.append(segment.uri)
+    lines.append("#EXT-X-ENDLIST")
+    return "\n".join(lines) + "\n"
+
+
+def playlist_object_path(playlist: str) -> str:
+    """Content-addressed storage path of a playlist, identical playlists share it"""
+    digest = hashlib.sha256(playlist.encode("utf-8")).hexdigest()
+    return f"playlists/{digest[:2]}/{digest}.m3u8"
@@ -0,0 +1,76 @@
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401
+
+    HTTP2_AVAILABLE = True
+except ImportError:  # httpx falls back to HTTP/1.1 keep-alive
+    HTTP2_AVAILABLE = False
+
+
+class SharedHttpClient:
+    """
+    Process-wide ``httpx.AsyncClient`` with one connection pool.
+
+    Every outbound call to storage goes through the same client, so TCP and
+    TLS connections are kept alive and reused (and multiplexed over HTTP/2
+    when ``h2`` is installed) instead of being set up per request. The client
+    is created lazily on first use and closed from the application lifespan.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        timeout: Optional[httpx.Timeout] = None,
+        http2: bool = True,
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        # Pool timeout bounds how long a request waits for a free connection
+        self.timeout = timeout or httpx.Timeout(30.0, write=60.0, pool=10.0)
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self._client: Optional[httpx.AsyncClient] = None
+        self._clients_created = 0
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The shared client, (re)created if it was never opened or was closed"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=self.http2, limits=self.limits, timeout=self.timeout
+            )
+            self._clients_created += 1
+            logger.info(f"Opened shared HTTP client (http2={self.http2})")
+        return self._client
+
+    async def aclose(self) -> None:
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+            logger.info("Closed shared HTTP client")
+        self._client = None
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get pool configuration and state for monitoring"""
+        return {
+            "open": self._client is not None and not self._client.is_closed,
+            "http2": self.http2,
+            "max_connections": self.limits.max_connections,
+            "max_keepalive_connections": self.limits.max_keepalive_connections,
+            "clients_created": self._clients_created,
+            "timestamp": datetime.now().isoformat(),
+        }
+
+
+# Shared client for all storage traffic
+shared_http_client = SharedHttpClient()
@@ -0,0 +1,366 @@
+"""
+Offline normalization of sign lexicon clips.
+
+Transcodes every ``SignGesture.video_path`` into the canonical profile of each
+requested ``VideoQuality`` across a process pool, then records duration, frame
+count and keyframe offsets in ``SignClipRendition``. Clips whose source hash
+matches the stored rendition are skipped, so re-running is cheap.
+
+Every rendition is also remuxed (no re-encode) to an MPEG-TS segment. With
+``--upload`` the segment is uploaded under an immutable path named by its own
+hash, so a changed source or encoding profile gets a new URL, and its URL
+stored for HLS playlists.
+
+Usage:
+    python -m app.utils.lexicon_ingest --source-root static/lexicon \\
+        --output-root static/lexicon_normalized --quality 720p --workers 4 --upload
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlmodel import select
+
+from app.db.config import AsyncSessionLocal
+from app.db.models import SignClipRendition, SignGesture
+from app.utils.storage_backends import IMMUTABLE_CACHE_CONTROL
+from app.utils.video_processor import CANONICAL_PROFILES, CanonicalProfile, VideoQuality
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+# Segment objects never change under a given name
+SEGMENT_CACHE_CONTROL = IMMUTABLE_CACHE_CONTROL
+
+
+@dataclass
+class ClipMetadata:
+    """Facts about a normalized clip recorded back to the database"""
+
+    output_path: str
+    segment_path: str
+    source_hash: str
+    segment_hash: str
+    duration_ms: int
+    frame_count: int
+    keyframe_offsets_ms: List[int] = field(default_factory=list)
+
+
+@dataclass
+class IngestReport:
+    """Outcome of an ingest run"""
+
+    transcoded: int = 0
+    skipped: int = 0
+    failed: int = 0
+    errors: Dict[str, str] = field(default_factory=dict)
+
+
+def hash_file(path: Path) -> str:
+    """sha256 of a file, read in chunks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def probe_frames(path: Path, ffprobe_binary: str = "ffprobe") -> Dict[str, Any]:
+    """Duration, frame count and keyframe offsets of a clip's video stream"""
+    output = subprocess.run(
+        [
+            ffprobe_binary,
+            "-v",
+            "error",
+            "-select_streams",
+            "v:0",
+            "-show_entries",
+            "packet=pts_time,flags:format=duration",
+            "-of",
+            "json",
+            str(path),
+        ],
+        check=True,
+        capture_output=True,
+    ).stdout
+    data = json.loads(output or b"{}")
+    packets = data.get("packets") or []
+    keyframes = sorted(
+        int(float(packet["pts_time"]) * 1000)
+        for packet in packets
+        if "K" in packet.get("flags", "") and packet.get("pts_time") not in (None, "N/A")
+    )
+    duration = float(data.get("format", {}).get("duration") or 0)
+    return {
+        "duration_ms": int(duration * 1000),
+        "frame_count": len(packets),
+        "keyframe_offsets_ms": keyframes,
+    }
+
+
+def normalize_clip(
+    source: str,
+    output: str,
+    profile: CanonicalProfile,
+    source_hash: Optional[str] = None,
+    ffmpeg_binary: str = "ffmpeg",
+    ffprobe_binary: str = "ffprobe",
+) -> ClipMetadata:
+    """
+    Transcode one clip into a canonical profile (runs inside a pool worker)
+
+    The clip is written next to its destination and renamed into place, so a
+    crashed run never leaves a truncated file behind under the final name.
+    """
+    source_path, output_path = Path(source), Path(output)
+    source_hash = source_hash or hash_file(source_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    partial_path = output_path.with_name(f".{output_path.name}.partial.mp4")
+
+    subprocess.run(
+        [
+            ffmpeg_binary,
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-y",
+            "-i",
+            str(source_path),
+            *profile.ffmpeg_args(),
+            str(partial_path),
+        ],
+        check=True,
+        capture_output=True,
+    )
+    os.replace(partial_path, output_path)
+
+    segment_path = remux_segment(output_path, ffmpeg_binary)
+    facts = probe_frames(output_path, ffprobe_binary)
+    return ClipMetadata(
+        output_path=str(output_path),
+        segment_path=str(segment_path),
+        source_hash=source_hash,
+        segment_hash=hash_file(segment_path),
+        **facts,
+    )
+
+
+def remux_segment(clip_path: Path, ffmpeg_binary: str = "ffmpeg") -> Path:
+    """Stream-copy a normalized MP4 clip into an MPEG-TS segment for HLS"""
+    segment_path = clip_path.with_suffix(".ts")
+    subprocess.run(
+        [
+            ffmpeg_binary,
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-y",
+            "-i",
+            str(clip_path),
+            "-c",
+            "copy",
+            "-bsf:v",
+            "h264_mp4toannexb",
+            "-f",
+            "mpegts",
+            str(segment_path),
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return segment_path
+
+
+class LexiconIngestor:
+    """Drive clip normalization for the whole lexicon"""
+
+    def __init__(
+        self,
+        source_root: Path,
+        output_root: Path,
+        qualities: Iterable[VideoQuality] = (VideoQuality.MEDIUM,),
+        workers: Optional[int] = None,
+        upload: bool = False,
+        session_factory=AsyncSessionLocal,
+    ):
+        self.source_root = Path(source_root)
+        self.output_root = Path(output_root)
+        self.qualities = list(qualities)
+        self.workers = workers or os.cpu_count() or 1
+        self.upload = upload
+        self.session_factory = session_factory
+        self._storage = None
+
+    def output_path_for(self, gesture_id: int, quality: VideoQuality) -> Path:
+        return self.output_root / quality.value / f"{gesture_id}.mp4"
+
+    async def run(self, force: bool = False) -> IngestReport:
+        """Normalize every gesture clip, skipping unchanged sources unless forced"""
+        report = IngestReport()
+        loop = asyncio.get_running_loop()
+
+        async with self.session_factory() as session:
+            gestures = (await session.exec(select(SignGesture))).all()
+            renditions = (await session.exec(select(SignClipRendition))).all()
+        existing = {(r.gesture_id, r.quality): r for r in renditions}
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            # Hash sources in the pool too, lexicon clips can be large
+            sources = {}
+            for gesture in gestures:
+                source = self._resolve_source(gesture.video_path)
+                if source is None:
+                    report.failed += 1
+                    report.errors[str(gesture.id)] = f"Source not found: {gesture.video_path}"
+                    continue
+                sources[gesture.id] = source
+
+            hashes = await asyncio.gather(
+                *(
+                    loop.run_in_executor(pool, hash_file, source)
+                    for source in sources.values()
+                )
+            )
+            source_hashes = dict(zip(sources.keys(), hashes))
+
+            jobs = []
+            for gesture_id, source in sources.items():
+                for quality in self.qualities:
+                    output = self.output_path_for(gesture_id, quality)
+                    current = existing.get((gesture_id, quality.value))
+                    if (
+                        not force
+                        and current is not None
+                        and current.source_hash == source_hashes[gesture_id]
+                        and Path(current.video_path).exists()
+                        and (current.segment_url or not self.upload)
+                    ):
+                        report.skipped += 1
+                        continue
+
+                    future = loop.run_in_executor(
+                        pool,
+                        normalize_clip,
+                        str(source),
+                        str(output),
+                        CANONICAL_PROFILES[quality],
+                        source_hashes[gesture_id],
+                    )
+                    jobs.append((gesture_id, quality, future))
+
+            results = await asyncio.gather(
+                *(future for _, _, future in jobs), return_exceptions=True
+            )
+
+        async with self.session_factory() as session:
+            for (gesture_id, quality, _), result in zip(jobs, results):
+                if isinstance(result, Exception):
+                    report.failed += 1
+                    report.errors[f"{gesture_id}:{quality.value}"] = str(result)
+                    logger.error(
+                        f"Failed to normalize gesture {gesture_id} ({quality.value}): {result}"
+                    )
+                    continue
+
+                rendition = existing.get((gesture_id, quality.value)) or SignClipRendition(
+                    gesture_id=gesture_id, quality=quality.value
+                )
+                rendition.video_path = result.output_path
+                rendition.source_hash = result.source_hash
+                rendition.duration_ms = result.duration_ms
+                rendition.frame_count = result.frame_count
+                rendition.keyframe_offsets_ms = result.keyframe_offsets_ms
+                if self.upload:
+                    try:
+                        rendition.segment_url = await self._upload_segment(
+                            gesture_id, quality, result
+                        )
+                    except Exception as e:
+                        report.failed += 1
+                        report.errors[f"{gesture_id}:{quality.value}"] = str(e)
+                        continue
+                session.add(rendition)
+                report.transcoded += 1
+            await session.commit()
+
+        logger.info(
+            f"Lexicon ingest finished: {report.transcoded} transcoded, "
+            f"{report.skipped} skipped, {report.failed} failed"
+        )
+        return report
+
+    async def _upload_segment(
+        self, gesture_id: int, quality: VideoQuality, clip: ClipMetadata
+    ) -> str:
+        if self._storage is None:
+            from app.utils.storage_service import get_storage_service
+
+            self._storage = get_storage_service()
+        # Named by the segment's own bytes, so the immutable name never changes
+        # content; a forced re-ingest of the same bytes simply overwrites it
+        destination = f"lexicon/{quality.value}/{gesture_id}_{clip.segment_hash[:16]}.ts"
+        return await self._storage.upload_video(
+            Path(clip.segment_path),
+            destination,
+            cache_control=SEGMENT_CACHE_CONTROL,
+            upsert=True,
+            content_hash=clip.segment_hash,
+        )
+
+    def _resolve_source(self, video_path: str) -> Optional[Path]:
+        path = Path(video_path)
+        if not path.is_absolute():
+            path = self.source_root / path
+        return path if path.is_file() else None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Normalize sign lexicon clips into canonical profiles"
+    )
+    parser.add_argument("--source-root", type=Path, default=Path("."))
+    parser.add_argument(
+        "--output-root", type=Path, default=Path("static/lexicon_normalized")
+    )
+    parser.add_argument(
+        "--quality",
+        action="append",
+        choices=[quality.value for quality in VideoQuality],
+        help="Quality to produce, repeatable (default: 720p)",
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--force", action="store_true", help="Re-encode even unchanged sources"
+    )
+    parser.add_argument(
+        "--upload",
+        action="store_true",
+        help="Upload HLS segments to storage and record their URLs",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    ingestor = LexiconIngestor(
+        source_root=args.source_root,
+        output_root=args.output_root,
+        qualities=[VideoQuality(q) for q in (args.quality or ["720p"])],
+        workers=args.workers,
+        upload=args.upload,
+    )
+    report = asyncio.run(ingestor.run(force=args.force))
+    for key, error in report.errors.items():
+        print(f"{key}: {error}")
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,461 @@
+"""
+Manifest of the objects uploaded to storage.
+
+Every upload is recorded in ``StorageObject`` (path, owner, size, content
+hash, created_at, last_accessed_at), so storage statistics are aggregate
+queries and age-based cleanup is a range scan on the (user_id, created_at)
+index instead of bucket listings and filename parsing.
+
+Objects uploaded before the manifest existed can be recorded once with:
+    python -m app.utils.object_manifest --backfill
+"""
+
+import argparse
+import asyncio
+import hashlib
+import logging
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, exists, func, literal, or_, tuple_, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import select
+
+from app.db.config import AsyncSessionLocal
+from app.db.models import StorageObject, StorageObjectRef
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+# Generated videos live under "user_{id}/..."
+USER_PREFIX_PATTERN = re.compile(r"^/?user_(\d+)(?:/|$)")
+
+
+def user_id_from_path(path: str) -> Optional[int]:
+    """Owner encoded in an object path or user prefix, None for shared objects"""
+    match = USER_PREFIX_PATTERN.match(path)
+    return int(match.group(1)) if match else None
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ObjectManifest:
+    """
+    Reads and writes of the ``StorageObject`` table.
+
+    Recording is best effort: a failed write is logged and counted but never
+    fails the upload it describes (the backfill can repair the manifest).
+    """
+
+    def __init__(self, session_factory=AsyncSessionLocal):
+        self.session_factory = session_factory
+
+        # Monitoring
+        self._manifest_stats = {
+            "recorded": 0,
+            "removed": 0,
+            "references_added": 0,
+            "references_released": 0,
+            "record_failures": 0,
+            "remove_failures": 0,
+        }
+
+    async def record(
+        self,
+        path: str,
+        size_bytes: int,
+        content_hash: Optional[str] = None,
+        user_id: Optional[int] = None,
+        created_at: Optional[datetime] = None,
+    ) -> None:
+        """
+        Insert or refresh the entry of an uploaded object
+
+        Args:
+            path: Object path inside the bucket
+            size_bytes: Object size
+            content_hash: sha256 of the object bytes, if known
+            user_id: Owner, derived from the path when omitted
+            created_at: Upload time, now when omitted
+        """
+        now = datetime.now()
+        statement = insert(StorageObject).values(
+            path=path,
+            user_id=user_id if user_id is not None else user_id_from_path(path),
+            size_bytes=size_bytes,
+            content_hash=content_hash,
+            created_at=created_at or now,
+            last_accessed_at=now,
+        )
+        # Overwrites (upserts) keep created_at but refresh size, hash and access time
+        statement = statement.on_conflict_do_update(
+            index_elements=[StorageObject.path],
+            set_={
+                "size_bytes": statement.excluded.size_bytes,
+                "content_hash": statement.excluded.content_hash,
+                "last_accessed_at": statement.excluded.last_accessed_at,
+            },
+        )
+        try:
+            async with self.session_factory() as session:
+                await session.exec(statement)
+                await session.commit()
+            self._manifest_stats["recorded"] += 1
+        except Exception as e:
+            self._manifest_stats["record_failures"] += 1
+            logger.error(f"Failed to record {path} in the storage manifest: {str(e)}")
+
+    async def touch(self, paths: List[str]) -> None:
+        """Mark objects as accessed now"""
+        if not paths:
+            return
+        try:
+            async with self.session_factory() as session:
+                await session.exec(
+                    update(StorageObject)
+                    .where(StorageObject.path.in_(paths))
+                    .values(last_accessed_at=datetime.now())
+                )
+                await session.commit()
+        except Exception as e:
+            logger.warning(f"Failed to touch {len(paths)} manifest entries: {str(e)}")
+
+    async def add_reference(self, path: str, user_id: int) -> bool:
+        """
+        Record that a user is served a shared object, refreshing an existing claim
+
+        Also marks the object as accessed, which keeps it out of the cleanup
+        of other users' claims.
+
+        Returns:
+            True if the object is in the manifest (so it need not be uploaded)
+        """
+        now = datetime.now()
+        claim = insert(StorageObjectRef).from_select(
+            ["object_id", "user_id", "created_at"],
+            select(StorageObject.id, literal(int(user_id)), literal(now)).where(
+                StorageObject.path == path
+            ),
+        )
+        claim = claim.on_conflict_do_update(
+            index_elements=[StorageObjectRef.object_id, StorageObjectRef.user_id],
+            set_={"created_at": claim.excluded.created_at},
+        )
+        try:
+            async with self.session_factory() as session:
+                touched = await session.exec(
+                    update(StorageObject)
+                    .where(StorageObject.path == path)
+                    .values(last_accessed_at=now)
+                )
+                if touched.rowcount == 0:
+                    return False
+                await session.exec(claim)
+                await session.commit()
+            self._manifest_stats["references_added"] += 1
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to reference {path} for user {user_id}: {str(e)}")
+            return False
+
+    async def add_references(self, claims: List[Tuple[str, int]]) -> int:
+        """
+        Bulk ``add_reference`` for ``(path, user_id)`` pairs, in one transaction
+
+        Pairs whose object is not in the manifest are skipped.
+
+        Returns:
+            Number of claims added or refreshed
+
+        Raises:
+            Exception: If the transaction fails, so the caller can retry
+        """
+        if not claims:
+            return 0
+        now = datetime.now()
+        paths = list({path for path, _ in claims})
+        async with self.session_factory() as session:
+            object_ids = dict(
+                (
+                    await session.exec(
+                        select(StorageObject.path, StorageObject.id).where(
+                            StorageObject.path.in_(paths)
+                        )
+                    )
+                ).all()
+            )
+            rows = [
+                {
+                    "object_id": object_ids[path],
+                    "user_id": int(user_id),
+                    "created_at": now,
+                }
+                for path, user_id in dict.fromkeys(claims)
+                if path in object_ids
+            ]
+            if not rows:
+                return 0
+            await session.exec(
+                update(StorageObject)
+                .where(StorageObject.id.in_(list(object_ids.values())))
+                .values(last_accessed_at=now)
+            )
+            statement = insert(StorageObjectRef).values(rows)
+            statement = statement.on_conflict_do_update(
+                index_elements=[StorageObjectRef.object_id, StorageObjectRef.user_id],
+                set_={"created_at": statement.excluded.created_at},
+            )
+            await session.exec(statement)
+            await session.commit()
+        self._manifest_stats["references_added"] += len(rows)
+        return len(rows)
+
+    async def remove(self, paths: List[str]) -> None:
+        """Forget deleted objects"""
+        if not paths:
+            return
+        try:
+            async with self.session_factory() as session:
+                await session.exec(
+                    delete(StorageObject).where(StorageObject.path.in_(paths))
+                )
+                await session.commit()
+            self._manifest_stats["removed"] += len(paths)
+        except Exception as e:
+            self._manifest_stats["remove_failures"] += 1
+            logger.error(
+                f"Failed to remove {len(paths)} entries from the storage manifest: {str(e)}"
+            )
+
+    async def get_usage(self, user_id: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Object count, total size and age range, for one user or the whole bucket
+
+        Returns:
+            Dictionary with ``file_count``, ``total_size_bytes``, ``oldest``
+            and ``newest`` (None when there are no objects)
+        """
+        statement = select(
+            func.count(StorageObject.id),
+            func.coalesce(func.sum(StorageObject.size_bytes), 0),
+            func.min(StorageObject.created_at),
+            func.max(StorageObject.created_at),
+        )
+        if user_id is not None:
+            # Objects the user owns plus the shared objects they claim
+            claimed = select(StorageObjectRef.object_id).where(
+                StorageObjectRef.user_id == user_id
+            )
+            statement = statement.where(
+                or_(StorageObject.user_id == user_id, StorageObject.id.in_(claimed))
+            )
+
+        async with self.session_factory() as session:
+            count, total_size, oldest, newest = (await session.exec(statement)).one()
+        return {
+            "file_count": count,
+            "total_size_bytes": int(total_size),
+            "oldest": oldest,
+            "newest": newest,
+        }
+
+    async def iter_older_than(
+        self, user_id: int, cutoff: datetime, page_size: int = 1000
+    ) -> AsyncIterator[Tuple[str, int]]:
+        """
+        Path and size of every object of a user created before ``cutoff``
+
+        Walks the (user_id, created_at) index in keyset pages, so each page
+        is an index range scan whatever the number of objects.
+        """
+        last: Optional[Tuple[datetime, int]] = None
+        while True:
+            statement = (
+                select(
+                    StorageObject.id,
+                    StorageObject.path,
+                    StorageObject.size_bytes,
+                    StorageObject.created_at,
+                )
+                .where(StorageObject.user_id == user_id)
+                .where(StorageObject.created_at < cutoff)
+                .order_by(StorageObject.created_at, StorageObject.id)
+                .limit(page_size)
+            )
+            if last is not None:
+                statement = statement.where(
+                    tuple_(StorageObject.created_at, StorageObject.id) > tuple_(*last)
+                )
+
+            async with self.session_factory() as session:
+                rows = (await session.exec(statement)).all()
+
+            for object_id, path, size_bytes, created_at in rows:
+                yield path, size_bytes
+            if len(rows) < page_size:
+                return
+            last = (rows[-1][3], rows[-1][0])
+
+    async def iter_claimed_older_than(
+        self, user_id: int, cutoff: datetime, page_size: int = 1000
+    ) -> AsyncIterator[Tuple[str, int]]:
+        """
+        Path and size of every shared object a user claimed before ``cutoff``
+
+        Only reads: the claims are released by ``release_for_deletion`` in
+        the same step that deletes their objects, so an interrupted cleanup
+        never leaves an object without claims and without a deletion.
+        """
+        last: Optional[Tuple[datetime, int]] = None
+        while True:
+            statement = (
+                select(
+                    StorageObjectRef.id,
+                    StorageObjectRef.created_at,
+                    StorageObject.path,
+                    StorageObject.size_bytes,
+                )
+                .join(StorageObject, StorageObject.id == StorageObjectRef.object_id)
+                .where(StorageObjectRef.user_id == user_id)
+                .where(StorageObjectRef.created_at < cutoff)
+                .order_by(StorageObjectRef.created_at, StorageObjectRef.id)
+                .limit(page_size)
+            )
+            if last is not None:
+                statement = statement.where(
+                    tuple_(StorageObjectRef.created_at, StorageObjectRef.id)
+                    > tuple_(*last)
+                )
+
+            async with self.session_factory() as session:
+                rows = (await session.exec(statement)).all()
+
+            for claim_id, created_at, path, size_bytes in rows:
+                yield path, size_bytes
+            if len(rows) < page_size:
+                return
+            last = (rows[-1][1], rows[-1][0])
+
+    async def release_for_deletion(
+        self, paths: List[str], user_id: int, cutoff: datetime
+    ) -> List[str]:
+        """
+        Drop a user's claims older than ``cutoff`` on shared objects about to
+        be deleted, and return the paths that may be deleted now
+
+        In one transaction the claims are dropped and the manifest rows of
+        the objects left unclaimed and not accessed since ``cutoff`` are
+        deleted. A concurrent ``add_reference`` then either claimed the object
+        first (it is kept) or finds no row and uploads it again. Paths with no
+        manifest row at all were released by an earlier, interrupted attempt
+        and are returned too, so a resumed cleanup finishes them.
+
+        Raises:
+            Exception: If the transaction fails, nothing is released then
+        """
+        if not paths:
+            return []
+        async with self.session_factory() as session:
+            objects = (
+                await session.exec(
+                    select(StorageObject.id, StorageObject.path).where(
+                        StorageObject.path.in_(paths)
+                    )
+                )
+            ).all()
+            object_ids = [object_id for object_id, _ in objects]
+            released = await session.exec(
+                delete(StorageObjectRef)
+                .where(StorageObjectRef.user_id == user_id)
+                .where(StorageObjectRef.created_at < cutoff)
+                .where(StorageObjectRef.object_id.in_(object_ids))
+            )
+            unclaimed = (
+                await session.exec(
+                    delete(StorageObject)
+                    .where(StorageObject.id.in_(object_ids))
+                    .where(StorageObject.last_accessed_at < cutoff)
+                    .where(
+                        ~exists().where(StorageObjectRef.object_id == StorageObject.id)
+                    )
+                    .returning(StorageObject.path)
+                )
+            ).all()
+            await session.commit()
+        self._manifest_stats["references_released"] += released.rowcount
+
+        known = {path for _, path in objects}
+        deletable = {path for (path,) in unclaimed}
+        return [path for path in paths if path in deletable or path not in known]
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get manifest write statistics for monitoring"""
+        return {**self._manifest_stats, "timestamp": datetime.now().isoformat()}
+
+
+# Shared manifest
+object_manifest = ObjectManifest()
+
+
+async def backfill(page_size: int = 1000) -> int:
+    """
+    Record every object currently in the bucket, returns how many were seen
+
+    Folders are walked at every depth, so nested layouts such as
+    ``videos/ab/<sha256>.mp4`` and ``lexicon/<quality>/...`` are recorded too.
+    """
+    from app.utils.storage_service import get_storage_service
+
+    backend = get_storage_service().backend
+    recorded = 0
+    folders = [""]
+    while folders:
+        folder = folders.pop()
+        async with backend.iter_objects(folder, page_size=page_size) as listing:
+            async for entry in listing:
+                path = f"{folder}/{entry['name']}" if folder else entry["name"]
+                if not entry.get("metadata"):
+                    folders.append(path)
+                    continue
+                created_at = None
+                if entry.get("created_at"):
+                    # Stored as naive local time like every other timestamp
+                    created_at = (
+                        datetime.fromisoformat(entry["created_at"].replace("Z", "+00:00"))
+                        .astimezone()
+                        .replace(tzinfo=None)
+                    )
+                await object_manifest.record(
+                    path,
+                    size_bytes=entry["metadata"].get("size", 0),
+                    created_at=created_at,
+                )
+                recorded += 1
+    return recorded
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--backfill",
+        action="store_true",
+        help="Record the objects already in the bucket",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    if args.backfill:
+        print(f"Recorded {asyncio.run(backfill())} objects")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,217 @@
+import logging
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from app.utils.sign_lexicon import (
+    LexiconEntry,
+    LexiconSnapshot,
+    normalize_lexicon_key,
+    sign_lexicon,
+)
+
+logger = logging.getLogger(__name__)
+
+# Latin and Arabic punctuation stripped from token edges
+PUNCTUATION = ".,!?;:\"'()[]{}«»…،؛؟"
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into normalized words suitable for lexicon matching"""
+    words = []
+    for word in normalize_lexicon_key(text).split(" "):
+        word = word.strip(PUNCTUATION)
+        if word:
+            words.append(word)
+    return words
+
+
+@dataclass
+class SignSegment:
+    """One unit of the signed output: a lexicon sign, a fingerspelled word or a gap"""
+
+    text: str
+    kind: str  # "sign", "fingerspell" or "unknown"
+    entries: List[LexiconEntry] = field(default_factory=list)
+    word_count: int = 1
+
+    @property
+    def clip_count(self) -> int:
+        return len(self.entries)
+
+
+class AhoCorasickAutomaton:
+    """
+    Aho-Corasick automaton over word sequences.
+
+    Patterns are tuples of words, so matches always fall on word boundaries.
+    Scanning a text reports every pattern occurrence in time linear in the
+    number of words plus the number of matches.
+    """
+
+    def __init__(self, patterns: Dict[Tuple[str, ...], LexiconEntry]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._depth: List[int] = [0]
+        self._output: List[Optional[LexiconEntry]] = [None]
+        # Nearest proper suffix state that ends a pattern, -1 if none
+        self._output_link: List[int] = [-1]
+
+        for words, entry in patterns.items():
+            self._insert(words, entry)
+        self._build_links()
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+    def iter_matches(
+        self, words: List[str]
+    ) -> Iterator[Tuple[int, int, LexiconEntry]]:
+        """Yield (end_index, length, entry) for every pattern occurrence"""
+        state = 0
+        for index, word in enumerate(words):
+            while state and word not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(word, 0)
+
+            match = state if self._output[state] is not None else self._output_link[state]
+            while match > 0:
+                yield index, self._depth[match], self._output[match]
+                match = self._output_link[match]
+
+    # Private helper methods
+
+    def _insert(self, words: Tuple[str, ...], entry: LexiconEntry) -> None:
+        state = 0
+        for word in words:
+            next_state = self._goto[state].get(word)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._depth.append(self._depth[state] + 1)
+                self._output.append(None)
+                self._output_link.append(-1)
+                self._goto[state][word] = next_state
+            state = next_state
+        if self._output[state] is None:
+            self._output[state] = entry
+
+    def _build_links(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, child in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and word not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(word, 0)
+                self._fail[child] = target if target != child else 0
+
+                suffix = self._fail[child]
+                self._output_link[child] = (
+                    suffix if self._output[suffix] is not None else self._output_link[suffix]
+                )
+                queue.append(child)
+
+
+class PhraseSegmenter:
+    """
+    Longest-match segmentation of text into lexicon signs.
+
+    Builds one automaton per language from the current lexicon snapshot (rebuilt
+    lazily after each swap) and picks the segmentation needing the fewest clips:
+    a lexicon phrase costs one clip, an unknown word is fingerspelled letter by
+    letter when the lexicon has every letter, otherwise it is reported as a gap.
+    """
+
+    def __init__(self, lexicon=sign_lexicon):
+        self.lexicon = lexicon
+        self._snapshot: Optional[LexiconSnapshot] = None
+        self._automata: Dict[str, AhoCorasickAutomaton] = {}
+
+    def segment(self, text: str, language_code: str) -> List[SignSegment]:
+        """Turn text into the cheapest sequence of sign segments"""
+        snapshot = self.lexicon.snapshot
+        words = tokenize(text)
+        if not words:
+            return []
+
+        automaton = self._automaton_for(snapshot, language_code)
+        matches_ending: List[List[Tuple[int, LexiconEntry]]] = [[] for _ in words]
+        for end, length, entry in automaton.iter_matches(words):
+            matches_ending[end].append((length, entry))
+
+        # cost[i] is the minimum clip count covering words[:i]
+        infinity = float("inf")
+        cost = [0.0] + [infinity] * len(words)
+        choice: List[Optional[SignSegment]] = [None] * (len(words) + 1)
+        spelled: Dict[str, SignSegment] = {}
+
+        for end in range(len(words)):
+            # Matches arrive longest first, so ties keep the longer phrase
+            for length, entry in matches_ending[end]:
+                candidate = cost[end + 1 - length] + 1
+                if candidate < cost[end + 1]:
+                    cost[end + 1] = candidate
+                    choice[end + 1] = SignSegment(
+                        text=" ".join(words[end + 1 - length : end + 1]),
+                        kind="sign",
+                        entries=[entry],
+                        word_count=length,
+                    )
+
+            word = words[end]
+            if word not in spelled:
+                spelled[word] = self._fallback_segment(word, snapshot, language_code)
+            fallback = spelled[word]
+            # A gap costs one clip too, so signs are never traded for gaps
+            fallback_cost = cost[end] + max(fallback.clip_count, 1)
+            if fallback_cost < cost[end + 1]:
+                cost[end + 1] = fallback_cost
+                choice[end + 1] = fallback
+
+        segments = []
+        position = len(words)
+        while position > 0:
+            segment = choice[position]
+            segments.append(segment)
+            position -= segment.word_count
+        segments.reverse()
+        return segments
+
+    # Private helper methods
+
+    def _automaton_for(
+        self, snapshot: LexiconSnapshot, language_code: str
+    ) -> AhoCorasickAutomaton:
+        if snapshot is not self._snapshot:
+            # New snapshot swapped in, drop automata built from the old one
+            self._automata = {}
+            self._snapshot = snapshot
+
+        automaton = self._automata.get(language_code)
+        if automaton is None:
+            patterns = {}
+            for entry in snapshot.entries_for_language(language_code):
+                words = tuple(tokenize(entry.text))
+                if words:
+                    patterns.setdefault(words, entry)
+            automaton = AhoCorasickAutomaton(patterns)
+            self._automata[language_code] = automaton
+            logger.info(
+                f"Built phrase automaton for '{language_code}' with {len(patterns)} phrases"
+            )
+        return automaton
+
+    def _fallback_segment(
+        self, word: str, snapshot: LexiconSnapshot, language_code: str
+    ) -> SignSegment:
+        letters = [snapshot.lookup(letter, language_code) for letter in word]
+        if letters and all(letters):
+            return SignSegment(text=word, kind="fingerspell", entries=letters)
+        return SignSegment(text=word, kind="unknown")
+
+
+# Shared segmenter following the shared lexicon
+phrase_segmenter = PhraseSegmenter()
@@ -0,0 +1,319 @@
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import os
+import uuid
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.utils.exceptions import StorageError
+from app.utils.http_pool import SharedHttpClient, shared_http_client
+from app.utils.retry_policy import RetryPolicy, upload_retry_policy
+
+logger = logging.getLogger(__name__)
+
+TUS_VERSION = "1.0.0"
+# Supabase's resumable endpoint only accepts 6 MiB chunks (the last one may be shorter)
+TUS_CHUNK_SIZE = 6 * 1024 * 1024
+
+
+@dataclass
+class UploadState:
+    """Progress of one resumable upload, persisted between attempts"""
+
+    fingerprint: str
+    upload_url: str
+    destination_path: str
+    file_size: int
+    offset: int = 0
+    updated_at: Optional[str] = None
+
+
+def upload_fingerprint(file_path: Path, destination_path: str) -> str:
+    """Identify an upload by file identity and destination, so edits start over"""
+    stat = file_path.stat()
+    content = "\x1f".join(
+        (str(file_path.resolve()), str(stat.st_size), str(stat.st_mtime_ns), destination_path)
+    )
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+class UploadStateStore:
+    """
+    One small JSON file per in-progress upload.
+
+    Written atomically (temp file plus rename) after every acknowledged chunk,
+    so a crash or restart resumes from the last offset the server confirmed.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def load(self, fingerprint: str) -> Optional[UploadState]:
+        path = self._path(fingerprint)
+        try:
+            return UploadState(**json.loads(path.read_text(encoding="utf-8")))
+        except FileNotFoundError:
+            return None
+        except (ValueError, TypeError) as e:
+            logger.warning(f"Discarding unreadable upload state {path}: {str(e)}")
+            path.unlink(missing_ok=True)
+            return None
+
+    def save(self, state: UploadState) -> None:
+        state.updated_at = datetime.now().isoformat()
+        path = self._path(state.fingerprint)
+        partial = path.with_suffix(f".{uuid.uuid4().hex[:8]}.tmp")
+        partial.write_text(json.dumps(asdict(state)), encoding="utf-8")
+        os.replace(partial, path)
+
+    def delete(self, fingerprint: str) -> None:
+        self._path(fingerprint).unlink(missing_ok=True)
+
+    def _path(self, fingerprint: str) -> Path:
+        return self.directory / f"{fingerprint}.json"
+
+
+class TusUploader:
+    """
+    Client for the TUS 1.0 resumable upload protocol (Supabase Storage flavour).
+
+    The file is sent in fixed-size PATCH requests. After a failed chunk the
+    uploader asks the server for its offset (HEAD) and resends from there, so
+    a network error costs at most one chunk instead of the whole file. Offsets
+    are persisted, so a later call for the same file and destination resumes
+    an interrupted upload rather than starting again. Chunk retries follow
+    the shared upload ``RetryPolicy`` (backoff, request deadline and budget).
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        headers: Dict[str, str],
+        state_store: UploadStateStore,
+        chunk_size: int = TUS_CHUNK_SIZE,
+        http: SharedHttpClient = shared_http_client,
+        retry_policy: RetryPolicy = upload_retry_policy,
+    ):
+        self.endpoint = endpoint
+        self.headers = headers
+        self.state_store = state_store
+        self.chunk_size = chunk_size
+        self.http = http
+        self.retry_policy = retry_policy
+
+        # Monitoring
+        self._tus_stats = {
+            "uploads_completed": 0,
+            "uploads_resumed": 0,
+            "chunks_sent": 0,
+            "chunk_retries": 0,
+            "bytes_sent": 0,
+        }
+
+    async def upload(
+        self,
+        file_path: Path,
+        destination_path: str,
+        bucket: str,
+        content_type: str,
+        cache_control: str = "3600",
+        upsert: bool = False,
+    ) -> int:
+        """
+        Upload a file through the resumable endpoint, resuming if possible
+
+        Args:
+            file_path: Local file to upload
+            destination_path: Object path inside the bucket
+            bucket: Storage bucket name
+            content_type: MIME type of the file
+            cache_control: Cache max-age in seconds served with the file
+            upsert: Whether to overwrite an existing object
+
+        Returns:
+            Number of bytes sent by this call (less than the file size on resume)
+
+        Raises:
+            StorageError: If the server rejects the upload or a chunk keeps failing
+            StorageDeadlineExceededError: If the request deadline runs out
+        """
+        # State files and the source are touched in worker threads only
+        file_size = (await asyncio.to_thread(file_path.stat)).st_size
+        fingerprint = await asyncio.to_thread(
+            upload_fingerprint, file_path, destination_path
+        )
+        bytes_sent = 0
+
+        client = self.http.client
+        state = await asyncio.to_thread(self.state_store.load, fingerprint)
+        offset = None
+        if state is not None:
+            offset = await self.retry_policy.within_deadline(
+                self._server_offset(client, state.upload_url), "tus_chunk"
+            )
+            if offset is None:
+                # Expired or unknown on the server, start a fresh upload
+                await asyncio.to_thread(self.state_store.delete, fingerprint)
+                state = None
+            else:
+                self._tus_stats["uploads_resumed"] += 1
+                logger.info(
+                    f"Resuming upload of {destination_path} at {offset}/{file_size} bytes"
+                )
+
+        if state is None:
+            upload_url = await self.retry_policy.within_deadline(
+                self._create(
+                    client,
+                    file_size,
+                    bucket,
+                    destination_path,
+                    content_type,
+                    cache_control,
+                    upsert,
+                ),
+                "tus_create",
+            )
+            state = UploadState(
+                fingerprint=fingerprint,
+                upload_url=upload_url,
+                destination_path=destination_path,
+                file_size=file_size,
+            )
+            await asyncio.to_thread(self.state_store.save, state)
+            offset = 0
+
+        f = await asyncio.to_thread(open, file_path, "rb")
+        try:
+            failures = 0
+            resync = False
+            while resync or offset < file_size:
+                try:
+                    if resync:
+                        # The server may have stored part of the failed chunk
+                        offset = await self.retry_policy.within_deadline(
+                            self._server_offset(client, state.upload_url), "tus_chunk"
+                        )
+                        if offset is None:
+                            raise StorageError("Resumable upload expired on the server")
+                        resync = False
+                        continue
+                    chunk = await asyncio.to_thread(self._read_chunk, f, offset)
+                    offset = await self.retry_policy.within_deadline(
+                        self._patch(client, state.upload_url, offset, chunk), "tus_chunk"
+                    )
+                except (httpx.TransportError, _RetryableStatus) as e:
+                    failures += 1
+                    if not await self.retry_policy.backoff(failures, e, "tus_chunk"):
+                        raise StorageError(
+                            f"Chunk at offset {offset} failed {failures} times: {str(e)}"
+                        )
+                    self._tus_stats["chunk_retries"] += 1
+                    resync = True
+                    continue
+
+                failures = 0
+                bytes_sent += len(chunk)
+                self._tus_stats["chunks_sent"] += 1
+                self._tus_stats["bytes_sent"] += len(chunk)
+                state.offset = offset
+                await asyncio.to_thread(self.state_store.save, state)
+        finally:
+            await asyncio.to_thread(f.close)
+
+        await asyncio.to_thread(self.state_store.delete, fingerprint)
+        self._tus_stats["uploads_completed"] += 1
+        return bytes_sent
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get resumable upload statistics for monitoring"""
+        return {**self._tus_stats, "timestamp": datetime.now().isoformat()}
+
+    # Private helper methods
+
+    def _read_chunk(self, f, offset: int) -> bytes:
+        f.seek(offset)
+        return f.read(self.chunk_size)
+
+    async def _create(
+        self,
+        client: httpx.AsyncClient,
+        file_size: int,
+        bucket: str,
+        destination_path: str,
+        content_type: str,
+        cache_control: str,
+        upsert: bool,
+    ) -> str:
+        metadata = {
+            "bucketName": bucket,
+            "objectName": destination_path,
+            "contentType": content_type,
+            "cacheControl": cache_control,
+        }
+        response = await client.post(
+            self.endpoint,
+            headers={
+                **self.headers,
+                "tus-resumable": TUS_VERSION,
+                "upload-length": str(file_size),
+                "upload-metadata": ",".join(
+                    f"{key} {base64.b64encode(value.encode()).decode()}"
+                    for key, value in metadata.items()
+                ),
+                "x-upsert": "true" if upsert else "false",
+            },
+        )
+        if response.status_code != 201 or "location" not in response.headers:
+            raise StorageError(
+                f"Could not create resumable upload: HTTP {response.status_code} {response.text}"
+            )
+        return str(response.url.join(response.headers["location"]))
+
+    async def _server_offset(
+        self, client: httpx.AsyncClient, upload_url: str
+    ) -> Optional[int]:
+        response = await client.head(
+            upload_url, headers={**self.headers, "tus-resumable": TUS_VERSION}
+        )
+        if response.status_code in (404, 410):
+            return None
+        if response.status_code >= 500:
+            raise _RetryableStatus(f"HTTP {response.status_code}")
+        if response.status_code >= 400 or "upload-offset" not in response.headers:
+            raise StorageError(f"Could not read upload offset: HTTP {response.status_code}")
+        return int(response.headers["upload-offset"])
+
+    async def _patch(
+        self, client: httpx.AsyncClient, upload_url: str, offset: int, chunk: bytes
+    ) -> int:
+        response = await client.patch(
+            upload_url,
+            content=chunk,
+            headers={
+                **self.headers,
+                "tus-resumable": TUS_VERSION,
+                "upload-offset": str(offset),
+                "content-type": "application/offset+octet-stream",
+            },
+        )
+        if response.status_code == 409 or response.status_code >= 500:
+            # Offset mismatch or transient server error, resync and resend
+            raise _RetryableStatus(f"HTTP {response.status_code}")
+        if response.status_code != 204:
+            raise StorageError(
+                f"Chunk rejected: HTTP {response.status_code} {response.text}"
+            )
+        return int(response.headers["upload-offset"])
+
+
+class _RetryableStatus(Exception):
+    """A chunk response that should be retried after resyncing the offset"""
@@ -0,0 +1,267 @@
+import asyncio
+import contextvars
+import logging
+import random
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Iterator, Optional, Tuple, Type, TypeVar
+
+import httpx
+
+from app.utils.exceptions import (
+    StorageConnectionError,
+    StorageDeadlineExceededError,
+    StorageThrottledError,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Transient failures: the same request may succeed when sent again
+RETRYABLE_ERRORS: Tuple[Type[BaseException], ...] = (
+    httpx.TransportError,
+    StorageConnectionError,
+    StorageThrottledError,
+)
+
+# Absolute monotonic time the current request must finish by, None for no limit
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "deadline", default=None
+)
+
+
+@contextmanager
+def deadline(seconds: float) -> Iterator[None]:
+    """
+    Bound everything awaited inside the block to ``seconds`` from now
+
+    Nested deadlines never extend an enclosing one. The value lives in a
+    context variable, so it follows the request into every coroutine and
+    task started from the block.
+    """
+    expires_at = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is not None:
+        expires_at = min(expires_at, current)
+    token = _deadline.set(expires_at)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining_time() -> Optional[float]:
+    """Seconds left before the current deadline, None when there is none"""
+    expires_at = _deadline.get()
+    if expires_at is None:
+        return None
+    return expires_at - time.monotonic()
+
+
+class RetryBudget:
+    """
+    Process-wide token bucket limiting retries to a share of the traffic.
+
+    Every call deposits ``ratio`` tokens and every retry withdraws one, so
+    retries stay around ``ratio`` of the calls however many layers or
+    requests fail at once. ``min_per_second`` keeps a trickle of retries
+    available at low traffic. When the bucket is empty, failures are
+    returned immediately instead of multiplying the load on a backend that
+    is already failing.
+    """
+
+    def __init__(
+        self, ratio: float = 0.2, min_per_second: float = 1.0, capacity: float = 20.0
+    ):
+        self.ratio = ratio
+        self.min_per_second = min_per_second
+        self.capacity = capacity
+        self._tokens = capacity
+        self._refilled_at = time.monotonic()
+
+    def deposit(self) -> None:
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens + self.ratio)
+
+    def try_withdraw(self) -> bool:
+        self._refill()
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    @property
+    def tokens(self) -> float:
+        self._refill()
+        return self._tokens
+
+    # Private helper methods
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._refilled_at) * self.min_per_second
+        )
+        self._refilled_at = now
+
+
+class RetryPolicy:
+    """
+    The single retry policy of the storage upload path.
+
+    Retries transient errors with exponential backoff and full jitter, so
+    failed clients do not retry in lockstep. Each attempt is bounded by the
+    request deadline (see ``deadline``), a backoff that would overrun it is
+    not slept, and every retry must be paid for from the shared
+    ``RetryBudget``. Layers above the backends do not retry on their own.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 4,
+        base_delay: float = 0.25,
+        max_delay: float = 8.0,
+        budget: Optional[RetryBudget] = None,
+        retry_on: Tuple[Type[BaseException], ...] = RETRYABLE_ERRORS,
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget or RetryBudget()
+        self.retry_on = retry_on
+
+        # Monitoring, per operation name
+        self._retry_stats: Dict[str, Dict[str, int]] = {}
+
+    async def call(
+        self, operation: Callable[[], Awaitable[T]], name: str = "request"
+    ) -> T:
+        """
+        Run ``operation`` until it succeeds or may not be retried any more
+
+        Args:
+            operation: Zero-argument coroutine factory, called once per attempt
+            name: Operation name the metrics are reported under
+
+        Returns:
+            The result of the first successful attempt
+
+        Raises:
+            StorageDeadlineExceededError: If the request deadline runs out
+            Exception: The last error, if it is not retryable or retries are exhausted
+        """
+        self.budget.deposit()
+        self._count(name, "calls")
+        attempt = 0
+        while True:
+            attempt += 1
+            self._count(name, "attempts")
+            try:
+                result = await self.within_deadline(operation(), name)
+            except self.retry_on as e:
+                if await self.backoff(attempt, e, name):
+                    continue
+                raise
+            if attempt > 1:
+                self._count(name, "succeeded_after_retry")
+            return result
+
+    async def within_deadline(self, awaitable: Awaitable[T], name: str = "request") -> T:
+        """
+        Await one attempt, cancelling it when the request deadline passes
+
+        Raises:
+            StorageDeadlineExceededError: If the deadline passes first
+        """
+        remaining = remaining_time()
+        if remaining is None:
+            return await awaitable
+        if remaining <= 0:
+            if asyncio.iscoroutine(awaitable):
+                awaitable.close()
+            self._count(name, "deadline_exceeded")
+            raise StorageDeadlineExceededError(f"Deadline passed before {name}")
+        try:
+            return await asyncio.wait_for(awaitable, remaining)
+        except asyncio.TimeoutError:
+            if remaining_time() > 0:
+                # Raised by the operation itself, not by the deadline
+                raise
+            self._count(name, "deadline_exceeded")
+            raise StorageDeadlineExceededError(
+                f"Deadline passed during {name}, after {remaining:.1f}s"
+            )
+
+    async def backoff(self, attempt: int, error: BaseException, name: str) -> bool:
+        """
+        Wait before the next attempt, if one is allowed
+
+        For callers running their own loop (e.g. per-chunk retries).
+
+        Args:
+            attempt: Number of attempts failed so far
+            error: The error of the failed attempt
+            name: Operation name the metrics are reported under
+
+        Returns:
+            True after sleeping the backoff, False if the caller must give up
+
+        Raises:
+            StorageDeadlineExceededError: If the backoff would overrun the deadline
+        """
+        if attempt >= self.max_attempts:
+            self._count(name, "exhausted")
+            logger.error(f"{name} failed after {attempt} attempts: {str(error)}")
+            return False
+
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        remaining = remaining_time()
+        if remaining is not None and delay >= remaining:
+            self._count(name, "deadline_exceeded")
+            raise StorageDeadlineExceededError(
+                f"No time left to retry {name}: {str(error)}"
+            ) from error
+
+        if not self.budget.try_withdraw():
+            self._count(name, "budget_exhausted")
+            logger.warning(f"Retry budget exhausted, not retrying {name}: {str(error)}")
+            return False
+
+        self._count(name, "retries")
+        logger.warning(
+            f"{name} attempt {attempt} failed, retrying in {delay:.2f}s: {str(error)}"
+        )
+        await asyncio.sleep(delay)
+        return True
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get retry counts per operation and the budget level for monitoring"""
+        return {
+            "operations": {name: dict(counts) for name, counts in self._retry_stats.items()},
+            "budget_tokens": round(self.budget.tokens, 2),
+            "max_attempts": self.max_attempts,
+            "timestamp": datetime.now().isoformat(),
+        }
+
+    # Private helper methods
+
+    def _count(self, name: str, key: str) -> None:
+        counts = self._retry_stats.setdefault(
+            name,
+            {
+                "calls": 0,
+                "attempts": 0,
+                "retries": 0,
+                "succeeded_after_retry": 0,
+                "exhausted": 0,
+                "budget_exhausted": 0,
+                "deadline_exceeded": 0,
+            },
+        )
+        counts[key] += 1
+
+
+# Shared policy, and budget, for every storage upload
+upload_retry_policy = RetryPolicy()
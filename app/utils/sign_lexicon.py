@@ -0,0 +1,300 @@
+import asyncio
+import bisect
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlmodel import or_, select
+
+from app.db.config import AsyncSessionLocal
+from app.db.models import SignGesture, SignTranslation
+from app.utils.text_normalizer import normalize_text
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_lexicon_key(text: str) -> str:
+    """Normalize lexicon text and lookup input the same way"""
+    return normalize_text(text)
+
+
+@dataclass(frozen=True)
+class LexiconEntry:
+    """A single sign translation with the gesture it points at"""
+
+    translation_id: int
+    gesture_id: int
+    language_code: str
+    text: str
+    key: str
+    gesture_name: str
+    video_path: str
+    updated_at: Optional[datetime] = field(default=None, compare=False)
+
+    @property
+    def word_count(self) -> int:
+        return len(self.key.split(" "))
+
+
+@dataclass
+class _TrieNode:
+    children: Dict[str, "_TrieNode"] = field(default_factory=dict)
+    entry: Optional[LexiconEntry] = None
+
+
+class LexiconSnapshot:
+    """
+    Immutable view of the sign lexicon.
+
+    Holds an exact-match dict keyed by (language, normalized text), a
+    per-language word trie for phrase matching and a sorted key list per
+    language for character prefix lookups. Snapshots are never mutated after
+    construction, so readers can use one without any locking.
+    """
+
+    def __init__(
+        self,
+        entries: Dict[int, LexiconEntry],
+        version: Optional[datetime] = None,
+    ):
+        self.entries = entries
+        self.version = version
+        self._exact: Dict[Tuple[str, str], LexiconEntry] = {}
+        self._tries: Dict[str, _TrieNode] = {}
+        self._sorted_keys: Dict[str, List[str]] = {}
+
+        for entry in sorted(entries.values(), key=lambda e: e.translation_id):
+            # Lowest translation id wins when two rows share the same text
+            self._exact.setdefault((entry.language_code, entry.key), entry)
+
+        for (language_code, key), entry in self._exact.items():
+            node = self._tries.setdefault(language_code, _TrieNode())
+            for word in key.split(" "):
+                node = node.children.setdefault(word, _TrieNode())
+            node.entry = entry
+            self._sorted_keys.setdefault(language_code, []).append(key)
+
+        for keys in self._sorted_keys.values():
+            keys.sort()
+
+    def __len__(self) -> int:
+        return len(self._exact)
+
+    def languages(self) -> List[str]:
+        return sorted(self._tries)
+
+    def lookup(self, text: str, language_code: str) -> Optional[LexiconEntry]:
+        """Exact lookup of a word or phrase"""
+        return self._exact.get((language_code, normalize_lexicon_key(text)))
+
+    def lookup_many(
+        self, words: Iterable[str], language_code: str
+    ) -> Dict[str, Optional[LexiconEntry]]:
+        """Exact lookup of many words in one pass, replacing one query per word"""
+        return {word: self.lookup(word, language_code) for word in words}
+
+    def prefix(
+        self, prefix: str, language_code: str, limit: int = 20
+    ) -> List[LexiconEntry]:
+        """Entries whose normalized text starts with ``prefix``"""
+        keys = self._sorted_keys.get(language_code, [])
+        prefix = normalize_lexicon_key(prefix)
+        start = bisect.bisect_left(keys, prefix)
+
+        matches = []
+        for key in keys[start:]:
+            if not key.startswith(prefix) or len(matches) >= limit:
+                break
+            matches.append(self._exact[(language_code, key)])
+        return matches
+
+    def longest_phrase(
+        self, words: List[str], start: int, language_code: str
+    ) -> Optional[LexiconEntry]:
+        """Longest lexicon phrase beginning at ``words[start]`` (normalized words)"""
+        node = self._tries.get(language_code)
+        best = None
+        index = start
+        while node is not None and index < len(words):
+            node = node.children.get(words[index])
+            if node is not None and node.entry is not None:
+                best = node.entry
+            index += 1
+        return best
+
+    def entries_for_language(self, language_code: str) -> List[LexiconEntry]:
+        return [
+            self._exact[(language_code, key)]
+            for key in self._sorted_keys.get(language_code, [])
+        ]
+
+
+class SignLexicon:
+    """
+    Process-wide holder of the current lexicon snapshot.
+
+    The snapshot is loaded from ``SignGesture``/``SignTranslation`` at startup
+    and refreshed incrementally from ``updated_at``. Each refresh builds a new
+    snapshot and replaces the reference in one assignment, so readers never
+    block and never observe a half-built index. Deleted rows are only dropped
+    by a full reload, which runs every ``full_reload_every`` refreshes.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Any] = AsyncSessionLocal,
+        refresh_interval_seconds: int = 60,
+        full_reload_every: int = 60,
+    ):
+        self.session_factory = session_factory
+        self.refresh_interval_seconds = refresh_interval_seconds
+        self.full_reload_every = full_reload_every
+        self._snapshot = LexiconSnapshot({})
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._refresh_count = 0
+        self._listeners: List[Callable[[LexiconSnapshot], None]] = []
+
+        # Monitoring
+        self._lexicon_stats = {
+            "full_loads": 0,
+            "incremental_refreshes": 0,
+            "rows_applied": 0,
+            "refresh_failures": 0,
+            "last_refresh": None,
+        }
+
+    @property
+    def snapshot(self) -> LexiconSnapshot:
+        """The current immutable snapshot"""
+        return self._snapshot
+
+    def on_swap(self, listener: Callable[[LexiconSnapshot], None]) -> None:
+        """Register a callback run after each snapshot swap (e.g. derived indexes)"""
+        self._listeners.append(listener)
+
+    async def load(self) -> LexiconSnapshot:
+        """Full reload of the lexicon from the database"""
+        rows = await self._fetch_rows(since=None)
+        entries = {entry.translation_id: entry for entry in rows}
+        self._swap(LexiconSnapshot(entries, version=self._max_version(rows)))
+        self._lexicon_stats["full_loads"] += 1
+        self._lexicon_stats["rows_applied"] += len(rows)
+        logger.info(f"Sign lexicon loaded with {len(self._snapshot)} entries")
+        return self._snapshot
+
+    async def refresh(self) -> LexiconSnapshot:
+        """Apply rows changed since the current snapshot version"""
+        current = self._snapshot
+        if current.version is None:
+            return await self.load()
+
+        rows = await self._fetch_rows(since=current.version)
+        self._lexicon_stats["incremental_refreshes"] += 1
+        # ``since`` is inclusive, so rows at the version boundary come back every time
+        rows = [row for row in rows if current.entries.get(row.translation_id) != row]
+        if not rows:
+            return current
+
+        entries = dict(current.entries)
+        entries.update({entry.translation_id: entry for entry in rows})
+        version = max(current.version, self._max_version(rows) or current.version)
+        self._swap(LexiconSnapshot(entries, version=version))
+        self._lexicon_stats["rows_applied"] += len(rows)
+        logger.info(f"Sign lexicon refreshed with {len(rows)} changed entries")
+        return self._snapshot
+
+    async def start(self) -> None:
+        """Load the lexicon and start the periodic refresh task"""
+        try:
+            await self.load()
+        except Exception as e:
+            self._lexicon_stats["refresh_failures"] += 1
+            logger.error(f"Failed to load sign lexicon: {str(e)}")
+
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.create_task(self._periodic_refresh())
+
+    async def stop(self) -> None:
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            await asyncio.gather(self._refresh_task, return_exceptions=True)
+            self._refresh_task = None
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get lexicon statistics for monitoring"""
+        snapshot = self._snapshot
+        return {
+            **self._lexicon_stats,
+            "entries": len(snapshot),
+            "languages": snapshot.languages(),
+            "version": snapshot.version.isoformat() if snapshot.version else None,
+        }
+
+    # Private helper methods
+
+    def _swap(self, snapshot: LexiconSnapshot) -> None:
+        self._snapshot = snapshot
+        self._lexicon_stats["last_refresh"] = datetime.now().isoformat()
+        for listener in self._listeners:
+            try:
+                listener(snapshot)
+            except Exception as e:
+                logger.error(f"Lexicon swap listener failed: {str(e)}")
+
+    async def _periodic_refresh(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval_seconds)
+            try:
+                self._refresh_count += 1
+                if self._refresh_count % self.full_reload_every == 0:
+                    await self.load()
+                else:
+                    await self.refresh()
+            except Exception as e:
+                self._lexicon_stats["refresh_failures"] += 1
+                logger.error(f"Sign lexicon refresh failed: {str(e)}")
+
+    async def _fetch_rows(self, since: Optional[datetime]) -> List[LexiconEntry]:
+        statement = select(SignTranslation, SignGesture).join(
+            SignGesture, SignTranslation.gesture_id == SignGesture.id
+        )
+        if since is not None:
+            statement = statement.where(
+                or_(
+                    SignTranslation.updated_at >= since,
+                    SignGesture.updated_at >= since,
+                )
+            )
+
+        async with self.session_factory() as session:
+            result = await session.exec(statement)
+            rows = result.all()
+
+        entries = []
+        for translation, gesture in rows:
+            key = normalize_lexicon_key(translation.text)
+            if not key:
+                continue
+            entries.append(
+                LexiconEntry(
+                    translation_id=translation.id,
+                    gesture_id=gesture.id,
+                    language_code=translation.language_code,
+                    text=translation.text,
+                    key=key,
+                    gesture_name=gesture.name,
+                    video_path=gesture.video_path,
+                    updated_at=max(translation.updated_at, gesture.updated_at),
+                )
+            )
+        return entries
+
+    @staticmethod
+    def _max_version(rows: List[LexiconEntry]) -> Optional[datetime]:
+        timestamps = [entry.updated_at for entry in rows if entry.updated_at]
+        return max(timestamps) if timestamps else None
+
+
+# Shared lexicon instance used across the app
+sign_lexicon = SignLexicon()
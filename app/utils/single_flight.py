@@ -0,0 +1,111 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into a single execution.
+
+    The first caller for a key starts the work as its own task; callers that
+    arrive while it is running await the same task. Every waiter receives the
+    same result or exception. Waiters are shielded from each other, so
+    cancelling one of them never cancels the shared work. The work can
+    ``report`` progress, which is passed to every waiter's ``on_progress``;
+    a waiter that joins late first receives the latest report.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[Hashable, _Flight] = {}
+
+        # Monitoring
+        self._flight_stats = {
+            "executions": 0,
+            "shared_waits": 0,
+            "failures": 0,
+        }
+
+    async def do(
+        self,
+        key: Hashable,
+        func: Callable[[], Awaitable[T]],
+        on_progress: Optional[Callable[[Any], None]] = None,
+    ) -> T:
+        """
+        Run ``func`` once per key at a time and share its outcome
+
+        Args:
+            key: Identity of the work, equal keys are coalesced
+            func: Zero-argument coroutine factory performing the work
+            on_progress: Called with what the work reports for this key
+                while this caller waits
+
+        Returns:
+            The result of the (possibly shared) execution
+        """
+        flight = self._in_flight.get(key)
+
+        if flight is None:
+            flight = _Flight(asyncio.create_task(func()))
+            self._in_flight[key] = flight
+            flight.task.add_done_callback(lambda done: self._on_done(key, done))
+            self._flight_stats["executions"] += 1
+        else:
+            self._flight_stats["shared_waits"] += 1
+            logger.debug(f"Joining in-flight work for key {key}")
+            if on_progress is not None and flight.progress is not None:
+                on_progress(flight.progress)
+
+        if on_progress is None:
+            return await asyncio.shield(flight.task)
+        flight.listeners.append(on_progress)
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.listeners.remove(on_progress)
+
+    def report(self, key: Hashable, progress: Any) -> None:
+        """Pass progress of the work running for ``key`` to all its waiters"""
+        flight = self._in_flight.get(key)
+        if flight is None:
+            return
+        flight.progress = progress
+        for listener in list(flight.listeners):
+            listener(progress)
+
+    def in_flight(self) -> int:
+        """Number of keys currently being executed"""
+        return len(self._in_flight)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get coalescing statistics for monitoring"""
+        return {
+            **self._flight_stats,
+            "in_flight": len(self._in_flight),
+            "timestamp": datetime.now().isoformat(),
+        }
+
+    # Private helper methods
+
+    def _on_done(self, key: Hashable, task: asyncio.Task) -> None:
+        flight = self._in_flight.get(key)
+        if flight is not None and flight.task is task:
+            del self._in_flight[key]
+
+        # Mark the exception as retrieved even if every waiter was cancelled
+        if not task.cancelled() and task.exception() is not None:
+            self._flight_stats["failures"] += 1
+
+
+class _Flight:
+    """The shared task for one key, with its waiters' progress listeners"""
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.listeners: List[Callable[[Any], None]] = []
+        self.progress: Any = None
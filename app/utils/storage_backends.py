@@ -0,0 +1,974 @@
+import asyncio
+import base64
+import hashlib
+import hmac
+import logging
+import os
+import re
+import uuid
+from abc import ABC, abstractmethod
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+from urllib.parse import quote
+from xml.etree import ElementTree
+
+import aiofiles
+import httpx
+
+from app.utils.exceptions import StorageError, StorageThrottledError
+from app.utils.file_links import link_or_copy
+from app.utils.http_pool import SharedHttpClient, shared_http_client
+from app.utils.resumable_upload import TUS_CHUNK_SIZE, TusUploader, UploadStateStore
+from app.utils.retry_policy import RetryPolicy, upload_retry_policy
+
+logger = logging.getLogger(__name__)
+
+# Listing entries use the Supabase shape throughout the app:
+# {"name": ..., "created_at": iso8601, "metadata": {"size": bytes}}
+# Sub-folders are listed too, as {"name": ..., "id": None, "metadata": None}
+ListEntry = Dict[str, Any]
+
+
+# For content-addressed objects, whose bytes never change under their name
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+def cache_control_header(cache_control: str) -> str:
+    """Accept a max-age in seconds (the Supabase client convention) or a full header"""
+    return f"max-age={cache_control}" if cache_control.isdigit() else cache_control
+
+
+def cache_max_age(cache_control: str) -> str:
+    """The max-age seconds of a cache-control value"""
+    if cache_control.isdigit():
+        return cache_control
+    match = re.search(r"max-age=(\d+)", cache_control)
+    return match.group(1) if match else "3600"
+
+
+class StorageBackend(ABC):
+    """
+    Object store operations ``StorageService`` is built on.
+
+    Backends implement either ``list`` (offset pagination) or ``list_page``
+    (cursor pagination); each has a default written in terms of the other.
+    Every method raises ``StorageError`` on failure.
+    """
+
+    name = "abstract"
+
+    @abstractmethod
+    async def upload_file(
+        self,
+        file_path: Path,
+        destination_path: str,
+        content_type: str,
+        cache_control: str = "3600",
+        upsert: bool = False,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        """Upload a local file without loading it into memory"""
+
+    @abstractmethod
+    async def upload_bytes(
+        self,
+        content: bytes,
+        destination_path: str,
+        content_type: str,
+        cache_control: str = "3600",
+        upsert: bool = False,
+    ) -> None:
+        """Upload a small in-memory object"""
+
+    @abstractmethod
+    async def upload_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        destination_path: str,
+        content_type: str,
+        cache_control: str = "3600",
+    ) -> None:
+        """Upload from an async iterator of chunks, holding one chunk at a time"""
+
+    @abstractmethod
+    async def delete(self, paths: List[str]) -> List[Dict[str, Any]]:
+        """Delete objects, one result per path: ``{"name": ..., "error": ...}``"""
+
+    @abstractmethod
+    def public_url(self, path: str) -> str:
+        """URL clients use to fetch an object"""
+
+    async def list(
+        self, prefix: str, limit: int = 100, offset: int = 0, newest_first: bool = False
+    ) -> List[ListEntry]:
+        """Objects directly under ``prefix``, skipping ``offset`` of them"""
+        entries: List[ListEntry] = []
+        cursor = None
+        skipped = 0
+        while len(entries) < limit:
+            page, cursor = await self.list_page(prefix, limit, cursor, newest_first)
+            for entry in page:
+                if skipped < offset:
+                    skipped += 1
+                elif len(entries) < limit:
+                    entries.append(entry)
+            if cursor is None:
+                break
+        return entries
+
+    async def list_page(
+        self,
+        prefix: str,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        newest_first: bool = False,
+    ) -> Tuple[List[ListEntry], Optional[str]]:
+        """One page of ``list`` and the cursor of the next page (None at the end)"""
+        offset = int(cursor or 0)
+        entries = await self.list(prefix, limit, offset, newest_first)
+        next_cursor = str(offset + len(entries)) if len(entries) == limit else None
+        return entries, next_cursor
+
+    def iter_objects(
+        self, prefix: str, page_size: int = 1000, newest_first: bool = False
+    ) -> "ObjectListing":
+        """Every object under ``prefix``, page by page (see ``ObjectListing``)"""
+        return ObjectListing(self, prefix, page_size, newest_first)
+
+    async def health_check(self) -> bool:
+        await self.list_page("", limit=1)
+        return True
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {"backend": self.name}
+
+
+class SupabaseStorageBackend(StorageBackend):
+    """Supabase Storage REST API over the shared pooled HTTP client"""
+
+    name = "supabase"
+
+    def __init__(
+        self,
+        project_url: str,
+        api_key: str,
+        bucket: str,
+        http: SharedHttpClient = shared_http_client,
+        upload_state_dir: Path = Path("static/upload_state"),
+        chunk_size: int = 256 * 1024,
+        retry_policy: RetryPolicy = upload_retry_policy,
+    ):
+        self.api_key = api_key
+        self.bucket = bucket
+        self.storage_url = f"{project_url.rstrip('/')}/storage/v1"
+        self.http = http
+        self.chunk_size = chunk_size
+        self.retry_policy = retry_policy
+        self.stream_timeout = httpx.Timeout(30.0, write=60.0)
+        # Files above one chunk go through the resumable endpoint, so a failure
+        # only resends the lost chunk
+        self.resumable_upload_threshold = TUS_CHUNK_SIZE
+        self.resumable_uploader = TusUploader(
+            endpoint=f"{self.storage_url}/upload/resumable",
+            headers=self._auth_headers(),
+            state_store=UploadStateStore(upload_state_dir),
+            http=http,
+            retry_policy=retry_policy,
+        )
+
+    async def upload_file(
+        self,
+        file_path: Path,
+        destination_path: str,
+        content_type: str,
+        cache_control: str = "3600",
+        upsert: bool = False,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        if file_path.stat().st_size > self.resumable_upload_threshold:
+            # Offsets are persisted, so a retry of this call resumes the upload
+            await self.resumable_uploader.upload(
+                file_path,
+                destination_path,
+                bucket=self.bucket,
+                content_type=content_type,
+                # The resumable endpoint takes the max-age in seconds only
+                cache_control=cache_max_age(cache_control),
+                upsert=upsert,
+            )
+            return
+
+        headers = self._upload_headers(content_type, cache_control, upsert)
+        headers.update({key: str(value) for key, value in (metadata or {}).items()})
+        headers["content-length"] = str(file_path.stat().st_size)
+        await self._post_object(destination_path, file_path, headers)
+
+    async def upload_bytes(
+        self,
+        content: bytes,
+        destination_path: str,
+        content_type: str,
+        cache_control: str = "3600",
+        upsert: bool = False,
+    ) -> None:
+        await self._post_object(
+            destination_path,
+            content,
+            self._upload_headers(content_type, cache_control, upsert),
+        )
+
+    async def upload_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        destination_path: str,
+        content_type: str,
+        cache_control: str = "3600",
+    ) -> None:
+        # A consumed stream cannot be replayed, so this path is not retried
+        response = await self.http.client.post(
+            self._object_url(destination_path),
+            content=chunks,
+            headers=self._upload_headers(content_type, cache_control, upsert=False),
+            timeout=self.stream_timeout,
+        )
+        self._raise_for_status(response)
+
+    async def delete(self, paths: List[str]) -> List[Dict[str, Any]]:
+        response = await self.http.client.request(
+            "DELETE",
+            f"{self.storage_url}/object/{self.bucket}",
+            json={"prefixes": paths},
+            headers=self._auth_headers(),
+        )
+        self._raise_for_status(response)
+        removed = {entry.get("name") for entry in response.json() or []}
+        # Supabase only returns removed objects, missing ones are not an error
+        return [{"name": path, "removed": path in removed} for path in paths]
+
+    async def list(
+        self, prefix: str, limit: int = 100, offset: int = 0, newest_first: bool = False
+    ) -> List[ListEntry]:
+        sort_by = (
+            {"column": "created_at", "order": "desc"}
+            if newest_first
+            else {"column": "name", "order": "asc"}
+        )
+        response = await self.http.client.post(
+            f"{self.storage_url}/object/list/{self.bucket}",
+            json={"prefix": prefix, "limit": limit, "offset": offset, "sortBy": sort_by},
+            headers=self._auth_headers(),
+        )
+        self._raise_for_status(response)
+        result = response.json()
+        return result if isinstance(result, list) else []
+
+    def public_url(self, path: str) -> str:
+        return f"{self.storage_url}/object/public/{self.bucket}/{path.lstrip('/')}"
+
+    def get_statistics(self) -> Dict[str, Any]:
+        return {
+            "backend": self.name,
+            "resumable": self.resumable_uploader.get_statistics(),
+        }
+
+    # Private helper methods
+
+    def _object_url(self, destination_path: str) -> str:
+        return f"{self.storage_url}/object/{self.bucket}/{destination_path.lstrip('/')}"
+
+    def _auth_headers(self) -> Dict[str, str]:
+        return {"apikey": self.api_key, "authorization": f"Bearer {self.api_key}"}
+
+    def _upload_headers(
+        self, content_type: str, cache_control: str, upsert: bool
+    ) -> Dict[str, str]:
+        return {
+            **self._auth_headers(),
+            "content-type": content_type,
+            "cache-control": cache_control_header(cache_control),
+            "x-upsert": "true" if upsert else "false",
+        }
+
+    async def _post_object(
+        self,
+        destination_path: str,
+        content: Union[bytes, Path],
+        headers: Dict[str, str],
+    ) -> Any:
+        """
+        POST an object under the upload retry policy
+
+        A ``Path`` is reopened for each attempt and sent in chunks.
+        """
+
+        async def attempt() -> Any:
+            body = (
+                _file_chunks(content, self.chunk_size)
+                if isinstance(content, Path)
+                else content
+            )
+            response = await self.http.client.post(
+                self._object_url(destination_path), content=body, headers=headers
+            )
+            self._raise_for_status(response)
+            return response.json()
+
+        return await self.retry_policy.call(attempt, "upload")
+
+    @staticmethod
+    def _raise_for_status(response: httpx.Response) -> None:
+        if response.status_code < 400:
+            return
+        try:
+            message = response.json().get("message") or response.text
+        except ValueError:
+            message = response.text
+        error = (
+            StorageThrottledError
+            if response.status_code == 429 or response.status_code >= 500
+            else StorageError
+        )
+        raise error(f"Storage returned HTTP {response.status_code}: {message}")
+
+
+class LocalStorageBackend(StorageBackend):
+    """
+    Objects as plain files under ``root``, served by the app's static mount.
+
+    Writes go to a temporary file in the destination directory and are renamed
+    into place, so readers never see a partial object. With ``fsync`` the file
+    and its directory are flushed before the upload is reported done.
+    """
+
+    name = "local"
+
+    def __init__(
+        self,
+        root: Path,
+        base_url: str = "/media",
+        fsync: bool = True,
+        chunk_size: int = 256 * 1024,
+    ):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.base_url = base_url.rstrip("/")
+        self.fsync = fsync
+        self.chunk_size = chunk_size
+
+    async def upload_file(
+        self,
+        file_path: Path,
+        destination_path: str,
+        content_type: str,
+        cache_control: str = "3600",
+        upsert: bool = False,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        def _write(partial: Path) -> None:
+            # In-kernel copy (or a reflink), the source may be modified later
+            link_or_copy(file_path, partial, allow_hardlink=False)
+
+        await asyncio.to_thread(self._atomic_write, destination_path, upsert, _write)
+
+    async def upload_bytes(
+        self,
+        content: bytes,
+        destination_path: str,
+        content_type: str,
+        cache_control: str = "3600",
+        upsert: bool = False,
+    ) -> None:
+        await asyncio.to_thread(
+            self._atomic_write,
+            destination_path,
+            upsert,
+            lambda partial: partial.write_bytes(content),
+        )
+
+    async def upload_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        destination_path: str,
+        content_type: str,
+        cache_control: str = "3600",
+    ) -> None:
+        target = self._resolve(destination_path)
+        target.parent.mkdir(parents=True, exist_ok=True)
+        partial = target.with_name(f".{target.name}.{uuid.uuid4().hex[:8]}.partial")
+        try:
+            async with aiofiles.open(partial, "wb") as f:
+                async for chunk in chunks:
+                    await f.write(chunk)
+                if self.fsync:
+                    await f.flush()
+                    await asyncio.to_thread(os.fsync, f.fileno())
+            await asyncio.to_thread(self._commit, partial, target, True)
+        finally:
+            partial.unlink(missing_ok=True)
+
+    async def delete(self, paths: List[str]) -> List[Dict[str, Any]]:
+        def _delete() -> List[Dict[str, Any]]:
+            results = []
+            for path in paths:
+                try:
+                    self._resolve(path).unlink()
+                    results.append({"name": path, "removed": True})
+                except FileNotFoundError:
+                    results.append({"name": path, "removed": False})
+                except OSError as e:
+                    results.append({"name": path, "error": str(e)})
+            return results
+
+        return await asyncio.to_thread(_delete)
+
+    async def list(
+        self, prefix: str, limit: int = 100, offset: int = 0, newest_first: bool = False
+    ) -> List[ListEntry]:
+        def _list() -> List[ListEntry]:
+            directory = self._resolve(prefix) if prefix else self.root
+            try:
+                files = [
+                    entry
+                    for entry in os.scandir(directory)
+                    if not entry.name.startswith(".")
+                ]
+            except FileNotFoundError:
+                return []
+            if newest_first:
+                files.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+            else:
+                files.sort(key=lambda entry: entry.name)
+            return [self._entry(entry) for entry in files[offset : offset + limit]]
+
+        return await asyncio.to_thread(_list)
+
+    def public_url(self, path: str) -> str:
+        return f"{self.base_url}/{quote(path.lstrip('/'))}"
+
+    # Private helper methods
+
+    def _resolve(self, path: str) -> Path:
+        target = (self.root / path.lstrip("/")).resolve()
+        if self.root.resolve() not in target.parents and target != self.root.resolve():
+            raise StorageError(f"Path escapes the storage root: {path}")
+        return target
+
+    def _atomic_write(self, destination_path: str, upsert: bool, write) -> None:
+        target = self._resolve(destination_path)
+        if target.exists() and not upsert:
+            raise StorageError(f"Object already exists: {destination_path}")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        partial = target.with_name(f".{target.name}.{uuid.uuid4().hex[:8]}.partial")
+        try:
+            write(partial)
+            self._commit(partial, target, sync_file=True)
+        finally:
+            partial.unlink(missing_ok=True)
+
+    def _commit(self, partial: Path, target: Path, sync_file: bool) -> None:
+        if self.fsync and sync_file:
+            with open(partial, "rb") as f:
+                os.fsync(f.fileno())
+        os.replace(partial, target)
+        if self.fsync:
+            # Persist the rename itself
+            directory = os.open(target.parent, os.O_RDONLY)
+            try:
+                os.fsync(directory)
+            finally:
+                os.close(directory)
+
+    @staticmethod
+    def _entry(entry: os.DirEntry) -> ListEntry:
+        if entry.is_dir():
+            return {"name": entry.name, "id": None, "metadata": None}
+        stat = entry.stat()
+        return {
+            "name": entry.name,
+            "id": entry.name,
+            "created_at": datetime.fromtimestamp(stat.st_mtime, timezone.utc).isoformat(),
+            "metadata": {"size": stat.st_size},
+        }
+
+
+class S3StorageBackend(StorageBackend):
+    """
+    S3-compatible object store (AWS S3, MinIO) with AWS Signature V4.
+
+    Uses path-style URLs so it works against MinIO on localhost. File bodies
+    are sent unsigned (``UNSIGNED-PAYLOAD``) so they can stream from disk,
+    and stream uploads use multipart upload with bounded part buffers.
+    """
+
+    name = "s3"
+    MIN_PART_SIZE = 8 * 1024 * 1024
+
+    def __init__(
+        self,
+        endpoint_url: str,
+        bucket: str,
+        access_key_id: str,
+        secret_access_key: str,
+        region: str = "us-east-1",
+        public_base_url: Optional[str] = None,
+        http: SharedHttpClient = shared_http_client,
+        chunk_size: int = 256 * 1024,
+        retry_policy: RetryPolicy = upload_retry_policy,
+    ):
+        self.endpoint_url = endpoint_url.rstrip("/")
+        self.bucket = bucket
+        self.access_key_id = access_key_id
+        self.secret_access_key = secret_access_key
+        self.region = region
+        self.public_base_url = (
+            public_base_url or f"{self.endpoint_url}/{bucket}"
+        ).rstrip("/")
+        self.http = http
+        self.chunk_size = chunk_size
+        self.retry_policy = retry_policy
+
+    async def upload_file(
+        self,
+        file_path: Path,
+        destination_path: str,
+        content_type: str,
+        cache_control: str = "3600",
+        upsert: bool = False,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        headers = {
+            "content-type": content_type,
+            "cache-control": cache_control_header(cache_control),
+            "content-length": str(file_path.stat().st_size),
+        }
+        headers.update(
+            {f"x-amz-meta-{key}": str(value) for key, value in (metadata or {}).items()}
+        )
+        if not upsert:
+            headers["if-none-match"] = "*"
+        await self.retry_policy.call(
+            lambda: self._request(
+                "PUT",
+                destination_path,
+                headers=headers,
+                content=_file_chunks(file_path, self.chunk_size),
+            ),
+            "upload",
+        )
+
+    async def upload_bytes(
+        self,
+        content: bytes,
+        destination_path: str,
+        content_type: str,
+        cache_control: str = "3600",
+        upsert: bool = False,
+    ) -> None:
+        headers = {
+            "content-type": content_type,
+            "cache-control": cache_control_header(cache_control),
+        }
+        if not upsert:
+            headers["if-none-match"] = "*"
+        await self.retry_policy.call(
+            lambda: self._request(
+                "PUT", destination_path, headers=headers, content=content, sign_payload=True
+            ),
+            "upload",
+        )
+
+    async def upload_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        destination_path: str,
+        content_type: str,
+        cache_control: str = "3600",
+    ) -> None:
+        response = await self._request(
+            "POST",
+            destination_path,
+            params={"uploads": ""},
+            headers={
+                "content-type": content_type,
+                "cache-control": cache_control_header(cache_control),
+            },
+            sign_payload=True,
+        )
+        upload_id = _xml_find(ElementTree.fromstring(response.content), "UploadId")
+        parts: List[Tuple[int, str]] = []
+        try:
+            buffer = bytearray()
+            async for chunk in chunks:
+                buffer += chunk
+                if len(buffer) >= self.MIN_PART_SIZE:
+                    parts.append(
+                        await self._upload_part(
+                            destination_path, upload_id, len(parts) + 1, bytes(buffer)
+                        )
+                    )
+                    buffer.clear()
+            if buffer or not parts:
+                parts.append(
+                    await self._upload_part(
+                        destination_path, upload_id, len(parts) + 1, bytes(buffer)
+                    )
+                )
+
+            body = "<CompleteMultipartUpload>" + "".join(
+                f"<Part><PartNumber>{number}</PartNumber><ETag>{etag}</ETag></Part>"
+                for number, etag in parts
+            ) + "</CompleteMultipartUpload>"
+            await self._request(
+                "POST",
+                destination_path,
+                params={"uploadId": upload_id},
+                content=body.encode(),
+                sign_payload=True,
+            )
+        except BaseException:
+            # Abandoned parts are billed until the upload is aborted
+            try:
+                await self._request(
+                    "DELETE",
+                    destination_path,
+                    params={"uploadId": upload_id},
+                    sign_payload=True,
+                )
+            except Exception as e:
+                logger.warning(f"Could not abort multipart upload {upload_id}: {str(e)}")
+            raise
+
+    async def delete(self, paths: List[str]) -> List[Dict[str, Any]]:
+        body = (
+            "<Delete><Quiet>true</Quiet>"
+            + "".join(f"<Object><Key>{_xml_escape(path)}</Key></Object>" for path in paths)
+            + "</Delete>"
+        ).encode()
+        response = await self._request(
+            "POST",
+            "",
+            params={"delete": ""},
+            headers={"content-md5": base64.b64encode(hashlib.md5(body).digest()).decode()},
+            content=body,
+            sign_payload=True,
+        )
+        # Quiet mode only reports failures
+        errors = {}
+        for error in ElementTree.fromstring(response.content).iter():
+            if error.tag.endswith("Error"):
+                errors[_xml_find(error, "Key")] = _xml_find(error, "Code")
+        return [
+            {"name": path, "error": errors[path]} if path in errors else {"name": path, "removed": True}
+            for path in paths
+        ]
+
+    async def list_page(
+        self,
+        prefix: str,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        newest_first: bool = False,
+    ) -> Tuple[List[ListEntry], Optional[str]]:
+        # S3 lists keys in name order only, newest_first is not supported
+        key_prefix = f"{prefix.strip('/')}/" if prefix.strip("/") else ""
+        params = {
+            "list-type": "2",
+            "prefix": key_prefix,
+            "delimiter": "/",
+            "max-keys": str(limit),
+        }
+        if cursor:
+            params["continuation-token"] = cursor
+        response = await self._request("GET", "", params=params, sign_payload=True)
+
+        root = ElementTree.fromstring(response.content)
+        entries = []
+        for element in root:
+            if element.tag.endswith("CommonPrefixes"):
+                folder = _xml_find(element, "Prefix")[len(key_prefix) :].rstrip("/")
+                entries.append({"name": folder, "id": None, "metadata": None})
+                continue
+            if not element.tag.endswith("Contents"):
+                continue
+            key = _xml_find(element, "Key")
+            entries.append(
+                {
+                    "name": key[len(key_prefix) :],
+                    "id": key,
+                    "created_at": _xml_find(element, "LastModified"),
+                    "metadata": {"size": int(_xml_find(element, "Size") or 0)},
+                }
+            )
+        truncated = _xml_find(root, "IsTruncated") == "true"
+        return entries, (_xml_find(root, "NextContinuationToken") if truncated else None)
+
+    def public_url(self, path: str) -> str:
+        return f"{self.public_base_url}/{quote(path.lstrip('/'))}"
+
+    # Private helper methods
+
+    async def _upload_part(
+        self, destination_path: str, upload_id: str, number: int, data: bytes
+    ) -> Tuple[int, str]:
+        response = await self.retry_policy.call(
+            lambda: self._request(
+                "PUT",
+                destination_path,
+                params={"partNumber": str(number), "uploadId": upload_id},
+                content=data,
+                sign_payload=True,
+            ),
+            "upload_part",
+        )
+        return number, response.headers["etag"]
+
+    async def _request(
+        self,
+        method: str,
+        key: str,
+        params: Optional[Dict[str, str]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        content: Union[bytes, AsyncIterator[bytes], None] = None,
+        sign_payload: bool = False,
+    ) -> httpx.Response:
+        path = f"/{self.bucket}" + (f"/{quote(key.lstrip('/'))}" if key else "/")
+        params = params or {}
+        payload_hash = (
+            hashlib.sha256(content or b"").hexdigest()
+            if sign_payload
+            else "UNSIGNED-PAYLOAD"
+        )
+        signed_headers = self._sign(method, path, params, headers or {}, payload_hash)
+        response = await self.http.client.request(
+            method,
+            f"{self.endpoint_url}{path}",
+            params=params,
+            headers=signed_headers,
+            content=content,
+        )
+        if response.status_code >= 400:
+            code = response.text
+            try:
+                code = _xml_find(ElementTree.fromstring(response.content), "Code") or code
+            except ElementTree.ParseError:
+                pass
+            error = (
+                StorageThrottledError
+                if response.status_code == 429 or response.status_code >= 500
+                else StorageError
+            )
+            raise error(f"S3 returned HTTP {response.status_code}: {code}")
+        return response
+
+    def _sign(
+        self,
+        method: str,
+        path: str,
+        params: Dict[str, str],
+        headers: Dict[str, str],
+        payload_hash: str,
+    ) -> Dict[str, str]:
+        now = datetime.now(timezone.utc)
+        amz_date = now.strftime("%Y%m%dT%H%M%SZ")
+        date_stamp = now.strftime("%Y%m%d")
+        host = httpx.URL(self.endpoint_url).netloc.decode()
+
+        all_headers = {key.lower(): str(value).strip() for key, value in headers.items()}
+        all_headers.update(
+            {"host": host, "x-amz-date": amz_date, "x-amz-content-sha256": payload_hash}
+        )
+        signed_header_names = ";".join(sorted(all_headers))
+        canonical_headers = "".join(
+            f"{key}:{all_headers[key]}\n" for key in sorted(all_headers)
+        )
+        canonical_query = "&".join(
+            f"{quote(key, safe='-_.~')}={quote(value, safe='-_.~')}"
+            for key, value in sorted(params.items())
+        )
+        canonical_request = "\n".join(
+            (
+                method,
+                quote(path, safe="/-_.~%"),
+                canonical_query,
+                canonical_headers,
+                signed_header_names,
+                payload_hash,
+            )
+        )
+
+        scope = f"{date_stamp}/{self.region}/s3/aws4_request"
+        string_to_sign = "\n".join(
+            (
+                "AWS4-HMAC-SHA256",
+                amz_date,
+                scope,
+                hashlib.sha256(canonical_request.encode()).hexdigest(),
+            )
+        )
+        key = f"AWS4{self.secret_access_key}".encode()
+        for part in (date_stamp, self.region, "s3", "aws4_request"):
+            key = hmac.new(key, part.encode(), hashlib.sha256).digest()
+        signature = hmac.new(key, string_to_sign.encode(), hashlib.sha256).hexdigest()
+
+        all_headers["authorization"] = (
+            f"AWS4-HMAC-SHA256 Credential={self.access_key_id}/{scope}, "
+            f"SignedHeaders={signed_header_names}, Signature={signature}"
+        )
+        return all_headers
+
+
+class ObjectListing:
+    """
+    Async iterator over every object under a prefix.
+
+    Only one page is held at a time, and the next page is requested while the
+    caller works through the current one, so a full walk costs about one
+    round trip per page instead of two. Use as an async context manager so an
+    early exit cancels the pending prefetch::
+
+        async with backend.iter_objects("user_1") as listing:
+            async for entry in listing:
+                ...
+    """
+
+    def __init__(
+        self,
+        backend: StorageBackend,
+        prefix: str,
+        page_size: int = 1000,
+        newest_first: bool = False,
+    ):
+        self.backend = backend
+        self.prefix = prefix
+        self.page_size = page_size
+        self.newest_first = newest_first
+        self.pages_fetched = 0
+        self._page: deque = deque()
+        self._cursor: Optional[str] = None
+        self._exhausted = False
+        self._prefetch: Optional[asyncio.Task] = None
+
+    def __aiter__(self) -> "ObjectListing":
+        return self
+
+    async def __anext__(self) -> ListEntry:
+        while not self._page:
+            if self._exhausted:
+                raise StopAsyncIteration
+            await self._advance()
+        return self._page.popleft()
+
+    async def __aenter__(self) -> "ObjectListing":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        self._cancel_prefetch()
+        self._exhausted = True
+        self._page.clear()
+
+    # Private helper methods
+
+    async def _advance(self) -> None:
+        if self._prefetch is None:
+            self._prefetch = self._fetch(self._cursor)
+        try:
+            page, next_cursor = await self._prefetch
+        finally:
+            self._prefetch = None
+
+        self.pages_fetched += 1
+        self._page.extend(page)
+        self._cursor = next_cursor
+        if next_cursor is None:
+            self._exhausted = True
+        else:
+            self._prefetch = self._fetch(next_cursor)
+
+    def _fetch(self, cursor: Optional[str]) -> asyncio.Task:
+        return asyncio.create_task(
+            self.backend.list_page(
+                self.prefix, self.page_size, cursor, self.newest_first
+            )
+        )
+
+    def _cancel_prefetch(self) -> None:
+        if self._prefetch is not None:
+            if self._prefetch.done() and not self._prefetch.cancelled():
+                self._prefetch.exception()  # Mark a failed prefetch as retrieved
+            self._prefetch.cancel()
+            self._prefetch = None
+
+
+def create_storage_backend(settings) -> StorageBackend:
+    """
+    Build the backend selected by ``settings.STORAGE_BACKEND``
+
+    Raises:
+        StorageError: If the backend name is unknown or its settings are missing
+    """
+    backend = settings.STORAGE_BACKEND.lower()
+    if backend == "supabase":
+        return SupabaseStorageBackend(
+            project_url=settings.SUPABASE_PROJECT_URL,
+            api_key=settings.SUPABASE_API_KEY,
+            bucket=settings.STORAGE_BUCKET,
+        )
+    if backend == "local":
+        return LocalStorageBackend(
+            root=Path(settings.LOCAL_STORAGE_ROOT) / settings.STORAGE_BUCKET,
+            base_url=settings.LOCAL_STORAGE_BASE_URL,
+            fsync=settings.LOCAL_STORAGE_FSYNC,
+        )
+    if backend == "s3":
+        if not (
+            settings.S3_ENDPOINT_URL
+            and settings.S3_ACCESS_KEY_ID
+            and settings.S3_SECRET_ACCESS_KEY
+        ):
+            raise StorageError(
+                "S3 backend needs S3_ENDPOINT_URL, S3_ACCESS_KEY_ID and S3_SECRET_ACCESS_KEY"
+            )
+        return S3StorageBackend(
+            endpoint_url=settings.S3_ENDPOINT_URL,
+            bucket=settings.STORAGE_BUCKET,
+            access_key_id=settings.S3_ACCESS_KEY_ID,
+            secret_access_key=settings.S3_SECRET_ACCESS_KEY,
+            region=settings.S3_REGION,
+            public_base_url=settings.S3_PUBLIC_BASE_URL,
+        )
+    raise StorageError(f"Unknown storage backend: {settings.STORAGE_BACKEND}")
+
+
+# Private helpers
+
+
+async def _file_chunks(file_path: Path, chunk_size: int):
+    """Read a local file in chunks without blocking the event loop"""
+    async with aiofiles.open(file_path, "rb") as f:
+        while True:
+            chunk = await f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+
+def _xml_find(element: ElementTree.Element, name: str) -> Optional[str]:
+    # S3 responses are namespaced, match on the local tag name
+    for child in element:
+        if child.tag == name or child.tag.endswith(f"}}{name}"):
+            return child.text
+    return None
+
+
+def _xml_escape(text: str) -> str:
+    return (
+        text.replace("&", "&amp;")
+        .replace("<", "&lt;")
+        .replace(">", "&gt;")
+        .replace('"', "&quot;")
+    )
@@ -1,26 +1,51 @@
 import asyncio
+import hashlib
 import logging
+import re
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-
-import aiofiles
-from supabase import Client, create_client
-from supabase.lib.client_options import ClientOptions
-from tenacity import (
-    before_sleep_log,
-    retry,
-    retry_if_exception_type,
-    stop_after_attempt,
-    wait_exponential,
-)
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
 
 from app.core.settings import settings
-from app.utils.exceptions import StorageConnectionError, StorageError
+from app.utils.batch_delete import (
+    BatchDeleter,
+    DeletionJob,
+    DeletionJobManager,
+    DeletionReport,
+)
+from app.utils.exceptions import StorageDeadlineExceededError, StorageError
+from app.utils.object_manifest import (
+    ObjectManifest,
+    file_sha256,
+    object_manifest,
+    user_id_from_path,
+)
+from app.utils.storage_backends import (
+    IMMUTABLE_CACHE_CONTROL,
+    StorageBackend,
+    create_storage_backend,
+)
 
 logger = logging.getLogger(__name__)
 
+# Generated videos are stored once per distinct content, under their sha256
+CONTENT_ADDRESSED_PREFIX = "videos"
+CONTENT_ADDRESSED_PATH_PATTERN = re.compile(
+    rf"{CONTENT_ADDRESSED_PREFIX}/[0-9a-f]{{2}}/[0-9a-f]{{64}}\.\w+$"
+)
+
+
+def content_addressed_path(content_hash: str, suffix: str = ".mp4") -> str:
+    """Object path of the content with the given sha256"""
+    return f"{CONTENT_ADDRESSED_PREFIX}/{content_hash[:2]}/{content_hash}{suffix}"
+
+
+def shared_video_path(video_url: str) -> Optional[str]:
+    """Path of the shared (content-addressed) video behind a URL, if it is one"""
+    match = CONTENT_ADDRESSED_PATH_PATTERN.search(video_url)
+    return match.group(0) if match else None
+
 
 @dataclass
 class UploadResult:
@@ -48,17 +73,23 @@ class StorageStats:
 
 class StorageService:
     """
-    Enhanced Supabase Storage service with comprehensive error handling,
-    retry logic, and monitoring capabilities.
-    """
+    Enhanced storage service with comprehensive error handling
+    and monitoring capabilities. Retries happen once, in the backends,
+    under the shared upload ``RetryPolicy``.
 
-    def __init__(self):
-        self.supabase_url = settings.SUPABASE_PROJECT_URL
-        self.supabase_key = settings.SUPABASE_API_KEY
-        self.video_bucket = "signs-generated-by-ai"
+    Validation, statistics and cleanup policy live here; the object store
+    itself is a ``StorageBackend`` (Supabase, local filesystem or
+    S3-compatible) chosen by ``settings.STORAGE_BACKEND``.
+    """
 
-        # Initialize Supabase client with optimized settings
-        self.client = self._create_supabase_client()
+    def __init__(
+        self,
+        backend: Optional[StorageBackend] = None,
+        manifest: Optional[ObjectManifest] = None,
+    ):
+        self.backend = backend or create_storage_backend(settings)
+        # Every upload is recorded, stats and cleanup query it instead of listing
+        self.manifest = manifest or object_manifest
 
         # Configuration
         self.max_file_size = 100 * 1024 * 1024  # 100MB
@@ -68,61 +99,50 @@ class StorageService:
             "video/quicktime",
             "video/x-msvideo",
             "video/webm",
+            "video/mp2t",
         }
-        self.chunk_size = 8192  # For streaming uploads
-
-        # Retry configuration (since ClientOptions doesn't support storage-specific retries)
-        self.storage_retry_attempts = 3
-        self.storage_retry_delay = 1.0
+        self.chunk_size = 256 * 1024  # For streaming uploads
+        self.delete_max_parallel = 8
+        self.deletion_state_dir = Path("static/deletion_jobs")
+
+        # Concurrent deletes with AIMD backoff, and purges that survive restarts
+        self.deleter = BatchDeleter(
+            self.backend,
+            max_parallel=self.delete_max_parallel,
+            on_removed=self.manifest.remove,
+        )
+        self.deletion_jobs = DeletionJobManager(
+            self.deleter,
+            self.deletion_state_dir,
+            before_delete=self._release_shared_for_deletion,
+        )
 
         # Monitoring
         self._upload_stats = {
             "total_uploads": 0,
             "failed_uploads": 0,
+            "deduplicated_uploads": 0,
             "total_bytes_uploaded": 0,
             "average_upload_time_ms": 0,
         }
 
-    def _create_supabase_client(self) -> Client:
-        """Create Supabase client with optimized configuration"""
-        try:
-            # Only use valid ClientOptions parameters
-            client_options = ClientOptions(
-                auto_refresh_token=True,
-                persist_session=True,
-                # Remove unsupported storage retry options
-            )
-
-            return create_client(
-                self.supabase_url, self.supabase_key, options=client_options
-            )
-        except Exception as e:
-            logger.error(f"Failed to create Supabase client: {str(e)}")
-            raise StorageConnectionError(f"Unable to connect to storage: {str(e)}")
-
     async def health_check(self) -> bool:
         """Check if storage service is healthy"""
         try:
             # Try to list files in the bucket (should be fast)
-            result = self.client.storage.from_(self.video_bucket).list(
-                path="", limit=1, offset=0
-            )
-            return not ("error" in result and result["error"])
+            return await self.backend.health_check()
         except Exception as e:
             logger.error(f"Storage health check failed: {str(e)}")
             return False
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((ConnectionError, TimeoutError, StorageError)),
-        before_sleep=before_sleep_log(logger, logging.WARNING),
-    )
     async def upload_video(
         self,
         file_path: Path,
         destination_path: str,
         metadata: Optional[Dict[str, Any]] = None,
+        cache_control: str = "3600",
+        upsert: bool = False,
+        content_hash: Optional[str] = None,
     ) -> str:
         """
         Upload video file to Supabase Storage with comprehensive error handling
@@ -131,51 +151,41 @@ class StorageService:
             file_path: Local path to the video file
             destination_path: Remote path in storage bucket
             metadata: Optional metadata to attach to the file
+            cache_control: Cache max-age in seconds, or a full Cache-Control value
+            upsert: Whether to overwrite an existing object
+            content_hash: sha256 of the file if already known
 
         Returns:
             Public URL of the uploaded file
 
         Raises:
             StorageError: If upload fails after retries
+            StorageDeadlineExceededError: If the request deadline runs out
         """
         start_time = datetime.now()
 
         try:
             # Validate file before upload
             await self._validate_file(file_path)
+            file_size = file_path.stat().st_size
 
-            # Read file content
-            file_content = await self._read_file_async(file_path)
-            file_size = len(file_content)
-
-            # Prepare upload options
-            upload_options = {
-                "content-type": self._get_content_type(file_path),
-                "cache-control": "3600",  # 1 hour cache
-            }
-
-            # Add metadata if provided
-            if metadata:
-                upload_options.update(metadata)
-
-            # Perform upload with custom retry logic
             logger.info(f"Uploading {file_size} bytes to {destination_path}")
 
-            result = await self._upload_with_retry(
-                destination_path, file_content, upload_options
+            # The file is streamed from disk, never loaded whole into memory
+            await self.backend.upload_file(
+                file_path,
+                destination_path,
+                content_type=self._get_content_type(file_path),
+                cache_control=cache_control,  # 1 hour cache by default
+                upsert=upsert,
+                metadata=metadata,
             )
-
-            # Check for upload errors
-            if isinstance(result, dict) and "error" in result:
-                error_msg = result.get("error", {}).get(
-                    "message", "Unknown upload error"
-                )
-                raise StorageError(f"Upload failed: {error_msg}")
+            if content_hash is None:
+                content_hash = await asyncio.to_thread(file_sha256, file_path)
+            await self.manifest.record(destination_path, file_size, content_hash)
 
             # Get public URL
-            public_url = self.client.storage.from_(self.video_bucket).get_public_url(
-                destination_path
-            )
+            public_url = self.backend.public_url(destination_path)
 
             # Update statistics
             upload_time = (datetime.now() - start_time).total_seconds() * 1000
@@ -193,94 +203,155 @@ class StorageService:
             await self._update_upload_stats(0, upload_time, success=False)
 
             logger.error(f"Failed to upload {destination_path}: {str(e)}")
+            if isinstance(e, StorageDeadlineExceededError):
+                raise
             raise StorageError(f"Upload failed: {str(e)}")
 
-    async def _upload_with_retry(
-        self, destination_path: str, file_content: bytes, upload_options: Dict[str, Any]
-    ) -> Any:
+    async def upload_video_deduplicated(self, file_path: Path, user_id: Any) -> str:
         """
-        Perform upload with custom retry logic since ClientOptions doesn't support storage retries
+        Store a generated video once per distinct content
+
+        The object is named after the sha256 of its bytes. If the manifest
+        already has it, the upload is skipped and the user just gains a claim
+        on the shared object. The name never points at other bytes, so the
+        object is served with an immutable, year-long cache lifetime.
+
+        Args:
+            file_path: Local path to the video file
+            user_id: User the video is generated for
+
+        Returns:
+            Public URL of the shared object
         """
-        last_exception = None
-
-        for attempt in range(self.storage_retry_attempts):
-            try:
-                result = await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: self.client.storage.from_(self.video_bucket).upload(
-                        path=destination_path,
-                        file=file_content,
-                        file_options=upload_options,
-                    ),
-                )
-                return result
-
-            except Exception as e:
-                last_exception = e
-                if attempt < self.storage_retry_attempts - 1:
-                    wait_time = self.storage_retry_delay * (
-                        2**attempt
-                    )  # Exponential backoff
-                    logger.warning(
-                        f"Upload attempt {attempt + 1} failed, retrying in {wait_time}s: {str(e)}"
-                    )
-                    await asyncio.sleep(wait_time)
-                else:
-                    logger.error(
-                        f"All {self.storage_retry_attempts} upload attempts failed"
-                    )
-                    break
+        content_hash = await asyncio.to_thread(file_sha256, file_path)
+        destination_path = content_addressed_path(
+            content_hash, file_path.suffix.lower() or ".mp4"
+        )
 
-        # If we get here, all retries failed
-        raise last_exception or StorageError("Upload failed after all retries")
+        if await self.manifest.add_reference(destination_path, user_id):
+            self._upload_stats["deduplicated_uploads"] += 1
+            logger.info(f"Reusing stored video {destination_path}")
+            return self.backend.public_url(destination_path)
+
+        # Identical bytes under an identical name, so racing uploads may overwrite
+        public_url = await self.upload_video(
+            file_path,
+            destination_path,
+            cache_control=IMMUTABLE_CACHE_CONTROL,
+            upsert=True,
+            content_hash=content_hash,
+        )
+        await self.manifest.add_reference(destination_path, user_id)
+        return public_url
+
+    async def upload_bytes(
+        self,
+        content: bytes,
+        destination_path: str,
+        content_type: str,
+        cache_control: str = "3600",
+    ) -> str:
+        """
+        Upload a small in-memory object such as an HLS playlist
+
+        Args:
+            content: Object bytes
+            destination_path: Remote path in storage bucket
+            content_type: MIME type of the object
+            cache_control: Cache max-age in seconds served with the object
+
+        Returns:
+            Public URL of the uploaded object
+        """
+        try:
+            await self.backend.upload_bytes(
+                content,
+                destination_path,
+                content_type=content_type,
+                cache_control=cache_control,
+                # Content-addressed objects may already exist with the same bytes
+                upsert=True,
+            )
+            await self.manifest.record(
+                destination_path, len(content), hashlib.sha256(content).hexdigest()
+            )
+            return self.backend.public_url(destination_path)
+        except StorageDeadlineExceededError:
+            raise
+        except Exception as e:
+            logger.error(f"Failed to upload {destination_path}: {str(e)}")
+            raise StorageError(f"Upload failed: {str(e)}")
 
     async def upload_video_stream(
         self,
         file_stream,
         destination_path: str,
-        file_size: int,
+        file_size: Optional[int] = None,
         content_type: str = "video/mp4",
+        cache_control: str = "3600",
     ) -> str:
         """
         Upload video from stream for large files
 
+        Chunks are read from the stream only as fast as the request body is
+        sent, so memory stays at one chunk whatever the file size. The running
+        size is checked per chunk and an oversized upload is aborted as soon
+        as it crosses ``max_file_size``. A consumed stream cannot be replayed,
+        so this path is not retried.
+
         Args:
-            file_stream: Async file stream
+            file_stream: Async stream with a ``read(size)`` coroutine
             destination_path: Remote path in storage bucket
-            file_size: Size of the file in bytes
+            file_size: Declared size of the file in bytes, checked up front if given
             content_type: MIME type of the file
+            cache_control: Cache max-age in seconds served with the file
 
         Returns:
             Public URL of the uploaded file
         """
+        start_time = datetime.now()
+        bytes_sent = 0
+        digest = hashlib.sha256()
+
+        async def body():
+            nonlocal bytes_sent
+            async for chunk in self._read_stream_chunks(file_stream):
+                bytes_sent += len(chunk)
+                digest.update(chunk)
+                if bytes_sent > self.max_file_size:
+                    raise StorageError(
+                        f"Stream exceeds maximum file size {self.max_file_size}"
+                    )
+                yield chunk
+
         try:
             # Validate file size
-            if file_size > self.max_file_size:
+            if file_size is not None and file_size > self.max_file_size:
                 raise StorageError(
                     f"File size {file_size} exceeds maximum {self.max_file_size}"
                 )
+            if content_type not in self.allowed_mime_types:
+                raise StorageError(f"Unsupported file type: {content_type}")
+
+            await self.backend.upload_stream(
+                body(),
+                destination_path,
+                content_type=content_type,
+                cache_control=cache_control,
+            )
+            await self.manifest.record(destination_path, bytes_sent, digest.hexdigest())
 
-            # Read stream in chunks
-            chunks = []
-            async for chunk in self._read_stream_chunks(file_stream):
-                chunks.append(chunk)
-
-            file_content = b"".join(chunks)
-
-            # Use regular upload method
-            temp_path = Path(f"/tmp/stream_upload_{datetime.now().timestamp()}")
-            async with aiofiles.open(temp_path, "wb") as f:
-                await f.write(file_content)
+            upload_time = (datetime.now() - start_time).total_seconds() * 1000
+            await self._update_upload_stats(bytes_sent, upload_time, success=True)
+            logger.info(
+                f"Streamed {bytes_sent} bytes to {destination_path} in {upload_time:.2f}ms"
+            )
 
-            try:
-                url = await self.upload_video(temp_path, destination_path)
-                return url
-            finally:
-                # Clean up temp file
-                if temp_path.exists():
-                    temp_path.unlink(missing_ok=True)
+            return self.backend.public_url(destination_path)
 
         except Exception as e:
+            upload_time = (datetime.now() - start_time).total_seconds() * 1000
+            await self._update_upload_stats(0, upload_time, success=False)
             logger.error(f"Stream upload failed for {destination_path}: {str(e)}")
             raise StorageError(f"Stream upload failed: {str(e)}")
 
@@ -295,16 +366,10 @@ class StorageService:
             True if deletion was successful
         """
         try:
-            result = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.client.storage.from_(self.video_bucket).remove(
-                    [file_path]
-                ),
-            )
-
-            if isinstance(result, dict) and "error" in result:
-                logger.error(f"Failed to delete {file_path}: {result['error']}")
-                return False
+            result = await self.backend.delete([file_path])
+            if result and result[0].get("error"):
+                raise StorageError(result[0]["error"])
+            await self.manifest.remove([file_path])
 
             logger.info(f"Successfully deleted {file_path}")
             return True
@@ -319,6 +384,8 @@ class StorageService:
         """
         Delete multiple files in batches
 
+        Batches are sent concurrently, backing off when the API throttles.
+
         Args:
             file_paths: List of file paths to delete
             batch_size: Number of files to delete per batch
@@ -326,39 +393,34 @@ class StorageService:
         Returns:
             Dictionary with success and failure counts
         """
-        results = {"success": 0, "failed": 0}
-
-        # Process in batches to avoid API limits
-        for i in range(0, len(file_paths), batch_size):
-            batch = file_paths[i : i + batch_size]
-
-            try:
-                result = await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: self.client.storage.from_(self.video_bucket).remove(batch),
-                )
-
-                if isinstance(result, list):
-                    # Count successful deletions
-                    results["success"] += len([r for r in result if not r.get("error")])
-                    results["failed"] += len([r for r in result if r.get("error")])
-                else:
-                    results["failed"] += len(batch)
-
-            except Exception as e:
-                logger.error(
-                    f"Batch deletion failed for batch {i // batch_size + 1}: {str(e)}"
-                )
-                results["failed"] += len(batch)
-
-            # Small delay between batches to be respectful to the API
-            await asyncio.sleep(0.1)
+        report = await self.delete_files(file_paths, batch_size)
+        results = {
+            "success": report.deleted + report.missing,
+            "failed": len(report.failed),
+        }
 
         logger.info(
             f"Batch deletion completed: {results['success']} success, {results['failed']} failed"
         )
         return results
 
+    async def delete_files(
+        self, file_paths: List[str], batch_size: int = 50
+    ) -> DeletionReport:
+        """
+        Delete many files concurrently and report the outcome of every path
+
+        Args:
+            file_paths: List of file paths to delete
+            batch_size: Number of files to delete per call
+
+        Returns:
+            Report with deleted/missing counts and the error of each failed path
+        """
+        return await self.deleter.run(
+            self.deleter.batches(file_paths, batch_size), total=len(file_paths)
+        )
+
     async def list_user_files(
         self, user_prefix: str, limit: int = 100, offset: int = 0
     ) -> List[Dict[str, Any]]:
@@ -374,24 +436,10 @@ class StorageService:
             List of file metadata dictionaries
         """
         try:
-            result = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: self.client.storage.from_(self.video_bucket).list(
-                    path=user_prefix,
-                    limit=limit,
-                    offset=offset,
-                    sortBy={"column": "created_at", "order": "desc"},
-                ),
+            return await self.backend.list(
+                user_prefix, limit=limit, offset=offset, newest_first=True
             )
 
-            if isinstance(result, dict) and "error" in result:
-                logger.error(
-                    f"Failed to list files for {user_prefix}: {result['error']}"
-                )
-                return []
-
-            return result if isinstance(result, list) else []
-
         except Exception as e:
             logger.error(f"Error listing files for {user_prefix}: {str(e)}")
             return []
@@ -402,6 +450,8 @@ class StorageService:
         """
         Clean up old videos for a user with improved batch processing
 
+        Runs a deletion job to completion (see ``submit_cleanup``).
+
         Args:
             user_prefix: User folder prefix
             days_old: Delete files older than this many days
@@ -410,59 +460,50 @@ class StorageService:
         Returns:
             Cleanup statistics
         """
-        stats = {"total_found": 0, "deleted": 0, "failed": 0, "size_freed_bytes": 0}
-        cutoff_date = datetime.now() - timedelta(days=days_old)
-
-        try:
-            # Get all files for user
-            all_files = await self.list_user_files(user_prefix, limit=1000)
-            stats["total_found"] = len(all_files)
-
-            # Filter old files
-            old_files = []
-            for file_info in all_files:
-                try:
-                    # Parse filename to extract date
-                    filename = file_info.get("name", "")
-                    if self._is_file_old(filename, cutoff_date):
-                        old_files.append(
-                            {
-                                "path": f"{user_prefix}/{filename}",
-                                "size": file_info.get("metadata", {}).get("size", 0),
-                            }
-                        )
-                except Exception as e:
-                    logger.warning(
-                        f"Could not parse date from filename {filename}: {str(e)}"
-                    )
-
-            if not old_files:
-                logger.info(f"No old files found for {user_prefix}")
-                return stats
+        user_id, cutoff_date = self._cleanup_scope(user_prefix, days_old)
+        job = await self.deletion_jobs.run(
+            user_prefix,
+            self._old_files(user_id, cutoff_date),
+            batch_size,
+            params=self._cleanup_params(user_id, cutoff_date),
+        )
+        stats = {
+            "total_found": job.total,
+            "deleted": job.deleted + job.missing,
+            "failed": job.failed,
+            "size_freed_bytes": job.bytes_freed,
+        }
+        logger.info(f"Cleanup completed for {user_prefix}: {stats}")
+        return stats
 
-            # Delete in batches
-            file_paths = [f["path"] for f in old_files]
-            total_size = sum(f["size"] for f in old_files)
+    async def submit_cleanup(
+        self, owner: Any, user_prefix: str, days_old: int, batch_size: int = 100
+    ) -> DeletionJob:
+        """
+        Start a background cleanup of a user's old videos
 
-            deletion_results = await self.delete_files_batch(file_paths, batch_size)
+        The old files are read from the manifest (an index range scan, no
+        listing calls) and spooled to disk, then deleted concurrently. Progress is persisted after every
+        batch, so a purge interrupted by a restart resumes where it stopped.
+        The user's claims on shared videos are only released as their batch
+        is deleted, and a shared video someone used meanwhile is kept.
 
-            stats.update(
-                {
-                    "deleted": deletion_results["success"],
-                    "failed": deletion_results["failed"],
-                    "size_freed_bytes": total_size
-                    if deletion_results["success"] > 0
-                    else 0,
-                }
-            )
-
-            logger.info(f"Cleanup completed for {user_prefix}: {stats}")
-            return stats
+        Args:
+            owner: Who may look the job up
+            user_prefix: User folder prefix
+            days_old: Delete files older than this many days
+            batch_size: Number of files to process per batch
 
-        except Exception as e:
-            logger.error(f"Cleanup failed for {user_prefix}: {str(e)}")
-            stats["failed"] = stats["total_found"]
-            return stats
+        Returns:
+            The deletion job, for progress polling
+        """
+        user_id, cutoff_date = self._cleanup_scope(user_prefix, days_old)
+        return await self.deletion_jobs.submit(
+            owner,
+            self._old_files(user_id, cutoff_date),
+            batch_size,
+            params=self._cleanup_params(user_id, cutoff_date),
+        )
 
     async def get_storage_stats(
         self, user_prefix: Optional[str] = None
@@ -470,6 +511,10 @@ class StorageService:
         """
         Get storage statistics for monitoring
 
+        Answered by aggregate queries over the storage manifest. ``total_*``
+        always cover the whole bucket; ``user_*`` and the file dates cover
+        the user when ``user_prefix`` is given, the bucket otherwise.
+
         Args:
             user_prefix: Optional user prefix to get user-specific stats
 
@@ -477,48 +522,23 @@ class StorageService:
             Storage statistics
         """
         try:
-            if user_prefix:
-                files = await self.list_user_files(user_prefix, limit=1000)
+            user_id = user_id_from_path(user_prefix) if user_prefix else None
+            if user_prefix and user_id is None:
+                raise StorageError(f"Not a user prefix: {user_prefix}")
+            if user_id is None:
+                bucket_usage = usage = await self.manifest.get_usage()
             else:
-                # Get global stats (this might be expensive for large buckets)
-                files = await asyncio.get_event_loop().run_in_executor(
-                    None,
-                    lambda: self.client.storage.from_(self.video_bucket).list(
-                        "", limit=1000
-                    ),
-                )
-
-            if not files:
-                return StorageStats(
-                    total_files=0,
-                    total_size_bytes=0,
-                    user_file_count=0,
-                    user_size_bytes=0,
+                bucket_usage, usage = await asyncio.gather(
+                    self.manifest.get_usage(), self.manifest.get_usage(user_id)
                 )
 
-            total_size = 0
-            dates = []
-
-            for file_info in files:
-                size = file_info.get("metadata", {}).get("size", 0)
-                total_size += size
-
-                # Try to extract date from filename or metadata
-                created_at = file_info.get("created_at")
-                if created_at:
-                    try:
-                        date = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
-                        dates.append(date)
-                    except:
-                        pass
-
             return StorageStats(
-                total_files=len(files),
-                total_size_bytes=total_size,
-                user_file_count=len(files),
-                user_size_bytes=total_size,
-                oldest_file_date=min(dates) if dates else None,
-                newest_file_date=max(dates) if dates else None,
+                total_files=bucket_usage["file_count"],
+                total_size_bytes=bucket_usage["total_size_bytes"],
+                user_file_count=usage["file_count"],
+                user_size_bytes=usage["total_size_bytes"],
+                oldest_file_date=usage["oldest"],
+                newest_file_date=usage["newest"],
             )
 
         except Exception as e:
@@ -531,6 +551,7 @@ class StorageService:
         """Get upload statistics for monitoring"""
         return {
             **self._upload_stats,
+            "backend": self.backend.get_statistics(),
             "success_rate": (
                 (
                     self._upload_stats["total_uploads"]
@@ -562,13 +583,49 @@ class StorageService:
         if content_type not in self.allowed_mime_types:
             raise StorageError(f"Unsupported file type: {content_type}")
 
-    async def _read_file_async(self, file_path: Path) -> bytes:
-        """Read file content asynchronously"""
-        try:
-            async with aiofiles.open(file_path, "rb") as f:
-                return await f.read()
-        except Exception as e:
-            raise StorageError(f"Failed to read file {file_path}: {str(e)}")
+    def _cleanup_scope(self, user_prefix: str, days_old: int) -> Tuple[int, datetime]:
+        user_id = user_id_from_path(user_prefix)
+        if user_id is None:
+            raise StorageError(f"Not a user prefix: {user_prefix}")
+        return user_id, datetime.now() - timedelta(days=days_old)
+
+    def _cleanup_params(self, user_id: int, cutoff_date: datetime) -> Dict[str, Any]:
+        # Persisted with the job, so a resumed cleanup releases the same claims
+        return {"claims_user_id": user_id, "cutoff": cutoff_date.isoformat()}
+
+    async def _old_files(
+        self, user_id: int, cutoff_date: datetime
+    ) -> AsyncIterator[Tuple[str, int]]:
+        """Path and size of every file of a user older than ``cutoff_date``"""
+        # Objects stored under the user's own prefix
+        async for entry in self.manifest.iter_older_than(user_id, cutoff_date):
+            yield entry
+        # Shared videos the user claimed, re-checked when their batch is deleted
+        async for entry in self.manifest.iter_claimed_older_than(user_id, cutoff_date):
+            yield entry
+
+    async def _release_shared_for_deletion(
+        self, job: DeletionJob, paths: List[str]
+    ) -> List[str]:
+        """
+        Paths of a cleanup batch that may still be deleted
+
+        The user's claims on the shared videos of the batch are released now,
+        and only the videos nobody claims or used since the cutoff are deleted.
+        """
+        if "claims_user_id" not in job.params:
+            return paths
+        shared = [path for path in paths if CONTENT_ADDRESSED_PATH_PATTERN.match(path)]
+        if not shared:
+            return paths
+        deletable = set(
+            await self.manifest.release_for_deletion(
+                shared,
+                int(job.params["claims_user_id"]),
+                datetime.fromisoformat(job.params["cutoff"]),
+            )
+        )
+        return [path for path in paths if path in deletable or path not in shared]
 
     async def _read_stream_chunks(self, stream, chunk_size: int = None):
         """Read stream in chunks"""
@@ -589,27 +646,10 @@ class StorageService:
             ".mov": "video/quicktime",
             ".avi": "video/x-msvideo",
             ".webm": "video/webm",
+            ".ts": "video/mp2t",
         }
         return content_type_map.get(extension, "video/mp4")
 
-    def _is_file_old(self, filename: str, cutoff_date: datetime) -> bool:
-        """Check if file is older than cutoff date based on filename"""
-        try:
-            # Extract timestamp from filename (format: YYYYMMDD_HHMMSS_hash.mp4)
-            parts = filename.split("_")
-            if len(parts) >= 2:
-                date_str = parts[0]  # YYYYMMDD
-                time_str = parts[1]  # HHMMSS
-
-                file_date = datetime.strptime(f"{date_str}_{time_str}", "%Y%m%d_%H%M%S")
-                return file_date < cutoff_date
-        except Exception:
-            # If we can't parse the date, consider it old to be safe
-            logger.warning(f"Could not parse date from filename: {filename}")
-            return True
-
-        return False
-
     async def _update_upload_stats(
         self, file_size: int, upload_time_ms: float, success: bool
     ):
@@ -628,7 +668,13 @@ class StorageService:
             self._upload_stats["failed_uploads"] += 1
 
 
+_storage_service: Optional[StorageService] = None
+
+
 # Factory function for dependency injection
 def get_storage_service() -> StorageService:
-    """Factory function to get storage service instance"""
-    return StorageService()
+    """Factory function to get the shared storage service instance"""
+    global _storage_service
+    if _storage_service is None:
+        _storage_service = StorageService()
+    return _storage_service
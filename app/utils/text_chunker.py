@@ -0,0 +1,84 @@
+import re
+from typing import List
+
+# Sentence enders, Latin and Arabic ("؟" question mark, "۔" full stop)
+SENTENCE_ENDINGS = ".!?…؟۔"
+# Clause separators, Latin and Arabic ("،" comma, "؛" semicolon)
+CLAUSE_SEPARATORS = ",;:،؛"
+
+# Punctuation only ends a unit when followed by whitespace or the end of the
+# text, so decimals ("3.5"), times ("10:30") and abbreviations inside a word
+# stay intact. Closing quotes and brackets stay with the unit they close.
+_CLOSERS = "\"'»)]}"
+_SENTENCE_BREAK = re.compile(
+    rf"(?<=[{re.escape(SENTENCE_ENDINGS)}])[{re.escape(_CLOSERS)}]*(?:\s+|$)|\n+"
+)
+_CLAUSE_BREAK = re.compile(
+    rf"(?<=[{re.escape(CLAUSE_SEPARATORS)}])[{re.escape(_CLOSERS)}]*(?:\s+|$)"
+)
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences on Arabic and Latin sentence punctuation"""
+    return _split(text, _SENTENCE_BREAK)
+
+
+def split_text_chunks(text: str, max_chars: int = 200) -> List[str]:
+    """
+    Split text into sentence-sized chunks that can be signed independently
+
+    Sentences longer than ``max_chars`` are split at clause separators, and
+    clauses still too long are split at word boundaries. Chunk boundaries only
+    depend on the sentence itself, so a sentence repeated across texts yields
+    the same chunk and can be served from cache.
+
+    Args:
+        text: Text to split
+        max_chars: Longest chunk preferred, single words are never broken
+
+    Returns:
+        Chunks in reading order, empty if the text is blank
+    """
+    chunks: List[str] = []
+    for sentence in split_sentences(text):
+        if len(sentence) <= max_chars:
+            chunks.append(sentence)
+            continue
+        for clause in _split(sentence, _CLAUSE_BREAK):
+            if len(clause) <= max_chars:
+                chunks.append(clause)
+            else:
+                chunks.extend(_split_words(clause, max_chars))
+    return chunks
+
+
+# Private helpers
+
+
+def _split(text: str, pattern: "re.Pattern[str]") -> List[str]:
+    parts = []
+    start = 0
+    for match in pattern.finditer(text):
+        part = " ".join(text[start : match.start()].split())
+        if part:
+            parts.append(part + match.group(0).strip())
+        start = match.end()
+    tail = " ".join(text[start:].split())
+    if tail:
+        parts.append(tail)
+    return parts
+
+
+def _split_words(text: str, max_chars: int) -> List[str]:
+    pieces: List[str] = []
+    current: List[str] = []
+    length = 0
+    for word in text.split():
+        if current and length + 1 + len(word) > max_chars:
+            pieces.append(" ".join(current))
+            current, length = [], 0
+        length += len(word) + (1 if current else 0)
+        current.append(word)
+    if current:
+        pieces.append(" ".join(current))
+    return pieces
@@ -0,0 +1,86 @@
+import unicodedata
+from functools import lru_cache
+from typing import Any, Dict
+
+# Harakat, tanween, shadda, sukun and the extended marks (U+064B-U+065F),
+# superscript alef (U+0670) and Quranic annotation marks (U+06D6-U+06ED)
+ARABIC_DIACRITICS = (
+    "".join(chr(code) for code in range(0x064B, 0x0660))
+    + "ٰ"
+    + "".join(chr(code) for code in range(0x06D6, 0x06EE))
+)
+TATWEEL = "ـ"
+
+# Letter variants folded to one base letter. Hamza carriers and alef forms are
+# written inconsistently in everyday text ("أهلا" / "اهلا"), as are final
+# ta marbuta / ha and alef maqsura / ya.
+ARABIC_LETTER_FOLDS = {
+    "أ": "ا",
+    "إ": "ا",
+    "آ": "ا",
+    "ٱ": "ا",
+    "ؤ": "و",
+    "ئ": "ي",
+    "ى": "ي",
+    "ة": "ه",
+}
+
+# Arabic punctuation and typographic variants mapped to their ASCII forms
+PUNCTUATION_FOLDS = {
+    "،": ",",
+    "؛": ";",
+    "؟": "?",
+    "٪": "%",
+    "‘": "'",
+    "’": "'",
+    "‚": "'",
+    "–": "-",
+    "—": "-",
+    "…": "...",
+}
+# Quotes and brackets change nothing about the signs produced
+DROPPED_PUNCTUATION = "\"“”„«»()[]{}"
+
+# Precompiled so normalization is a couple of C-level passes over the string
+_TRANSLATION_TABLE = str.maketrans(
+    {
+        **ARABIC_LETTER_FOLDS,
+        **PUNCTUATION_FOLDS,
+        **{char: None for char in ARABIC_DIACRITICS + TATWEEL + DROPPED_PUNCTUATION},
+    }
+)
+
+NORMALIZATION_CACHE_SIZE = 65536
+
+
+@lru_cache(maxsize=NORMALIZATION_CACHE_SIZE)
+def normalize_text(text: str) -> str:
+    """
+    Canonical form of Arabic or English text for cache keys and lexicon lookups
+
+    Applies NFKC (which also maps Arabic presentation forms to base letters),
+    strips tashkeel and tatweel, folds alef/hamza, ta marbuta and ya variants,
+    unifies punctuation, case-folds and collapses whitespace. Results are
+    memoized, so hot strings cost one dict lookup.
+
+    Args:
+        text: Raw user or lexicon text
+
+    Returns:
+        Normalized text, words separated by single spaces
+    """
+    text = unicodedata.normalize("NFKC", text)
+    return " ".join(text.translate(_TRANSLATION_TABLE).casefold().split())
+
+
+def get_normalization_statistics() -> Dict[str, Any]:
+    """Memoization counters of ``normalize_text`` for monitoring"""
+    info = normalize_text.cache_info()
+    lookups = info.hits + info.misses
+    return {
+        "hits": info.hits,
+        "misses": info.misses,
+        "size": info.currsize,
+        "max_size": info.maxsize,
+        "hit_rate": info.hits / max(lookups, 1),
+    }
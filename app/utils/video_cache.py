@@ -0,0 +1,241 @@
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from app.ai.schemas import TokenTiming
+from app.utils.file_links import link_or_copy
+from app.utils.text_normalizer import normalize_text
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedGeneration:
+    """A finished text-to-sign generation that can be served again"""
+
+    video_url: str
+    tokens: List[TokenTiming] = field(default_factory=list)
+    ai_request_id: Optional[str] = None
+    ai_latency_ms: Optional[int] = None
+    # User whose request uploaded the video, they already hold a claim on it
+    uploaded_by: Optional[str] = None
+    created_at: float = field(default_factory=time.monotonic)
+    hits: int = 0
+
+
+@dataclass
+class ChunkVideo:
+    """A locally stored video for one text chunk, reusable when stitching"""
+
+    video_path: Path
+    tokens: List[TokenTiming] = field(default_factory=list)
+    duration_ms: int = 0
+    ai_request_id: Optional[str] = None
+    ai_latency_ms: Optional[int] = None
+
+
+class GenerationResultCache:
+    """
+    In-memory, content-addressed cache of text-to-sign results.
+
+    Entries are keyed by a hash of (normalized text, language, AI model version)
+    and evicted by TTL and by LRU order once ``max_entries`` is reached. Only the
+    uploaded ``video_url`` and the token timings are kept, never the video bytes.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: int = 6 * 3600):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, CachedGeneration]" = OrderedDict()
+
+        # Monitoring
+        self._cache_stats = {
+            "hits": 0,
+            "misses": 0,
+            "evictions": 0,
+            "expirations": 0,
+        }
+
+    @staticmethod
+    def normalize_text(text: str) -> str:
+        """Normalize text so trivially different inputs share a cache entry"""
+        return normalize_text(text)
+
+    @classmethod
+    def build_key(cls, text: str, language_code: str, model_version: str) -> str:
+        """Generate the cache key for a text/language/model combination"""
+        content = f"{model_version}\x1f{language_code}\x1f{cls.normalize_text(text)}"
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[CachedGeneration]:
+        """Return a fresh cached result or None, updating hit/miss counters"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self._cache_stats["misses"] += 1
+            return None
+
+        if self._is_expired(entry):
+            del self._entries[key]
+            self._cache_stats["expirations"] += 1
+            self._cache_stats["misses"] += 1
+            return None
+
+        self._entries.move_to_end(key)
+        entry.hits += 1
+        self._cache_stats["hits"] += 1
+        return entry
+
+    def set(self, key: str, entry: CachedGeneration) -> None:
+        """Store a result, evicting expired and least recently used entries"""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        self._evict()
+
+    def invalidate(self, key: str) -> None:
+        """Drop a single entry, e.g. after its video was deleted from storage"""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry (statistics are kept)"""
+        self._entries.clear()
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get cache statistics for monitoring"""
+        lookups = self._cache_stats["hits"] + self._cache_stats["misses"]
+        return {
+            **self._cache_stats,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hit_rate": self._cache_stats["hits"] / max(lookups, 1),
+            "timestamp": datetime.now().isoformat(),
+        }
+
+    # Private helper methods
+
+    def _is_expired(self, entry: CachedGeneration) -> bool:
+        return time.monotonic() - entry.created_at > self.ttl_seconds
+
+    def _evict(self) -> None:
+        if len(self._entries) <= self.max_entries:
+            return
+
+        # Prefer dropping stale entries before evicting live ones
+        expired = [key for key, entry in self._entries.items() if self._is_expired(entry)]
+        for key in expired:
+            del self._entries[key]
+            self._cache_stats["expirations"] += 1
+
+        while len(self._entries) > self.max_entries:
+            evicted_key, _ = self._entries.popitem(last=False)
+            self._cache_stats["evictions"] += 1
+            logger.debug(f"Evicted cached generation {evicted_key}")
+
+
+class ChunkVideoCache:
+    """
+    Local LRU cache of per-chunk AI videos used to stitch long texts.
+
+    Unlike ``GenerationResultCache`` this keeps the video files themselves,
+    since stitching needs the bytes. Callers always receive a hard link (or a
+    copy) of the cached file at a path they own, so evicting an entry never
+    pulls a file out from under a concatenation in progress. Links and copies
+    run in a worker thread. The index lives in memory only, so files left in
+    ``directory`` by a previous process are removed on startup.
+    """
+
+    def __init__(self, directory: Path, max_entries: int = 512):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, ChunkVideo]" = OrderedDict()
+        self._remove_orphans()
+
+        # Monitoring
+        self._cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    async def checkout(self, key: str, destination: Path) -> Optional[ChunkVideo]:
+        """Link a cached chunk video to ``destination`` and return it, or None"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            try:
+                await self._link(entry.video_path, destination)
+            except FileNotFoundError:
+                # Evicted while linking
+                entry = None
+        if entry is None:
+            self._entries.pop(key, None)
+            self._cache_stats["misses"] += 1
+            return None
+
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        self._cache_stats["hits"] += 1
+        return ChunkVideo(
+            video_path=destination,
+            tokens=entry.tokens,
+            duration_ms=entry.duration_ms,
+            ai_request_id=entry.ai_request_id,
+            ai_latency_ms=entry.ai_latency_ms,
+        )
+
+    async def put(self, key: str, chunk: ChunkVideo) -> None:
+        """Keep a linked copy of ``chunk.video_path`` under ``key``"""
+        cached_path = self.directory / f"{key}{chunk.video_path.suffix or '.mp4'}"
+        await self._link(chunk.video_path, cached_path)
+        self._entries[key] = ChunkVideo(
+            video_path=cached_path,
+            tokens=chunk.tokens,
+            duration_ms=chunk.duration_ms,
+            ai_request_id=chunk.ai_request_id,
+            ai_latency_ms=chunk.ai_latency_ms,
+        )
+        self._entries.move_to_end(key)
+
+        evicted_paths = []
+        while len(self._entries) > self.max_entries:
+            _, evicted = self._entries.popitem(last=False)
+            evicted_paths.append(evicted.video_path)
+            self._cache_stats["evictions"] += 1
+        if evicted_paths:
+            await asyncio.to_thread(_unlink_all, evicted_paths)
+
+    def get_statistics(self) -> Dict[str, Any]:
+        """Get chunk cache statistics for monitoring"""
+        lookups = self._cache_stats["hits"] + self._cache_stats["misses"]
+        return {
+            **self._cache_stats,
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hit_rate": self._cache_stats["hits"] / max(lookups, 1),
+            "timestamp": datetime.now().isoformat(),
+        }
+
+    # Private helper methods
+
+    @staticmethod
+    async def _link(source: Path, destination: Path) -> None:
+        # Cached chunk videos are read-only, sharing an inode is safe
+        await asyncio.to_thread(link_or_copy, source, destination)
+
+    def _remove_orphans(self) -> None:
+        orphans = [path for path in self.directory.iterdir() if path.is_file()]
+        _unlink_all(orphans)
+        if orphans:
+            logger.info(
+                f"Removed {len(orphans)} unindexed chunk videos from {self.directory}"
+            )
+
+
+# Private helpers
+
+
+def _unlink_all(paths: List[Path]) -> None:
+    for path in paths:
+        path.unlink(missing_ok=True)
@@ -0,0 +1,379 @@
+import asyncio
+import json
+import logging
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.utils.exceptions import VideoGenerationError
+
+logger = logging.getLogger(__name__)
+
+
+class VideoQuality(str, Enum):
+    """Video quality options"""
+
+    LOW = "480p"
+    MEDIUM = "720p"
+    HIGH = "1080p"
+
+
+@dataclass(frozen=True)
+class CanonicalProfile:
+    """
+    Encoding profile every lexicon clip of one quality is normalized to.
+
+    Identical codec, geometry, frame rate, pixel format, timescale and a fixed
+    closed GOP are what allow stream-copy concatenation and HLS segments.
+    """
+
+    quality: VideoQuality
+    width: int
+    height: int
+    fps: int = 30
+    gop_frames: int = 30
+    crf: int = 23
+    pix_fmt: str = "yuv420p"
+    h264_profile: str = "high"
+    h264_level: str = "4.1"
+    timescale: int = 90000
+
+    def ffmpeg_args(self) -> List[str]:
+        """Output options for ffmpeg producing this profile"""
+        return [
+            "-vf",
+            f"scale={self.width}:{self.height}:force_original_aspect_ratio=decrease,"
+            f"pad={self.width}:{self.height}:(ow-iw)/2:(oh-ih)/2,setsar=1,"
+            f"fps={self.fps},format={self.pix_fmt}",
+            "-c:v",
+            "libx264",
+            "-profile:v",
+            self.h264_profile,
+            "-level:v",
+            self.h264_level,
+            "-preset",
+            "slow",
+            "-crf",
+            str(self.crf),
+            "-g",
+            str(self.gop_frames),
+            "-keyint_min",
+            str(self.gop_frames),
+            "-sc_threshold",
+            "0",
+            "-flags",
+            "+cgop",
+            "-an",
+            "-video_track_timescale",
+            str(self.timescale),
+            "-movflags",
+            "+faststart",
+        ]
+
+
+CANONICAL_PROFILES: Dict[VideoQuality, CanonicalProfile] = {
+    VideoQuality.LOW: CanonicalProfile(VideoQuality.LOW, 854, 480),
+    VideoQuality.MEDIUM: CanonicalProfile(VideoQuality.MEDIUM, 1280, 720),
+    VideoQuality.HIGH: CanonicalProfile(VideoQuality.HIGH, 1920, 1080),
+}
+
+
+@dataclass(frozen=True)
+class VideoStreamInfo:
+    """Codec parameters of the first video stream of a file"""
+
+    codec_name: str
+    profile: Optional[str]
+    width: int
+    height: int
+    pix_fmt: Optional[str]
+    frame_rate: str
+    time_base: Optional[str]
+    duration_s: Optional[float] = None
+
+    def concat_key(self) -> Tuple[Any, ...]:
+        """Parameters that must match for a container-level (stream copy) concat"""
+        return (
+            self.codec_name,
+            self.profile,
+            self.width,
+            self.height,
+            self.pix_fmt,
+            self.frame_rate,
+            self.time_base,
+        )
+
+
+@dataclass
+class AssemblyResult:
+    """Result of concatenating sign segments into one video"""
+
+    output_path: Path
+    method: str  # "single", "stream_copy" or "reencode"
+    segment_count: int
+    assembly_time_ms: int
+
+
+async def run_command(*args: str, timeout: Optional[float] = None) -> bytes:
+    """Run an external command without blocking the event loop, return stdout"""
+    process = await asyncio.create_subprocess_exec(
+        *args,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise VideoGenerationError(f"{args[0]} timed out after {timeout}s")
+
+    if process.returncode != 0:
+        message = stderr.decode(errors="replace").strip().splitlines()[-1:] or [""]
+        raise VideoGenerationError(f"{args[0]} failed: {message[0]}")
+    return stdout
+
+
+class VideoProbe:
+    """ffprobe wrapper with a small cache keyed by (path, size, mtime)"""
+
+    def __init__(self, ffprobe_binary: str = "ffprobe", cache_size: int = 4096):
+        self.ffprobe_binary = ffprobe_binary
+        self.cache_size = cache_size
+        self._cache: Dict[Tuple[str, int, int], VideoStreamInfo] = {}
+
+    async def probe(self, path: Path) -> VideoStreamInfo:
+        stat = path.stat()
+        cache_key = (str(path), stat.st_size, stat.st_mtime_ns)
+        cached = self._cache.get(cache_key)
+        if cached:
+            return cached
+
+        output = await run_command(
+            self.ffprobe_binary,
+            "-v",
+            "error",
+            "-select_streams",
+            "v:0",
+            "-show_entries",
+            "stream=codec_name,profile,width,height,pix_fmt,r_frame_rate,time_base"
+            ":format=duration",
+            "-of",
+            "json",
+            str(path),
+        )
+        data = json.loads(output or b"{}")
+        streams = data.get("streams") or []
+        if not streams:
+            raise VideoGenerationError(f"No video stream in {path}")
+
+        stream = streams[0]
+        duration = data.get("format", {}).get("duration")
+        info = VideoStreamInfo(
+            codec_name=stream.get("codec_name", ""),
+            profile=stream.get("profile"),
+            width=int(stream.get("width", 0)),
+            height=int(stream.get("height", 0)),
+            pix_fmt=stream.get("pix_fmt"),
+            frame_rate=stream.get("r_frame_rate", "0/0"),
+            time_base=stream.get("time_base"),
+            duration_s=float(duration) if duration else None,
+        )
+
+        if len(self._cache) >= self.cache_size:
+            self._cache.pop(next(iter(self._cache)))
+        self._cache[cache_key] = info
+        return info
+
+
+class VideoAssembler:
+    """
+    Concatenate per-sign segment files into one video.
+
+    When every segment shares codec parameters (the case for clips produced by
+    the lexicon normalization pipeline) the files are joined at the container
+    level with ffmpeg's concat demuxer and ``-c copy``: no decode, no encode.
+    Only mismatched inputs fall back to a single re-encode pass that scales
+    every segment to the first one's geometry and frame rate. ``available``
+    tells, once at startup, whether ffmpeg and ffprobe are installed.
+    """
+
+    def __init__(
+        self,
+        ffmpeg_binary: str = "ffmpeg",
+        probe: Optional[VideoProbe] = None,
+        timeout_seconds: float = 120,
+        reencode_preset: str = "veryfast",
+    ):
+        self.ffmpeg_binary = ffmpeg_binary
+        self.probe = probe or VideoProbe()
+        self.available = all(
+            shutil.which(binary)
+            for binary in (ffmpeg_binary, self.probe.ffprobe_binary)
+        )
+        if not self.available:
+            logger.warning("ffmpeg or ffprobe not found, video assembly is disabled")
+        self.timeout_seconds = timeout_seconds
+        self.reencode_preset = reencode_preset
+
+        # Monitoring
+        self._assembly_stats = {
+            "single": 0,
+            "stream_copy": 0,
+            "reencode": 0,
+            "failed": 0,
+            "average_assembly_time_ms": 0,
+        }
+
+    async def concatenate(
+        self, segments: Sequence[Path], output_path: Path, force_reencode: bool = False
+    ) -> AssemblyResult:
+        """
+        Concatenate segment files into ``output_path``
+
+        Args:
+            segments: Segment files in playback order
+            output_path: Destination MP4 file
+            force_reencode: Skip the stream-copy path (benchmarks, debugging)
+
+        Returns:
+            Assembly result with the method used
+
+        Raises:
+            VideoGenerationError: If there is nothing to assemble or ffmpeg fails
+        """
+        start = time.perf_counter()
+        segments = [Path(segment) for segment in segments]
+        if not segments:
+            raise VideoGenerationError("No video segments to assemble")
+
+        try:
+            if len(segments) == 1 and not force_reencode:
+                await asyncio.to_thread(shutil.copyfile, segments[0], output_path)
+                method = "single"
+            else:
+                infos = await asyncio.gather(
+                    *(self.probe.probe(segment) for segment in segments)
+                )
+                if not force_reencode and self._stream_compatible(infos):
+                    await self._stream_copy(segments, output_path)
+                    method = "stream_copy"
+                else:
+                    await self._reencode(segments, infos[0], output_path)
+                    method = "reencode"
+        except Exception as e:
+            self._assembly_stats["failed"] += 1
+            logger.error(f"Failed to assemble {len(segments)} segments: {str(e)}")
+            if isinstance(e, VideoGenerationError):
+                raise
+            raise VideoGenerationError(f"Video assembly failed: {str(e)}")
+
+        elapsed_ms = int((time.perf_counter() - start) * 1000)
+        self._update_assembly_stats(method, elapsed_ms)
+        return AssemblyResult(
+            output_path=output_path,
+            method=method,
+            segment_count=len(segments),
+            assembly_time_ms=elapsed_ms,
+        )
+
+    def get_assembly_statistics(self) -> Dict[str, Any]:
+        """Get assembly statistics for monitoring"""
+        return {**self._assembly_stats, "timestamp": datetime.now().isoformat()}
+
+    # Private helper methods
+
+    @staticmethod
+    def _stream_compatible(infos: List[VideoStreamInfo]) -> bool:
+        first = infos[0].concat_key()
+        return all(info.concat_key() == first for info in infos[1:])
+
+    async def _stream_copy(self, segments: List[Path], output_path: Path) -> None:
+        with tempfile.NamedTemporaryFile(
+            "w", suffix=".txt", delete=False, encoding="utf-8"
+        ) as playlist:
+            for segment in segments:
+                escaped = str(segment.resolve()).replace("'", "'\\''")
+                playlist.write(f"file '{escaped}'\n")
+        try:
+            await run_command(
+                self.ffmpeg_binary,
+                "-hide_banner",
+                "-loglevel",
+                "error",
+                "-y",
+                "-f",
+                "concat",
+                "-safe",
+                "0",
+                "-i",
+                playlist.name,
+                "-map",
+                "0:v:0",
+                "-c",
+                "copy",
+                "-movflags",
+                "+faststart",
+                str(output_path),
+                timeout=self.timeout_seconds,
+            )
+        finally:
+            Path(playlist.name).unlink(missing_ok=True)
+
+    async def _reencode(
+        self, segments: List[Path], target: VideoStreamInfo, output_path: Path
+    ) -> None:
+        width, height = target.width, target.height
+        frame_rate = target.frame_rate if target.frame_rate != "0/0" else "30"
+
+        inputs: List[str] = []
+        filters: List[str] = []
+        for index, segment in enumerate(segments):
+            inputs += ["-i", str(segment)]
+            filters.append(
+                f"[{index}:v:0]scale={width}:{height}:force_original_aspect_ratio=decrease,"
+                f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1,"
+                f"fps={frame_rate},format=yuv420p[v{index}]"
+            )
+        joined = "".join(f"[v{index}]" for index in range(len(segments)))
+        filters.append(f"{joined}concat=n={len(segments)}:v=1:a=0[out]")
+
+        await run_command(
+            self.ffmpeg_binary,
+            "-hide_banner",
+            "-loglevel",
+            "error",
+            "-y",
+            *inputs,
+            "-filter_complex",
+            ";".join(filters),
+            "-map",
+            "[out]",
+            "-c:v",
+            "libx264",
+            "-preset",
+            self.reencode_preset,
+            "-movflags",
+            "+faststart",
+            str(output_path),
+            timeout=self.timeout_seconds,
+        )
+
+    def _update_assembly_stats(self, method: str, elapsed_ms: int) -> None:
+        self._assembly_stats[method] += 1
+        completed = sum(
+            self._assembly_stats[key] for key in ("single", "stream_copy", "reencode")
+        )
+        current_avg = self._assembly_stats["average_assembly_time_ms"]
+        self._assembly_stats["average_assembly_time_ms"] = (
+            current_avg * (completed - 1) + elapsed_ms
+        ) / completed
+
+
+# Shared assembler instance
+video_assembler = VideoAssembler()
@@ -0,0 +1,165 @@
+"""
+Benchmark offset against keyset pagination of translation history.
+
+Fills ``translationhistory`` with synthetic rows, half of them owned by
+one heavy user and the rest spread over many light users. It then times
+fetching one page of the heavy user's history at increasing depths,
+paging by ``offset`` and by cursor, with and without the composite index.
+Point ``--dsn`` at a scratch Postgres database for representative numbers
+(the default is a temporary SQLite file). The tables are created if
+missing, and rows are only added when fewer than ``--rows`` exist, so
+later runs reuse the data.
+
+Usage (needs the app settings, e.g. a .env file):
+    python -m benchmarks.history_pagination --rows 2000000
+    python -m benchmarks.history_pagination --dsn postgresql+psycopg2://u:p@localhost/bench
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import create_engine, func, insert, text
+from sqlmodel import Session, SQLModel, select
+
+from app.db.models import HistoryInputType, TranslationHistory, User
+from app.utils.history_pagination import encode_cursor, history_page_statement
+
+HEAVY_USER_ID = 1
+INPUT_TYPE = HistoryInputType.TEXT_TO_SIGN
+FILL_BATCH_SIZE = 50_000
+
+
+def fill(engine, rows: int, light_users: int, seed: int = 7) -> None:
+    SQLModel.metadata.create_all(
+        engine, tables=[User.__table__, TranslationHistory.__table__]
+    )
+    with Session(engine) as session:
+        existing = session.exec(select(func.count(TranslationHistory.id))).one()
+        if existing >= rows:
+            print(f"Reusing {existing:,} existing rows")
+            return
+        if session.get(User, HEAVY_USER_ID) is None:
+            session.exec(
+                insert(User),
+                params=[
+                    {
+                        "id": user_id,
+                        "username": f"bench_{user_id}",
+                        "email": f"bench_{user_id}@example.com",
+                        "hashed_password": "-",
+                    }
+                    for user_id in range(1, light_users + 2)
+                ],
+            )
+            session.commit()
+
+    rng = random.Random(seed)
+    start_time = datetime(2024, 1, 1)
+    missing = rows - existing
+    print(f"Inserting {missing:,} rows")
+    with engine.begin() as connection:
+        for batch_start in range(existing, rows, FILL_BATCH_SIZE):
+            batch = []
+            for index in range(batch_start, min(rows, batch_start + FILL_BATCH_SIZE)):
+                text_to_sign = rng.random() < 0.8
+                batch.append(
+                    {
+                        "user_id": HEAVY_USER_ID
+                        if index % 2 == 0
+                        else rng.randint(2, light_users + 1),
+                        "input_type": (
+                            INPUT_TYPE if text_to_sign else HistoryInputType.SIGN_TO_TEXT
+                        ).value,
+                        "language_code": "ar" if text_to_sign else None,
+                        "input_content": f"text {index}",
+                        "output_content": f"videos/{index:064x}.mp4",
+                        # A new row every ~10 seconds, with occasional ties
+                        "timestamp": start_time + timedelta(seconds=index * 10 // 3),
+                    }
+                )
+            connection.execute(insert(TranslationHistory), batch)
+        connection.execute(text("ANALYZE translationhistory"))
+
+
+def time_page(session: Session, statement, repeat: int) -> float:
+    """Median milliseconds to fetch the page"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        session.exec(statement).all()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def run(engine, pages: List[int], limit: int, repeat: int, label: str) -> None:
+    print(f"\n{label}")
+    print(f"{'page':>8} | {'offset ms':>10} | {'keyset ms':>10} | speedup")
+    with Session(engine) as session:
+        for page in pages:
+            skipped = (page - 1) * limit
+            cursor = None
+            if skipped:
+                # Position of the last row of the previous page (not timed)
+                previous = session.exec(
+                    history_page_statement(
+                        HEAVY_USER_ID, INPUT_TYPE, 1, offset=skipped - 1
+                    )
+                ).first()
+                if previous is None:
+                    print(f"{page:>8} | beyond the end of the history")
+                    break
+                cursor = encode_cursor(previous.timestamp, previous.id)
+
+            offset_ms = time_page(
+                session,
+                history_page_statement(HEAVY_USER_ID, INPUT_TYPE, limit, offset=skipped),
+                repeat,
+            )
+            keyset_ms = time_page(
+                session,
+                history_page_statement(HEAVY_USER_ID, INPUT_TYPE, limit, cursor=cursor),
+                repeat,
+            )
+            print(
+                f"{page:>8} | {offset_ms:>10.2f} | {keyset_ms:>10.2f} | "
+                f"{offset_ms / keyset_ms:.1f}x"
+            )
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--dsn", default=None, help="SQLAlchemy URL of a scratch database")
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--light-users", type=int, default=1000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--pages", default="1,10,100,1000,10000")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    dsn = args.dsn or f"sqlite:///{tempfile.mkdtemp()}/history_bench.db"
+    engine = create_engine(dsn)
+    fill(engine, args.rows, args.light_users)
+    pages = [int(page) for page in args.pages.split(",")]
+
+    index = next(
+        index
+        for index in TranslationHistory.__table__.indexes
+        if index.name == "ix_translationhistory_user_input_timestamp_id"
+    )
+    index.create(engine, checkfirst=True)
+    run(engine, pages, args.limit, args.repeat, f"With {index.name}")
+
+    index.drop(engine)
+    try:
+        run(engine, pages, args.limit, args.repeat, "Without the index")
+    finally:
+        index.create(engine)
+
+
+if __name__ == "__main__":
+    main()
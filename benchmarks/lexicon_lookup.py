@@ -0,0 +1,102 @@
+"""
+Benchmark the in-memory sign lexicon against the per-word query path.
+
+The query path mirrors ``VideoService._get_sign_segments``: one
+``ilike '%word%'`` query per word. It runs against an in-memory SQLite
+database holding the same synthetic lexicon, so the numbers are a lower
+bound for the real cost (no network round trip to Postgres).
+
+Usage (needs the app settings, e.g. a .env file):
+    python -m benchmarks.lexicon_lookup --gestures 20000 --words 2000
+"""
+
+import argparse
+import random
+import string
+import time
+
+from sqlalchemy import create_engine
+from sqlmodel import Session, SQLModel, select
+
+from app.db.models import SignGesture, SignTranslation
+from app.utils.sign_lexicon import LexiconEntry, LexiconSnapshot, normalize_lexicon_key
+
+
+def _random_word(rng: random.Random) -> str:
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(3, 9)))
+
+
+def build_dataset(gesture_count: int, seed: int = 7):
+    rng = random.Random(seed)
+    words = sorted({_random_word(rng) for _ in range(gesture_count * 2)})[:gesture_count]
+    return words, rng
+
+
+def bench_query_path(words, queries) -> float:
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(
+        engine, tables=[SignGesture.__table__, SignTranslation.__table__]
+    )
+    with Session(engine) as session:
+        for index, word in enumerate(words, start=1):
+            session.add(SignGesture(id=index, name=word, video_path=f"signs/{word}.mp4"))
+            session.add(
+                SignTranslation(gesture_id=index, language_code="en", text=word)
+            )
+        session.commit()
+
+        start = time.perf_counter()
+        for word in queries:
+            statement = select(SignTranslation).where(
+                SignTranslation.text.ilike(f"%{word}%"),
+                SignTranslation.language_code == "en",
+            )
+            session.exec(statement).first()
+        return time.perf_counter() - start
+
+
+def bench_index_path(words, queries) -> float:
+    entries = {
+        index: LexiconEntry(
+            translation_id=index,
+            gesture_id=index,
+            language_code="en",
+            text=word,
+            key=normalize_lexicon_key(word),
+            gesture_name=word,
+            video_path=f"signs/{word}.mp4",
+        )
+        for index, word in enumerate(words, start=1)
+    }
+    snapshot = LexiconSnapshot(entries)
+
+    start = time.perf_counter()
+    for word in queries:
+        snapshot.lookup(word, "en")
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--gestures", type=int, default=20000)
+    parser.add_argument("--words", type=int, default=2000)
+    args = parser.parse_args()
+
+    words, rng = build_dataset(args.gestures)
+    # Mix of hits and misses, like real sentences
+    queries = [
+        rng.choice(words) if rng.random() < 0.7 else _random_word(rng)
+        for _ in range(args.words)
+    ]
+
+    query_seconds = bench_query_path(words, queries)
+    index_seconds = bench_index_path(words, queries)
+
+    print(f"lexicon size: {len(words)} gestures, {len(queries)} lookups")
+    print(f"ilike query path : {len(queries) / query_seconds:>14,.0f} lookups/s")
+    print(f"in-memory index  : {len(queries) / index_seconds:>14,.0f} lookups/s")
+    print(f"speedup          : {query_seconds / index_seconds:>14,.0f}x")
+
+
+if __name__ == "__main__":
+    main()
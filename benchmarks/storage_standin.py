@@ -0,0 +1,219 @@
+"""
+Local stand-in for the Supabase Storage REST API.
+
+Implements the subset the app uses: object upload (raw or multipart), public
+download, list, delete and the TUS resumable upload endpoint. Objects live in
+memory. ``--fail-every N`` makes every Nth resumable chunk store only half of
+its bytes and answer 500, to exercise resume-from-offset.
+
+Point the app at it with ``SUPABASE_PROJECT_URL=http://127.0.0.1:54321``.
+
+Usage:
+    python -m benchmarks.storage_standin --port 54321 --fail-every 3
+"""
+
+import argparse
+import base64
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+TUS_HEADERS = {"Tus-Resumable": "1.0.0"}
+
+
+class StandinStorage:
+    """In-memory buckets and resumable uploads"""
+
+    def __init__(self, fail_every: int = 0):
+        self.fail_every = fail_every
+        self.objects: Dict[str, Dict[str, Any]] = {}
+        self.uploads: Dict[str, Dict[str, Any]] = {}
+        self.patch_count = 0
+
+    def put(
+        self, bucket: str, path: str, data: bytes, content_type: str, upsert: bool
+    ) -> bool:
+        key = f"{bucket}/{path}"
+        if key in self.objects and not upsert:
+            return False
+        self.objects[key] = {
+            "data": data,
+            "content_type": content_type,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+        }
+        return True
+
+
+def create_app(fail_every: int = 0) -> Starlette:
+    storage = StandinStorage(fail_every)
+
+    async def upload_object(request: Request) -> Response:
+        bucket, path = request.path_params["bucket"], request.path_params["path"]
+        content_type = request.headers.get("content-type", "application/octet-stream")
+        if content_type.startswith("multipart/form-data"):
+            form = await request.form()
+            upload = form["file"]
+            data = await upload.read()
+            content_type = upload.content_type or "application/octet-stream"
+        else:
+            data = await request.body()
+
+        upsert = request.headers.get("x-upsert", "false") == "true"
+        if not storage.put(bucket, path, data, content_type, upsert):
+            return JSONResponse(
+                {
+                    "statusCode": "409",
+                    "error": "Duplicate",
+                    "message": "The resource already exists",
+                },
+                status_code=400,
+            )
+        return JSONResponse({"Key": f"{bucket}/{path}"})
+
+    async def download_object(request: Request) -> Response:
+        key = f"{request.path_params['bucket']}/{request.path_params['path']}"
+        stored = storage.objects.get(key)
+        if stored is None:
+            return JSONResponse({"error": "not_found"}, status_code=404)
+        return Response(stored["data"], media_type=stored["content_type"])
+
+    async def list_objects(request: Request) -> Response:
+        bucket = request.path_params["bucket"]
+        body = await request.json()
+        prefix = body.get("prefix", "").strip("/")
+        limit, offset = int(body.get("limit", 100)), int(body.get("offset", 0))
+        root = f"{bucket}/{prefix}/" if prefix else f"{bucket}/"
+        names = sorted(
+            key[len(root) :] for key in storage.objects if key.startswith(root)
+        )
+        entries = [
+            {
+                "name": name,
+                "id": name,
+                "created_at": storage.objects[root + name]["created_at"],
+                "metadata": {"size": len(storage.objects[root + name]["data"])},
+            }
+            for name in names
+            if "/" not in name
+        ]
+        return JSONResponse(entries[offset : offset + limit])
+
+    async def delete_objects(request: Request) -> Response:
+        bucket = request.path_params["bucket"]
+        body = await request.json()
+        removed = []
+        for path in body.get("prefixes", []):
+            if storage.objects.pop(f"{bucket}/{path}", None) is not None:
+                removed.append({"name": path})
+        return JSONResponse(removed)
+
+    async def create_upload(request: Request) -> Response:
+        metadata = {}
+        for pair in request.headers.get("upload-metadata", "").split(","):
+            if " " in pair:
+                key, value = pair.split(" ", 1)
+                metadata[key] = base64.b64decode(value).decode()
+        upload_id = uuid.uuid4().hex
+        storage.uploads[upload_id] = {
+            "length": int(request.headers["upload-length"]),
+            "data": bytearray(),
+            "metadata": metadata,
+            "upsert": request.headers.get("x-upsert", "false") == "true",
+        }
+        location = f"{request.base_url}storage/v1/upload/resumable/{upload_id}"
+        return Response(status_code=201, headers={**TUS_HEADERS, "Location": location})
+
+    async def upload_offset(request: Request) -> Response:
+        upload = storage.uploads.get(request.path_params["upload_id"])
+        if upload is None:
+            return Response(status_code=404, headers=TUS_HEADERS)
+        return Response(
+            headers={
+                **TUS_HEADERS,
+                "Upload-Offset": str(len(upload["data"])),
+                "Upload-Length": str(upload["length"]),
+                "Cache-Control": "no-store",
+            }
+        )
+
+    async def patch_upload(request: Request) -> Response:
+        upload = storage.uploads.get(request.path_params["upload_id"])
+        if upload is None:
+            return Response(status_code=404, headers=TUS_HEADERS)
+        if int(request.headers["upload-offset"]) != len(upload["data"]):
+            return Response(status_code=409, headers=TUS_HEADERS)
+
+        chunk = await request.body()
+        storage.patch_count += 1
+        if storage.fail_every and storage.patch_count % storage.fail_every == 0:
+            # Simulate a connection lost mid-chunk: part of the bytes arrived
+            upload["data"] += chunk[: len(chunk) // 2]
+            return Response(status_code=500, headers=TUS_HEADERS)
+
+        upload["data"] += chunk
+        if len(upload["data"]) >= upload["length"]:
+            metadata = upload["metadata"]
+            stored = storage.put(
+                metadata.get("bucketName", ""),
+                metadata.get("objectName", ""),
+                bytes(upload["data"]),
+                metadata.get("contentType", "application/octet-stream"),
+                upsert=upload["upsert"],
+            )
+            if not stored:
+                return Response(status_code=409, headers=TUS_HEADERS)
+        return Response(
+            status_code=204,
+            headers={**TUS_HEADERS, "Upload-Offset": str(len(upload["data"]))},
+        )
+
+    app = Starlette(
+        routes=[
+            Route("/storage/v1/upload/resumable", create_upload, methods=["POST"]),
+            Route(
+                "/storage/v1/upload/resumable/{upload_id}",
+                upload_offset,
+                methods=["HEAD"],
+            ),
+            Route(
+                "/storage/v1/upload/resumable/{upload_id}",
+                patch_upload,
+                methods=["PATCH"],
+            ),
+            Route("/storage/v1/object/list/{bucket}", list_objects, methods=["POST"]),
+            Route(
+                "/storage/v1/object/public/{bucket}/{path:path}",
+                download_object,
+                methods=["GET"],
+            ),
+            Route("/storage/v1/object/{bucket}", delete_objects, methods=["DELETE"]),
+            Route(
+                "/storage/v1/object/{bucket}/{path:path}",
+                upload_object,
+                methods=["POST", "PUT"],
+            ),
+        ]
+    )
+    app.state.storage = storage
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=54321)
+    parser.add_argument("--fail-every", type=int, default=0)
+    args = parser.parse_args()
+
+    import uvicorn
+
+    uvicorn.run(create_app(args.fail_every), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Benchmark storage upload throughput at increasing concurrency.
+
+Compares the shared pooled client used by ``StorageService`` against a new
+``httpx.AsyncClient`` per upload (what building a fresh client per call
+amounts to: a new TCP/TLS connection for every request). Without
+``--base-url`` an in-process stand-in server is started with uvicorn; point
+it at a real project to include network and TLS costs.
+
+Usage (needs the app settings, e.g. a .env file):
+    python -m benchmarks.storage_throughput --uploads 200 --size-kb 256
+    python -m benchmarks.storage_throughput --base-url http://127.0.0.1:54321
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import socket
+import threading
+import time
+from typing import Optional
+
+import httpx
+
+from app.utils.http_pool import SharedHttpClient
+from app.utils.storage_backends import SupabaseStorageBackend
+from app.utils.storage_service import StorageService
+
+
+def start_standin() -> str:
+    import uvicorn
+
+    from benchmarks.storage_standin import create_app
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = uvicorn.Server(
+        uvicorn.Config(create_app(), host="127.0.0.1", port=port, log_level="error")
+    )
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}"
+
+
+async def run_level(upload, uploads: int, concurrency: int) -> float:
+    limit = asyncio.Semaphore(concurrency)
+
+    async def one(index: int):
+        async with limit:
+            await upload(index)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(uploads)))
+    return time.perf_counter() - start
+
+
+async def bench(base_url: str, uploads: int, size: int, levels, http2: bool):
+    payload = os.urandom(size)
+    http = SharedHttpClient(http2=http2)
+    backend = SupabaseStorageBackend(
+        project_url=base_url, api_key="bench", bucket="bench", http=http
+    )
+    service = StorageService(backend)
+
+    async def pooled(index: int):
+        await service.upload_bytes(
+            payload, f"bench/pooled_{index}.mp4", content_type="video/mp4"
+        )
+
+    async def per_request(index: int):
+        async with httpx.AsyncClient() as client:
+            response = await client.post(
+                backend._object_url(f"bench/fresh_{index}.mp4"),
+                content=payload,
+                headers={
+                    **backend._auth_headers(),
+                    "content-type": "video/mp4",
+                    "x-upsert": "true",
+                },
+            )
+            response.raise_for_status()
+
+    print(f"{uploads} uploads of {size // 1024} KiB to {base_url}")
+    print(f"{'concurrency':>11} | {'pooled up/s':>12} | {'per-request up/s':>16} | speedup")
+    for concurrency in levels:
+        fresh_seconds = await run_level(per_request, uploads, concurrency)
+        pooled_seconds = await run_level(pooled, uploads, concurrency)
+        print(
+            f"{concurrency:>11} | {uploads / pooled_seconds:>12,.1f} | "
+            f"{uploads / fresh_seconds:>16,.1f} | {fresh_seconds / pooled_seconds:.2f}x"
+        )
+    await http.aclose()
+
+
+def main(argv: Optional[list] = None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default=None)
+    parser.add_argument("--uploads", type=int, default=200)
+    parser.add_argument("--size-kb", type=int, default=256)
+    parser.add_argument("--concurrency", default="1,10,50")
+    parser.add_argument("--no-http2", action="store_true")
+    args = parser.parse_args(argv)
+    # Per-request INFO logs would dominate the output and the timings
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.getLogger("app.utils.storage_service").setLevel(logging.WARNING)
+
+    base_url = args.base_url or start_standin()
+    levels = [int(level) for level in args.concurrency.split(",")]
+    asyncio.run(
+        bench(base_url, args.uploads, args.size_kb * 1024, levels, not args.no_http2)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Benchmark Arabic/English text normalization throughput.
+
+Compares the precompiled translation-table pipeline against a naive
+per-character implementation of the same rules, and measures the memoized
+path for hot strings (repeated inputs, as with popular phrases).
+
+Usage:
+    python -m benchmarks.text_normalization --strings 50000
+"""
+
+import argparse
+import random
+import time
+import unicodedata
+
+from app.utils.text_normalizer import (
+    ARABIC_DIACRITICS,
+    ARABIC_LETTER_FOLDS,
+    DROPPED_PUNCTUATION,
+    PUNCTUATION_FOLDS,
+    TATWEEL,
+    normalize_text,
+)
+
+ARABIC_WORDS = [
+    "أهلاً",
+    "مَرْحَباً",
+    "كيف",
+    "حالُك",
+    "مدرسة",
+    "على",
+    "مسؤول",
+    "شكراً",
+    "إلى",
+    "اللقاء",
+]
+ENGLISH_WORDS = ["Hello", "how", "ARE", "you", "“friend”", "School", "thanks", "Goodbye"]
+PUNCTUATION = ["", "", "", "،", "؟", ",", "!", "."]
+
+
+def build_corpus(count: int, seed: int = 11):
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(count):
+        words = ARABIC_WORDS if rng.random() < 0.6 else ENGLISH_WORDS
+        sentence = " ".join(
+            rng.choice(words) + rng.choice(PUNCTUATION) for _ in range(rng.randint(3, 12))
+        )
+        if rng.random() < 0.2:
+            sentence = sentence.replace("ا", "ـا")
+        corpus.append(sentence)
+    return corpus
+
+
+def naive_normalize(text: str) -> str:
+    dropped = set(ARABIC_DIACRITICS + TATWEEL + DROPPED_PUNCTUATION)
+    text = unicodedata.normalize("NFKC", text)
+    chars = []
+    for char in text:
+        if char in dropped:
+            continue
+        chars.append(ARABIC_LETTER_FOLDS.get(char) or PUNCTUATION_FOLDS.get(char) or char)
+    return " ".join("".join(chars).casefold().split())
+
+
+def bench(func, corpus) -> float:
+    start = time.perf_counter()
+    for text in corpus:
+        func(text)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--strings", type=int, default=50000)
+    parser.add_argument(
+        "--hot-fraction",
+        type=float,
+        default=0.05,
+        help="Share of distinct strings in the hot workload",
+    )
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.strings)
+    rng = random.Random(3)
+    hot_set = corpus[: max(1, int(len(corpus) * args.hot_fraction))]
+    hot_corpus = [rng.choice(hot_set) for _ in range(len(corpus))]
+
+    for text in corpus[:1000]:
+        assert normalize_text.__wrapped__(text) == naive_normalize(text)
+
+    naive_seconds = bench(naive_normalize, corpus)
+    table_seconds = bench(normalize_text.__wrapped__, corpus)
+    normalize_text.cache_clear()
+    hot_seconds = bench(normalize_text, hot_corpus)
+    total_chars = sum(len(text) for text in corpus)
+
+    print(f"corpus: {len(corpus)} strings, {total_chars / len(corpus):.0f} chars average")
+    print(f"naive per-char     : {len(corpus) / naive_seconds:>12,.0f} strings/s")
+    print(
+        f"translation tables : {len(corpus) / table_seconds:>12,.0f} strings/s "
+        f"({total_chars / table_seconds / 1e6:.1f} Mchars/s)"
+    )
+    print(f"memoized, hot set  : {len(hot_corpus) / hot_seconds:>12,.0f} strings/s")
+    print(f"table speedup      : {naive_seconds / table_seconds:>12.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark stream-copy concatenation against re-encoding and moviepy.
+
+Generates ``--segments`` synthetic sign clips with ffmpeg's test source (all
+sharing one canonical profile, like normalized lexicon clips) and assembles
+them three ways:
+
+* ``VideoAssembler`` stream copy (concat demuxer, ``-c copy``)
+* ``VideoAssembler`` forced re-encode (concat filter + libx264)
+* moviepy ``concatenate_videoclips(method="compose")`` + libx264, the path
+  sketched in ``VideoService._combine_video_segments`` (skipped when moviepy
+  is not installed)
+
+Usage (needs ffmpeg/ffprobe on PATH):
+    python -m benchmarks.video_concat --segments 10 --rounds 3
+"""
+
+import argparse
+import asyncio
+import statistics
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+
+from app.utils.video_processor import VideoAssembler
+
+
+def make_segments(directory: Path, count: int, seconds: float) -> list:
+    segments = []
+    for index in range(count):
+        path = directory / f"segment_{index:03d}.mp4"
+        subprocess.run(
+            [
+                "ffmpeg", "-hide_banner", "-loglevel", "error", "-y",
+                "-f", "lavfi", "-i", f"testsrc2=size=1280x720:rate=30:duration={seconds}",
+                "-c:v", "libx264", "-preset", "veryfast", "-pix_fmt", "yuv420p",
+                "-g", "30", str(path),
+            ],
+            check=True,
+        )
+        segments.append(path)
+    return segments
+
+
+def time_async(rounds: int, factory) -> list:
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        asyncio.run(factory())
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def time_moviepy(rounds: int, segments: list, output: Path):
+    try:
+        from moviepy.editor import VideoFileClip, concatenate_videoclips
+    except ImportError:
+        return None
+
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        clips = [VideoFileClip(str(segment)) for segment in segments]
+        final_clip = concatenate_videoclips(clips, method="compose")
+        final_clip.write_videofile(
+            str(output), fps=30, codec="libx264", audio=False, logger=None
+        )
+        for clip in clips:
+            clip.close()
+        final_clip.close()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def report(name: str, timings) -> None:
+    if timings is None:
+        print(f"{name:<22} skipped (not installed)")
+        return
+    print(
+        f"{name:<22} median {statistics.median(timings) * 1000:>9.1f} ms"
+        f"   min {min(timings) * 1000:>9.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--segments", type=int, default=10)
+    parser.add_argument("--seconds", type=float, default=1.5)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    assembler = VideoAssembler()
+    with tempfile.TemporaryDirectory() as workdir:
+        workdir = Path(workdir)
+        segments = make_segments(workdir, args.segments, args.seconds)
+        output = workdir / "combined.mp4"
+
+        stream_copy = time_async(
+            args.rounds, lambda: assembler.concatenate(segments, output)
+        )
+        reencode = time_async(
+            args.rounds,
+            lambda: assembler.concatenate(segments, output, force_reencode=True),
+        )
+        moviepy = time_moviepy(args.rounds, segments, output)
+
+    print(f"{args.segments} segments x {args.seconds}s, {args.rounds} rounds")
+    report("stream copy", stream_copy)
+    report("ffmpeg re-encode", reencode)
+    report("moviepy compose", moviepy)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""add signcliprendition table
+
+Revision ID: 0002_sign_clip_renditions
+Revises: 0001_lexicon_updated_at
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002_sign_clip_renditions"
+down_revision: Union[str, None] = "0001_lexicon_updated_at"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "signcliprendition",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("gesture_id", sa.Integer(), nullable=False),
+        sa.Column("quality", sa.String(), nullable=False),
+        sa.Column("video_path", sa.String(), nullable=False),
+        sa.Column("source_hash", sa.String(), nullable=False),
+        sa.Column("duration_ms", sa.Integer(), nullable=False),
+        sa.Column("frame_count", sa.Integer(), nullable=False),
+        sa.Column("keyframe_offsets_ms", sa.JSON(), nullable=False),
+        sa.Column(
+            "updated_at", sa.DateTime(), nullable=False, server_default=sa.func.now()
+        ),
+        sa.ForeignKeyConstraint(["gesture_id"], ["signgesture.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("gesture_id", "quality"),
+    )
+    op.create_index(
+        "ix_signcliprendition_gesture_id", "signcliprendition", ["gesture_id"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_signcliprendition_gesture_id", table_name="signcliprendition")
+    op.drop_table("signcliprendition")
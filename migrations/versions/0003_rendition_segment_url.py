@@ -0,0 +1,30 @@
+"""add segment_url to signcliprendition
+
+Revision ID: 0003_rendition_segment_url
+Revises: 0002_sign_clip_renditions
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003_rendition_segment_url"
+down_revision: Union[str, None] = "0002_sign_clip_renditions"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "signcliprendition", sa.Column("segment_url", sa.String(), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("signcliprendition", "segment_url")
@@ -0,0 +1,53 @@
+"""add storageobjectref table
+
+Revision ID: 0005_storage_object_refs
+Revises: 0004_storage_object_manifest
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005_storage_object_refs"
+down_revision: Union[str, None] = "0004_storage_object_manifest"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "storageobjectref",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("object_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column(
+            "created_at", sa.DateTime(), nullable=False, server_default=sa.func.now()
+        ),
+        sa.ForeignKeyConstraint(
+            ["object_id"], ["storageobject.id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("object_id", "user_id"),
+    )
+    op.create_index(
+        "ix_storageobjectref_object_id", "storageobjectref", ["object_id"]
+    )
+    op.create_index(
+        "ix_storageobjectref_user_id_created_at",
+        "storageobjectref",
+        ["user_id", "created_at"],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(
+        "ix_storageobjectref_user_id_created_at", table_name="storageobjectref"
+    )
+    op.drop_index("ix_storageobjectref_object_id", table_name="storageobjectref")
+    op.drop_table("storageobjectref")
@@ -0,0 +1,45 @@
+"""add translationhistory keyset index
+
+Revision ID: 0006_history_keyset_index
+Revises: 0005_storage_object_refs
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0006_history_keyset_index"
+down_revision: Union[str, None] = "0005_storage_object_refs"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEX_NAME = "ix_translationhistory_user_input_timestamp_id"
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY keeps the table writable while the index builds, and
+    # cannot run inside the migration transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            INDEX_NAME,
+            "translationhistory",
+            ["user_id", "input_type", sa.text("timestamp DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            INDEX_NAME,
+            table_name="translationhistory",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
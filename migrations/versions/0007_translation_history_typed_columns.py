@@ -0,0 +1,183 @@
+"""add translationhistory language_code and smallint input_type
+
+Revision ID: 0007_history_typed_columns
+Revises: 0006_history_keyset_index
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007_history_typed_columns"
+down_revision: Union[str, None] = "0006_history_keyset_index"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLE = "translationhistory"
+INDEX_NAME = "ix_translationhistory_user_input_timestamp_id"
+LANGUAGE_INDEX_NAME = "ix_translationhistory_user_language_timestamp_id"
+# Rows per backfill transaction, each holds its row locks only briefly
+BATCH_SIZE = 10_000
+# Give up on the switch-over rather than queue writers behind it
+LOCK_TIMEOUT = "5s"
+# Indexes on the new columns are built under this suffix, then renamed
+NEW_SUFFIX = "_new"
+
+# HistoryInputType values
+SIGN_TO_TEXT = 1
+TEXT_TO_SIGN = 2
+INPUT_TYPE_NAMES = {SIGN_TO_TEXT: "sign_to_text", TEXT_TO_SIGN: "text_to_sign"}
+
+# "ar:text" -> language "ar", content "text", as written by the previous release
+UPGRADE_ROWS = f"""
+    UPDATE {TABLE} SET
+        input_type_code = CASE input_type
+            WHEN 'sign_to_text' THEN {SIGN_TO_TEXT}
+            WHEN 'text_to_sign' THEN {TEXT_TO_SIGN}
+        END,
+        language_code = CASE
+            WHEN input_type = 'text_to_sign' AND strpos(input_content, ':') > 0
+            THEN split_part(input_content, ':', 1)
+        END,
+        input_content = CASE
+            WHEN input_type = 'text_to_sign' AND strpos(input_content, ':') > 0
+            THEN substr(input_content, strpos(input_content, ':') + 1)
+            ELSE input_content
+        END
+    WHERE input_type_code IS NULL
+"""
+
+DOWNGRADE_ROWS = f"""
+    UPDATE {TABLE} SET
+        input_type_name = CASE input_type
+            WHEN {SIGN_TO_TEXT} THEN 'sign_to_text'
+            WHEN {TEXT_TO_SIGN} THEN 'text_to_sign'
+        END,
+        input_content = CASE
+            WHEN language_code IS NOT NULL
+            THEN language_code || ':' || input_content
+            ELSE input_content
+        END
+    WHERE input_type_name IS NULL
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Unmapped values would only fail SET NOT NULL, under the table lock
+    _check_input_types(list(INPUT_TYPE_NAMES.values()))
+
+    # Nullable columns without defaults are added without rewriting the table
+    op.add_column(TABLE, sa.Column("input_type_code", sa.SmallInteger(), nullable=True))
+    op.add_column(TABLE, sa.Column("language_code", sa.String(), nullable=True))
+
+    with op.get_context().autocommit_block():
+        _backfill(UPGRADE_ROWS)
+        _create_new_indexes()
+
+    # Switch over in one short transaction: rows the previous release wrote
+    # during the backfill are converted under the lock, dropping the old
+    # column drops the old index, and SET NOT NULL scans the table once
+    _lock_table()
+    op.execute(UPGRADE_ROWS)
+    op.drop_column(TABLE, "input_type")
+    op.alter_column(
+        TABLE, "input_type_code", new_column_name="input_type", nullable=False
+    )
+    for name in (INDEX_NAME, LANGUAGE_INDEX_NAME):
+        op.execute(f"ALTER INDEX {name}{NEW_SUFFIX} RENAME TO {name}")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _check_input_types(list(INPUT_TYPE_NAMES))
+
+    op.add_column(TABLE, sa.Column("input_type_name", sa.String(), nullable=True))
+
+    with op.get_context().autocommit_block():
+        _backfill(DOWNGRADE_ROWS)
+        op.drop_index(
+            LANGUAGE_INDEX_NAME,
+            table_name=TABLE,
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.create_index(
+            f"{INDEX_NAME}_old",
+            TABLE,
+            [
+                "user_id",
+                "input_type_name",
+                sa.text("timestamp DESC"),
+                sa.text("id DESC"),
+            ],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+    _lock_table()
+    op.execute(DOWNGRADE_ROWS)
+    op.drop_column(TABLE, "language_code")
+    op.drop_column(TABLE, "input_type")
+    op.alter_column(
+        TABLE, "input_type_name", new_column_name="input_type", nullable=False
+    )
+    op.execute(f"ALTER INDEX {INDEX_NAME}_old RENAME TO {INDEX_NAME}")
+
+
+# Private helpers
+
+
+def _backfill(statement: str) -> None:
+    """Run ``statement`` over the table in id ranges, one transaction each"""
+    connection = op.get_bind()
+    low, high = connection.execute(
+        sa.text(f"SELECT min(id), max(id) FROM {TABLE}")
+    ).one()
+    if low is None:
+        return
+    for start in range(low, high + 1, BATCH_SIZE):
+        connection.execute(
+            sa.text(f"{statement} AND id >= :start AND id < :end"),
+            {"start": start, "end": start + BATCH_SIZE},
+        )
+
+
+def _check_input_types(known: list) -> None:
+    """Fail before any change if ``input_type`` holds values the CASE cannot map"""
+    unknown = op.get_bind().execute(
+        sa.text(
+            f"SELECT DISTINCT input_type FROM {TABLE} "
+            "WHERE input_type IS NULL OR input_type NOT IN :known"
+        ).bindparams(sa.bindparam("known", expanding=True)),
+        {"known": known},
+    ).scalars().all()
+    if unknown:
+        raise RuntimeError(
+            f"{TABLE}.input_type has values this migration cannot convert: "
+            f"{unknown}. Fix or delete those rows, then run it again."
+        )
+
+
+def _create_new_indexes() -> None:
+    # CONCURRENTLY keeps the table writable while the indexes build
+    for name, column in (
+        (INDEX_NAME, "input_type_code"),
+        (LANGUAGE_INDEX_NAME, "language_code"),
+    ):
+        op.create_index(
+            f"{name}{NEW_SUFFIX}",
+            TABLE,
+            ["user_id", column, sa.text("timestamp DESC"), sa.text("id DESC")],
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def _lock_table() -> None:
+    op.execute(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'")
+    op.execute(f"LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE")
@@ -0,0 +1,114 @@
+"""
+TusUploader against the local storage stand-in (``benchmarks.storage_standin``).
+
+The stand-in runs in process behind ``httpx.ASGITransport``, so no server or
+network is needed.
+"""
+
+import asyncio
+import os
+from pathlib import Path
+
+import httpx
+import pytest
+
+from app.utils.exceptions import StorageError
+from app.utils.http_pool import SharedHttpClient
+from app.utils.resumable_upload import TusUploader, UploadStateStore, upload_fingerprint
+from app.utils.retry_policy import RetryPolicy
+from benchmarks.storage_standin import create_app
+
+BASE_URL = "http://standin"
+ENDPOINT = f"{BASE_URL}/storage/v1/upload/resumable"
+BUCKET = "videos"
+DESTINATION = "user_1/clip.mp4"
+CHUNK_SIZE = 1024
+FILE_SIZE = 10 * CHUNK_SIZE + 100
+
+
+class StandinHttpClient(SharedHttpClient):
+    """Shared client whose requests are served by the stand-in app"""
+
+    def __init__(self, app):
+        super().__init__()
+        self.app = app
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=self.app), base_url=BASE_URL
+            )
+        return self._client
+
+
+def make_uploader(app, state_dir: Path, max_attempts: int = 4) -> TusUploader:
+    return TusUploader(
+        ENDPOINT,
+        headers={},
+        state_store=UploadStateStore(state_dir),
+        chunk_size=CHUNK_SIZE,
+        http=StandinHttpClient(app),
+        retry_policy=RetryPolicy(max_attempts=max_attempts, base_delay=0.001),
+    )
+
+
+@pytest.fixture
+def video(tmp_path: Path) -> Path:
+    path = tmp_path / "clip.mp4"
+    path.write_bytes(os.urandom(FILE_SIZE))
+    return path
+
+
+def upload(uploader: TusUploader, video: Path) -> int:
+    async def run() -> int:
+        try:
+            return await uploader.upload(video, DESTINATION, BUCKET, "video/mp4")
+        finally:
+            await uploader.http.aclose()
+
+    return asyncio.run(run())
+
+
+def stored_bytes(app) -> bytes:
+    return app.state.storage.objects[f"{BUCKET}/{DESTINATION}"]["data"]
+
+
+def test_upload_resends_failed_chunks_from_server_offset(tmp_path, video):
+    app = create_app(fail_every=3)
+    uploader = make_uploader(app, tmp_path / "state")
+
+    bytes_sent = upload(uploader, video)
+
+    stats = uploader.get_statistics()
+    assert stats["chunk_retries"] > 0
+    assert stats["uploads_completed"] == 1
+    # The halves the server kept of failed chunks are not sent again
+    assert bytes_sent < FILE_SIZE
+    assert stored_bytes(app) == video.read_bytes()
+    assert not list((tmp_path / "state").iterdir())
+
+
+def test_interrupted_upload_resumes_from_saved_offset(tmp_path, video):
+    app = create_app(fail_every=4)
+    state_dir = tmp_path / "state"
+
+    with pytest.raises(StorageError):
+        upload(make_uploader(app, state_dir, max_attempts=1), video)
+
+    state = UploadStateStore(state_dir).load(upload_fingerprint(video, DESTINATION))
+    assert state is not None
+    assert state.offset == 3 * CHUNK_SIZE
+    assert f"{BUCKET}/{DESTINATION}" not in app.state.storage.objects
+    # The server kept half of the failed fourth chunk
+    server_offset = 3 * CHUNK_SIZE + CHUNK_SIZE // 2
+
+    app.state.storage.fail_every = 0
+    uploader = make_uploader(app, state_dir)
+    bytes_sent = upload(uploader, video)
+
+    assert uploader.get_statistics()["uploads_resumed"] == 1
+    assert bytes_sent == FILE_SIZE - server_offset
+    assert len(app.state.storage.uploads) == 1
+    assert stored_bytes(app) == video.read_bytes()
+    assert not list(state_dir.iterdir())